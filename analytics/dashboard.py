@@ -7,11 +7,23 @@ from analytics.pnl import PnLCalculator
 
 
 latest_prices = {}
+latest_risk = {}
+latest_latency = {}
 
 # A helper function to update the latest prices from market feed
 def update_market_price(symbol: str, bid: float, ask: float):
     latest_prices[symbol] = (bid + ask) / 2
 
+# Latest VaR / stress results from risk.analytics
+def update_risk_metrics(metrics: dict):
+    latest_risk.clear()
+    latest_risk.update(metrics)
+
+# Latest per-stage latency percentiles from common.latency
+def update_latency_metrics(summary: dict):
+    latest_latency.clear()
+    latest_latency.update(summary)
+
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'trading_secret'
@@ -78,6 +90,34 @@ DASHBOARD_HTML = '''
             </div>
         </div>
 
+        <!-- Portfolio Risk -->
+        <div class="card">
+            <h2>🛡️ Portfolio Risk</h2>
+            <div class="metrics">
+                <div class="metric">
+                    <h3 id="var-label">VaR</h3>
+                    <div class="value" id="var-value">$0.00</div>
+                </div>
+                <div class="metric">
+                    <h3>Expected Shortfall</h3>
+                    <div class="value" id="es-value">$0.00</div>
+                </div>
+                <div class="metric">
+                    <h3>Gross Exposure</h3>
+                    <div class="value" id="gross-exposure">$0.00</div>
+                </div>
+            </div>
+            <table id="scenarios-table">
+                <thead>
+                    <tr>
+                        <th>Scenario</th>
+                        <th>PnL</th>
+                    </tr>
+                </thead>
+                <tbody id="scenarios-body"></tbody>
+            </table>
+        </div>
+
         <!-- Market Table -->
         <div class="card">
             <h2>📈 Current Market Data</h2>
@@ -218,6 +258,21 @@ DASHBOARD_HTML = '''
             }
         }
 
+        // Portfolio risk
+        function updateRisk(risk) {
+            if (!risk || risk.var === undefined) return;
+            document.getElementById('var-label').textContent =
+                `VaR ${(risk.confidence * 100).toFixed(0)}% / ${risk.horizon_seconds}s`;
+            document.getElementById('var-value').textContent = `$${risk.var.toFixed(2)}`;
+            document.getElementById('es-value').textContent = `$${risk.expected_shortfall.toFixed(2)}`;
+            document.getElementById('gross-exposure').textContent = `$${risk.gross_exposure.toFixed(2)}`;
+            const tbody = document.getElementById('scenarios-body');
+            tbody.innerHTML = '';
+            for (const [name, pnl] of Object.entries(risk.scenarios)) {
+                tbody.innerHTML += `<tr><td>${name}</td><td>$${pnl.toFixed(2)}</td></tr>`;
+            }
+        }
+
         // Charts
         const pnlCtx = document.getElementById('pnlChart').getContext('2d');
         const positionsCtx = document.getElementById('positionsChart').getContext('2d');
@@ -260,6 +315,8 @@ DASHBOARD_HTML = '''
             positionsChart.update();
         });
 
+        socket.on('risk_update', data => updateRisk(data));
+
         socket.on('pnl_update', data => {
             pnlChart.data.labels = data.map(d => new Date(d.timestamp * 1000).toLocaleTimeString());
             pnlChart.data.datasets[0].data = data.map(d => d.pnl);
@@ -268,6 +325,7 @@ DASHBOARD_HTML = '''
 
         // Initial load
         updateMetrics();
+        fetch('/api/risk').then(response => response.json()).then(updateRisk);
         setInterval(updateMetrics, 5000);
     </script>
 </body>
@@ -313,6 +371,14 @@ def get_metrics():
         'total_pnl': total_pnl
     }
 
+@app.route('/api/risk')
+def get_risk():
+    return dict(latest_risk)
+
+@app.route('/api/latency')
+def get_latency():
+    return dict(latest_latency)
+
 # if __name__ == '__main__':
 #     print("Starting dashboard at http://localhost:5000")
 #     socketio.run(app, host='0.0.0.0', port=5000, debug=False)
@@ -94,94 +94,287 @@
 
 """PnL calculation engine."""
 
+import json
+import os
 import sqlite3
-from typing import Any, Dict, List
-from common.config import DB_PATH
+import time
+from typing import Any, Dict, Iterable, List, Tuple
+from common.config import DB_PATH, PNL_SNAPSHOT_PATH
 from common.utils import setup_logger
 
 logger = setup_logger(__name__)
 
+
+def _fold_realized(fills: Iterable[Tuple], positions: Dict[str, List[float]], pnl_by_symbol: Dict[str, float]):
+    """Apply (symbol, side, quantity, price) fills to long-only positions, accumulating realized PnL."""
+    for symbol, side, quantity, price in fills:
+        if symbol not in positions:
+            positions[symbol] = [0, 0.0]  # [qty, avg_price]
+
+        current_qty, current_avg = positions[symbol]
+
+        if side == "BUY":
+            # Update position and average price
+            new_qty = current_qty + quantity
+            new_avg = ((current_qty * current_avg) + (quantity * price)) / new_qty
+            positions[symbol] = [new_qty, new_avg]
+        else:  # SELL
+            if current_qty <= 0:
+                # Nothing to sell, skip or warn
+                continue
+
+            # Calculate realized PnL for the amount we can sell
+            sell_qty = min(quantity, current_qty)
+            realized_pnl = sell_qty * (price - current_avg)
+            pnl_by_symbol[symbol] = pnl_by_symbol.get(symbol, 0) + realized_pnl
+
+            # Update remaining position
+            new_qty = current_qty - sell_qty
+            positions[symbol] = [new_qty, current_avg]  # Keep avg_price for remaining shares
+
+
 class PnLCalculator:
+    """Realized/unrealized PnL from the live fills table plus the state
+    carried forward from sessions that have been archived (``position_carry``).
+
+    calculate_realized_pnl / get_positions_summary scan the tables on every
+    call. The engine instead calls warm() once and apply_fill() per fill and
+    reads realized_pnl() / positions_summary() / net_quantities from memory;
+    warm() starts from a compact snapshot and folds only the fills after it.
+    """
+
     def __init__(self):
-        pass
+        conn = sqlite3.connect(DB_PATH)
+        cursor = conn.cursor()
+        self.init_carry(cursor)
+        conn.commit()
+        conn.close()
+
+        # In-memory state, valid after warm()
+        self.long: Dict[str, List[float]] = {}       # symbol -> [qty, avg_price] (realized PnL model)
+        self.realized: Dict[str, float] = {}
+        self.net: Dict[str, List[float]] = {}        # symbol -> [net_qty, total_cost]
+        self.net_quantities: Dict[str, int] = {}     # symbol -> net_qty, the strategies' positions view
+        self.watermark = 0.0                         # latest fill timestamp folded
+        self._watermark_ids: List[str] = []          # fills folded at exactly that timestamp
+        self.warmed = False
+
+    @staticmethod
+    def init_carry(cursor: sqlite3.Cursor):
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS position_carry (
+                symbol TEXT PRIMARY KEY,
+                long_qty INTEGER,
+                long_avg REAL,
+                realized_pnl REAL,
+                net_qty INTEGER,
+                total_cost REAL
+            )
+        ''')
+
+    @staticmethod
+    def _load_carry(cursor: sqlite3.Cursor) -> Dict[str, Tuple]:
+        cursor.execute("SELECT symbol, long_qty, long_avg, realized_pnl, net_qty, total_cost FROM position_carry")
+        return {row[0]: row[1:] for row in cursor.fetchall()}
+
+    def close_partition(self, cursor: sqlite3.Cursor, date: str, fills: List[Tuple]):
+        """Roll a closed session's fills (storage.FILL_COLUMNS rows) into the carry table.
+
+        Called by ``storage.rollover`` inside its transaction, before the
+        session's fills leave the live database.
+        """
+        self.init_carry(cursor)
+        carry = self._load_carry(cursor)
+        positions = {symbol: [row[0], row[1]] for symbol, row in carry.items()}
+        pnl_by_symbol = {symbol: row[2] for symbol, row in carry.items()}
+        net = {symbol: [row[3], row[4]] for symbol, row in carry.items()}
+
+        _fold_realized(((f[2], f[3], f[4], f[5]) for f in fills), positions, pnl_by_symbol)
+        for _, _, symbol, side, quantity, price, _ in fills:
+            sign = 1 if side == "BUY" else -1
+            entry = net.setdefault(symbol, [0, 0.0])
+            entry[0] += sign * quantity
+            entry[1] += sign * quantity * price
+
+        cursor.executemany(
+            "INSERT OR REPLACE INTO position_carry VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (symbol, *positions.get(symbol, (0, 0.0)), pnl_by_symbol.get(symbol, 0.0),
+                 *net.get(symbol, (0, 0.0)))
+                for symbol in set(positions) | set(net)
+            ],
+        )
+        logger.info("Carried PnL state forward past session %s (%d fills)", date, len(fills))
 
     def calculate_realized_pnl(self) -> Dict[str, float]:
         """Calculate realized PnL by symbol."""
         conn = sqlite3.connect(DB_PATH)
         cursor = conn.cursor()
-        
+        carry = self._load_carry(cursor)
+
         # Get all fills grouped by symbol
         cursor.execute('''
-            SELECT symbol, side, quantity, price, timestamp
+            SELECT symbol, side, quantity, price
             FROM fills
             ORDER BY symbol, timestamp
         ''')
-        
+
         fills = cursor.fetchall()
         conn.close()
-        
-        pnl_by_symbol = {}
-        positions = {}  # symbol -> (quantity, avg_price)
-        
-        for symbol, side, quantity, price, timestamp in fills:
-            if symbol not in positions:
-                positions[symbol] = [0, 0.0]  # [qty, avg_price]
-            
-            current_qty, current_avg = positions[symbol]
-            
-            if side == "BUY":
-                # Update position and average price
-                new_qty = current_qty + quantity
-                new_avg = ((current_qty * current_avg) + (quantity * price)) / new_qty
-                positions[symbol] = [new_qty, new_avg]
-            else:  # SELL
-                if current_qty <= 0:
-                    # Nothing to sell, skip or warn
-                    continue
-                
-                # Calculate realized PnL for the amount we can sell
-                sell_qty = min(quantity, current_qty)
-                realized_pnl = sell_qty * (price - current_avg)
-                pnl_by_symbol[symbol] = pnl_by_symbol.get(symbol, 0) + realized_pnl
-                
-                # Update remaining position
-                new_qty = current_qty - sell_qty
-                positions[symbol] = [new_qty, current_avg]  # Keep avg_price for remaining shares
 
+        # Start from positions and PnL carried over from archived sessions
+        positions = {symbol: [row[0], row[1]] for symbol, row in carry.items()}  # symbol -> [quantity, avg_price]
+        pnl_by_symbol = {symbol: row[2] for symbol, row in carry.items() if row[2]}
+        _fold_realized(fills, positions, pnl_by_symbol)
         return pnl_by_symbol
 
     def get_positions_summary(self) -> Dict[str, Dict[str, Any]]:
         """Get current positions and unrealized PnL - FIXED to return Dict."""
         conn = sqlite3.connect(DB_PATH)
         cursor = conn.cursor()
-        
+        carry = self._load_carry(cursor)
+
         cursor.execute('''
-            SELECT symbol, side, SUM(quantity) as total_qty, AVG(price) as avg_price
+            SELECT symbol, side, SUM(quantity) as total_qty, SUM(quantity * price) as total_value
             FROM fills
             GROUP BY symbol, side
         ''')
-        
+
         fills = cursor.fetchall()
         conn.close()
-        
+
         # Calculate net positions
-        positions = {}
-        for symbol, side, total_qty, avg_price in fills:
+        positions = {
+            symbol: {"net_qty": row[3], "avg_price": 0, "total_cost": row[4]}
+            for symbol, row in carry.items() if row[3]
+        }
+        for symbol, side, total_qty, total_value in fills:
             if symbol not in positions:
                 positions[symbol] = {"net_qty": 0, "avg_price": 0, "total_cost": 0}
-            
+
             qty = total_qty if side == "BUY" else -total_qty
-            cost = total_qty * avg_price * (1 if side == "BUY" else -1)
-            
+            cost = total_value * (1 if side == "BUY" else -1)
+
             positions[symbol]["net_qty"] += qty
             positions[symbol]["total_cost"] += cost
-        
+
         # Calculate average prices
         for symbol in positions:
             if positions[symbol]["net_qty"] != 0:
                 positions[symbol]["avg_price"] = abs(
                     positions[symbol]["total_cost"] / positions[symbol]["net_qty"]
                 )
-        
-        logger.info(f"🔍 DEBUG - Positions summary: {positions}")
-        return positions  # ✅ Already returns Dict, this was correct
\ No newline at end of file
+
+        logger.debug("Positions summary: %s", positions)
+        return positions  # ✅ Already returns Dict, this was correct
+
+    def _reset(self, carry: Dict[str, Tuple]):
+        self.long = {symbol: [row[0], row[1]] for symbol, row in carry.items()}
+        self.realized = {symbol: row[2] for symbol, row in carry.items() if row[2]}
+        self.net = {symbol: [row[3], row[4]] for symbol, row in carry.items()}
+        self.net_quantities = {symbol: entry[0] for symbol, entry in self.net.items()}
+        self.watermark = 0.0
+        self._watermark_ids = []
+
+    def _fold(self, fill_id: str, symbol: str, side: str, quantity: int, price: float, timestamp: float):
+        _fold_realized(((symbol, side, quantity, price),), self.long, self.realized)
+        sign = 1 if side == "BUY" else -1
+        entry = self.net.get(symbol)
+        if entry is None:
+            entry = self.net[symbol] = [0, 0.0]
+        entry[0] += sign * quantity
+        entry[1] += sign * quantity * price
+        self.net_quantities[symbol] = entry[0]
+        if timestamp > self.watermark:
+            self.watermark = timestamp
+            self._watermark_ids = [fill_id]
+        elif timestamp == self.watermark:
+            self._watermark_ids.append(fill_id)
+
+    def apply_fill(self, fill):
+        """Fold one fill (already written to the fills table) into the in-memory state."""
+        # Same id the OMS writes to the fills table
+        self._fold(fill.fill_id or fill.order_id + "_fill", fill.symbol, fill.side, fill.quantity, fill.price, fill.timestamp)
+
+    def warm(self, snapshot_path: str = PNL_SNAPSHOT_PATH, use_snapshot: bool = True):
+        """Build the in-memory state: snapshot + newer fills, or carry + every live fill.
+
+        The snapshot is only used if the carry table is unchanged since it was
+        written (a session rollover in between invalidates it).
+        """
+        start = time.perf_counter()
+        conn = sqlite3.connect(DB_PATH)
+        cursor = conn.cursor()
+        carry = self._load_carry(cursor)
+        snapshot = self._read_snapshot(snapshot_path) if use_snapshot else None
+        if snapshot is not None and snapshot["carry"] == {symbol: list(row) for symbol, row in carry.items()}:
+            self.long = snapshot["long"]
+            self.realized = snapshot["realized"]
+            self.net = snapshot["net"]
+            self.net_quantities = {symbol: entry[0] for symbol, entry in self.net.items()}
+            self.watermark = snapshot["watermark"]
+            self._watermark_ids = snapshot["watermark_ids"]
+            source = "snapshot"
+        else:
+            self._reset(carry)
+            source = "full scan"
+        skip = set(self._watermark_ids)
+        cursor.execute(
+            "SELECT fill_id, symbol, side, quantity, price, timestamp FROM fills "
+            "WHERE timestamp >= ? ORDER BY timestamp",
+            (self.watermark,),
+        )
+        folded = 0
+        for row in cursor:
+            if row[0] not in skip:
+                self._fold(*row)
+                folded += 1
+        conn.close()
+        self.warmed = True
+        logger.info(
+            f"PnL state warmed from {source} + {folded} fills in {(time.perf_counter() - start) * 1000:.1f}ms"
+        )
+
+    @staticmethod
+    def _read_snapshot(path: str):
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable PnL snapshot {path}: {e}")
+            return None
+
+    def write_snapshot(self, snapshot_path: str = PNL_SNAPSHOT_PATH):
+        """Persist the in-memory state with the carry table it was built on."""
+        conn = sqlite3.connect(DB_PATH)
+        carry = self._load_carry(conn.cursor())
+        conn.close()
+        state = {
+            "carry": {symbol: list(row) for symbol, row in carry.items()},
+            "long": self.long,
+            "realized": self.realized,
+            "net": self.net,
+            "watermark": self.watermark,
+            "watermark_ids": self._watermark_ids,
+        }
+        tmp = snapshot_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(state, f, separators=(",", ":"))
+        os.replace(tmp, snapshot_path)
+
+    def realized_pnl(self) -> Dict[str, float]:
+        """calculate_realized_pnl from the in-memory state."""
+        return {symbol: pnl for symbol, pnl in self.realized.items() if pnl}
+
+    def positions_summary(self) -> Dict[str, Dict[str, Any]]:
+        """get_positions_summary from the in-memory state."""
+        return {
+            symbol: {
+                "net_qty": net_qty,
+                "avg_price": abs(total_cost / net_qty) if net_qty else 0,
+                "total_cost": total_cost,
+            }
+            for symbol, (net_qty, total_cost) in self.net.items()
+        }
@@ -0,0 +1,134 @@
+"""Recorded tick data as columnar NumPy arrays."""
+
+import csv
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Sequence
+import numpy as np
+from common.config import SYMBOLS
+
+
+@dataclass
+class TickArrays:
+    """Ticks in time order, one array per field.
+
+    Symbols are stored as integer IDs into ``symbols`` so per-symbol work
+    can be done with array operations instead of string comparisons.
+    """
+    symbols: List[str]
+    symbol_id: np.ndarray   # int32
+    bid: np.ndarray         # float64
+    ask: np.ndarray         # float64
+    bid_size: np.ndarray    # int64
+    ask_size: np.ndarray    # int64
+    timestamp: np.ndarray   # float64
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    @property
+    def spread(self) -> np.ndarray:
+        # Same rounding as OrderBook.update
+        return np.round(self.ask - self.bid, 4)
+
+    @property
+    def mid(self) -> np.ndarray:
+        return np.round((self.bid + self.ask) / 2, 4)
+
+
+def from_records(records: Iterable[Dict[str, Any]]) -> TickArrays:
+    """Build TickArrays from tick dicts in the feed's wire format."""
+    symbol_ids: Dict[str, int] = {}
+    sid, bid, ask, bid_size, ask_size, ts = [], [], [], [], [], []
+    for rec in records:
+        symbol = rec["symbol"]
+        if symbol not in symbol_ids:
+            symbol_ids[symbol] = len(symbol_ids)
+        sid.append(symbol_ids[symbol])
+        bid.append(float(rec["bid"]))
+        ask.append(float(rec["ask"]))
+        bid_size.append(int(rec["bid_size"]))
+        ask_size.append(int(rec["ask_size"]))
+        ts.append(float(rec["timestamp"]))
+
+    ticks = TickArrays(
+        symbols=list(symbol_ids),
+        symbol_id=np.asarray(sid, dtype=np.int32),
+        bid=np.asarray(bid, dtype=np.float64),
+        ask=np.asarray(ask, dtype=np.float64),
+        bid_size=np.asarray(bid_size, dtype=np.int64),
+        ask_size=np.asarray(ask_size, dtype=np.int64),
+        timestamp=np.asarray(ts, dtype=np.float64),
+    )
+    return _time_ordered(ticks)
+
+
+def _time_ordered(ticks: TickArrays) -> TickArrays:
+    if len(ticks) and np.any(np.diff(ticks.timestamp) < 0):
+        order = np.argsort(ticks.timestamp, kind="stable")
+        return TickArrays(
+            ticks.symbols, ticks.symbol_id[order], ticks.bid[order], ticks.ask[order],
+            ticks.bid_size[order], ticks.ask_size[order], ticks.timestamp[order],
+        )
+    return ticks
+
+
+def load_ticks(path: str) -> TickArrays:
+    """Load recorded ticks from .npz (columnar), .csv or .jsonl (one feed message per line)."""
+    if path.endswith(".npz"):
+        with np.load(path) as data:
+            return TickArrays(
+                symbols=[str(s) for s in data["symbols"]],
+                symbol_id=data["symbol_id"],
+                bid=data["bid"],
+                ask=data["ask"],
+                bid_size=data["bid_size"],
+                ask_size=data["ask_size"],
+                timestamp=data["timestamp"],
+            )
+    if path.endswith(".csv"):
+        with open(path, newline="") as f:
+            return from_records(csv.DictReader(f))
+    with open(path) as f:
+        return from_records(json.loads(line) for line in f if line.strip())
+
+
+def save_ticks(ticks: TickArrays, path: str):
+    """Save ticks in the compressed columnar .npz format."""
+    np.savez_compressed(
+        path,
+        symbols=np.asarray(ticks.symbols),
+        symbol_id=ticks.symbol_id,
+        bid=ticks.bid,
+        ask=ticks.ask,
+        bid_size=ticks.bid_size,
+        ask_size=ticks.ask_size,
+        timestamp=ticks.timestamp,
+    )
+
+
+def synthetic_ticks(n: int, symbols: Sequence[str] = SYMBOLS, seed: int = 0,
+                    start: float = 0.0, interval: float = 0.1) -> TickArrays:
+    """Generate ticks with the same random walk and spreads as MarketDataFeed."""
+    rng = np.random.default_rng(seed)
+    sid = rng.integers(0, len(symbols), size=n).astype(np.int32)
+
+    # Per-symbol random walk: each tick moves its own symbol's price
+    start_prices = rng.uniform(100, 300, size=len(symbols))
+    steps = rng.uniform(-0.5, 0.5, size=n)
+    prices = np.empty(n)
+    for s in range(len(symbols)):
+        idx = np.flatnonzero(sid == s)
+        prices[idx] = np.maximum(1.0, start_prices[s] + np.cumsum(steps[idx]))
+
+    bid = prices - rng.uniform(0.01, 0.05, size=n)
+    ask = bid + rng.uniform(0.01, 0.10, size=n)
+    return TickArrays(
+        symbols=list(symbols),
+        symbol_id=sid,
+        bid=np.round(bid, 2),
+        ask=np.round(ask, 2),
+        bid_size=rng.integers(100, 1001, size=n),
+        ask_size=rng.integers(100, 1001, size=n),
+        timestamp=start + interval * np.arange(n),
+    )
@@ -0,0 +1,231 @@
+"""Vectorized backtester for the spread strategy with parallel parameter sweeps.
+
+Run from the repo root, e.g.:
+    python -m backtest.engine --ticks ticks.jsonl --buy 0.02,0.03,0.04 --sell 0.05,0.06,0.07
+Without --ticks a synthetic session with the live feed's distribution is used.
+"""
+
+import argparse
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from common.arrays import group_cumsum, group_diff, group_last, group_order
+from common.config import MAX_POSITION, SPREAD_THRESHOLD, SPREAD_SELL_THRESHOLD
+from exchange_sim.exchange import ExchangeSimulator
+from backtest.data import TickArrays, load_ticks, synthetic_ticks
+
+
+def fill_model(exchange: Optional[ExchangeSimulator] = None) -> Dict[str, Any]:
+    """Fill-rate and slippage assumptions taken from an ExchangeSimulator."""
+    exchange = exchange or ExchangeSimulator()
+    return {
+        "fill_rate": exchange.fill_rate,
+        "partial_fill_rate": exchange.partial_fill_rate,
+        "slippage": tuple(exchange.slippage),
+    }
+
+
+def _simulate_fills(
+    symbol_id: np.ndarray,
+    buy_mask: np.ndarray,
+    sell_mask: np.ndarray,
+    filled: np.ndarray,
+    partial: np.ndarray,
+    partial_u: np.ndarray,
+    quantity: int,
+    max_position: int,
+    n_symbols: int,
+) -> Tuple[np.ndarray, np.ndarray, int]:
+    """Walk the (sparse) signal ticks and apply position gating.
+
+    Whether a signal may trade depends on the position built by earlier
+    fills, so this is the one sequential step; it only visits ticks where
+    the spread already crossed a threshold.
+    """
+    events = np.flatnonzero(buy_mask | sell_mask)
+    positions = [0] * n_symbols
+    fill_idx: List[int] = []
+    fill_qty: List[int] = []
+    orders = 0
+
+    sid = symbol_id[events].tolist()
+    is_buy = buy_mask[events].tolist()
+    is_sell = sell_mask[events].tolist()
+    is_filled = filled[events].tolist()
+    is_partial = partial[events].tolist()
+    u = partial_u[events].tolist()
+
+    for k, i in enumerate(events.tolist()):
+        s = sid[k]
+        pos = positions[s]
+        # Same precedence as StrategyEngine.generate_signal: BUY first
+        if is_buy[k] and pos < max_position:
+            qty, sign = min(quantity, max_position - pos), 1
+        elif is_sell[k] and pos > 0:
+            qty, sign = min(quantity, pos), -1
+        else:
+            continue
+        orders += 1
+        if not is_filled[k]:
+            continue
+        if is_partial[k]:
+            qty = 1 + int(u[k] * qty)  # random.randint(1, qty)
+        positions[s] = pos + sign * qty
+        fill_idx.append(i)
+        fill_qty.append(sign * qty)
+
+    return np.asarray(fill_idx, dtype=np.int64), np.asarray(fill_qty, dtype=np.int64), orders
+
+
+def run_backtest(
+    ticks: TickArrays,
+    buy_threshold: float = SPREAD_THRESHOLD,
+    sell_threshold: float = SPREAD_SELL_THRESHOLD,
+    quantity: int = 100,
+    max_position: int = MAX_POSITION,
+    fill_rate: float = 0.85,
+    partial_fill_rate: float = 0.1,
+    slippage: Tuple[float, float] = (-0.02, 0.02),
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """Backtest the spread strategy's entry/exit rules over recorded ticks.
+
+    Random fill draws are made per tick from ``seed``, so every parameter set
+    in a sweep sees the same fills for the same tick (common random numbers).
+    """
+    n = len(ticks)
+    spread = ticks.spread
+    mid = ticks.mid
+
+    # Entry/exit signals for every tick at once
+    buy_mask = spread < buy_threshold
+    sell_mask = spread > sell_threshold
+
+    # Exchange behaviour for every tick at once
+    rng = np.random.default_rng(seed)
+    draws = rng.random((4, n))
+    filled = draws[0] < fill_rate
+    partial = draws[1] < partial_fill_rate
+    slip = slippage[0] + (slippage[1] - slippage[0]) * draws[3]
+
+    fill_idx, fill_qty, orders = _simulate_fills(
+        ticks.symbol_id, buy_mask, sell_mask, filled, partial, draws[2],
+        quantity, max_position, len(ticks.symbols),
+    )
+
+    # BUY at the ask, SELL at the bid, both with slippage (as ExchangeSimulator)
+    fill_px = np.round(np.where(fill_qty > 0, ticks.ask[fill_idx], ticks.bid[fill_idx]) + slip[fill_idx], 2)
+
+    qty_delta = np.zeros(n)
+    qty_delta[fill_idx] = fill_qty
+    cash_delta = np.zeros(n)
+    cash_delta[fill_idx] = -fill_qty * fill_px
+
+    # Mark-to-market equity curve across all symbols
+    order, starts = group_order(ticks.symbol_id)
+    position = group_cumsum(qty_delta, order, starts)
+    market_value = np.cumsum(group_diff(position * mid, order, starts))
+    equity = np.cumsum(cash_delta) + market_value
+
+    peak = np.maximum.accumulate(np.maximum(equity, 0.0)) if n else equity
+    drawdown = float(np.max(peak - equity)) if n else 0.0
+
+    return {
+        "pnl": float(equity[-1]) if n else 0.0,
+        "turnover": float(np.sum(np.abs(fill_qty) * fill_px)),
+        "max_drawdown": drawdown,
+        "orders": orders,
+        "fills": int(len(fill_idx)),
+        "final_gross_position": _final_gross(position, order, starts),
+    }
+
+
+def _final_gross(position: np.ndarray, order: np.ndarray, starts: np.ndarray) -> int:
+    """Sum of absolute per-symbol positions at the end of the session."""
+    if not len(position):
+        return 0
+    return int(np.sum(np.abs(position[group_last(order, starts)])))
+
+
+# Each pool worker keeps its own copy of the ticks so tasks only carry parameters
+_worker_ticks: Optional[TickArrays] = None
+_worker_fill_model: Dict[str, Any] = {}
+
+
+def _init_worker(ticks: TickArrays, model: Dict[str, Any]):
+    global _worker_ticks, _worker_fill_model
+    _worker_ticks = ticks
+    _worker_fill_model = model
+
+
+def _run_params(params: Dict[str, Any]) -> Dict[str, Any]:
+    return {**params, **run_backtest(_worker_ticks, **_worker_fill_model, **params)}
+
+
+def run_sweep(
+    ticks: TickArrays,
+    grid: Dict[str, Sequence[Any]],
+    workers: Optional[int] = None,
+    exchange: Optional[ExchangeSimulator] = None,
+) -> List[Dict[str, Any]]:
+    """Run every parameter combination in ``grid`` across a process pool.
+
+    Returns one result row per parameter set, best PnL first.
+    """
+    keys = list(grid)
+    combos = [dict(zip(keys, values)) for values in itertools.product(*grid.values())]
+    model = fill_model(exchange)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        _init_worker(ticks, model)
+        results = [_run_params(params) for params in combos]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(ticks, model)) as pool:
+            chunksize = max(1, len(combos) // (workers * 4))
+            results = list(pool.map(_run_params, combos, chunksize=chunksize))
+
+    results.sort(key=lambda r: r["pnl"], reverse=True)
+    return results
+
+
+def format_results(results: List[Dict[str, Any]]) -> str:
+    """Render sweep results as a plain-text table."""
+    if not results:
+        return "(no results)"
+    columns = list(results[0])
+    rows = [[f"{r[c]:.4f}" if isinstance(r[c], float) else str(r[c]) for c in columns] for r in results]
+    widths = [max(len(c), *(len(row[i]) for row in rows)) for i, c in enumerate(columns)]
+    lines = ["  ".join(c.rjust(w) for c, w in zip(columns, widths))]
+    lines += ["  ".join(v.rjust(w) for v, w in zip(row, widths)) for row in rows]
+    return "\n".join(lines)
+
+
+def _floats(text: str) -> List[float]:
+    return [float(v) for v in text.split(",") if v]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Spread strategy parameter sweep")
+    parser.add_argument("--ticks", help="recorded ticks (.npz, .csv or .jsonl)")
+    parser.add_argument("--synthetic", type=int, default=200_000, help="synthetic tick count if --ticks is not given")
+    parser.add_argument("--buy", type=_floats, default=[0.02, 0.03, 0.04, 0.05], help="BUY spread thresholds")
+    parser.add_argument("--sell", type=_floats, default=[0.05, 0.06, 0.07, 0.08], help="SELL spread thresholds")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    ticks = load_ticks(args.ticks) if args.ticks else synthetic_ticks(args.synthetic)
+    results = run_sweep(
+        ticks,
+        {"buy_threshold": args.buy, "sell_threshold": args.sell},
+        workers=args.workers,
+    )
+    print(f"{len(ticks)} ticks, {len(ticks.symbols)} symbols, {len(results)} parameter sets")
+    print(format_results(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Benchmark: RiskEngine.check_orders vs one check_order call per order.
+
+Run from the repo root:
+    python -m benchmarks.bench_batch_risk
+"""
+
+import random
+import time
+from common.utils import configure_logging
+from market_data.schemas import Order
+from risk.limits import LimitTree
+from risk.risk_engine import RiskEngine
+
+N_SYMBOLS = 1_000
+BASKET_SIZES = (10, 100, 1_000)
+REPEATS = 20
+
+
+def make_basket(n: int, seed: int):
+    rng = random.Random(seed)
+    return (
+        [rng.randrange(N_SYMBOLS) for _ in range(n)],
+        [rng.choice(["BUY", "SELL"]) for _ in range(n)],
+        [rng.randint(1, 200) for _ in range(n)],
+        [rng.uniform(10, 500) for _ in range(n)],
+    )
+
+
+def new_engine() -> RiskEngine:
+    # Orders never fill here, so use limits wide enough that most are accepted
+    limits = LimitTree(firm_notional=10**10, strategy_notional=10**10, symbol_position=10**6)
+    engine = RiskEngine(notional_limit=10**10, max_tracked_orders=10**7, limits=limits)
+    for i in range(N_SYMBOLS):
+        engine.symbol_id(f"SYM{i:04d}")
+    return engine
+
+
+def main():
+    configure_logging(level="ERROR")
+    for size in BASKET_SIZES:
+        baskets = [make_basket(size, seed) for seed in range(REPEATS)]
+
+        engine = new_engine()
+        start = time.perf_counter()
+        for symbol_ids, sides, quantities, prices in baskets:
+            result = engine.check_orders(symbol_ids, sides, quantities, prices, strategy="basket")
+        batch = (time.perf_counter() - start) / (REPEATS * size)
+        accepted = int(result.accepted.sum())
+
+        engine = new_engine()
+        start = time.perf_counter()
+        for symbol_ids, sides, quantities, prices in baskets:
+            for sid, side, qty, px in zip(symbol_ids, sides, quantities, prices):
+                engine.check_order(Order(
+                    order_id="", symbol=engine.symbols[sid], side=side, quantity=qty,
+                    price=px, timestamp=0.0, strategy="basket",
+                ))
+        single = (time.perf_counter() - start) / (REPEATS * size)
+
+        print(
+            f"basket={size:>5}: check_orders {batch * 1e6:7.2f} us/order, "
+            f"check_order {single * 1e6:7.2f} us/order "
+            f"(last basket accepted {accepted}/{size})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Benchmark: ExchangeSimulator order entry throughput, per order vs bulk.
+
+Sends N_ORDERS orders in bursts of BURST (the orders a strategy set emits on
+one tick) three ways:
+  * sequential - await process_order for each order (the old on_tick loop);
+  * gather     - asyncio.gather of process_order per order (one coroutine
+                 and one sleep each);
+  * bulk       - one process_orders call per burst (one round trip).
+
+Latency is shrunk from the simulator default so the run stays short; the
+ratios, not the absolute numbers, are the point.
+
+Run from the repo root:
+    python -m benchmarks.bench_exchange_bulk
+"""
+
+import asyncio
+import time
+from common.utils import configure_logging
+from exchange_sim.exchange import ExchangeSimulator
+from market_data.schemas import Order
+
+N_ORDERS = 2000
+BURST = 20
+LATENCY_MS = (1, 3)
+
+
+def make_orders(n: int):
+    return [
+        Order(order_id=f"ORD{i}", symbol="AAPL", side="BUY" if i % 2 else "SELL",
+              quantity=100, price=150.0, timestamp=float(i))
+        for i in range(n)
+    ]
+
+
+async def sequential(exchange, bursts):
+    for burst in bursts:
+        for order in burst:
+            await exchange.process_order(order)
+
+
+async def gathered(exchange, bursts):
+    for burst in bursts:
+        await asyncio.gather(*(exchange.process_order(order) for order in burst))
+
+
+async def bulk(exchange, bursts):
+    for burst in bursts:
+        await exchange.process_orders(burst)
+
+
+def run(fn, exchange, bursts) -> float:
+    start = time.perf_counter()
+    asyncio.run(fn(exchange, bursts))
+    return time.perf_counter() - start
+
+
+def main():
+    configure_logging(level="WARNING")
+    exchange = ExchangeSimulator()
+    exchange.latency_ms = LATENCY_MS
+    orders = make_orders(N_ORDERS)
+    bursts = [orders[i:i + BURST] for i in range(0, N_ORDERS, BURST)]
+
+    print(f"{N_ORDERS} orders in bursts of {BURST}, latency {LATENCY_MS[0]}-{LATENCY_MS[1]} ms")
+    results = {name: run(fn, exchange, bursts) for name, fn in (
+        ("sequential", sequential), ("gather", gathered), ("bulk", bulk),
+    )}
+    for name, elapsed in results.items():
+        print(f"{name:>10}: {elapsed:7.3f}s  {N_ORDERS / elapsed:10.0f} orders/s  "
+              f"({elapsed / results['bulk']:.1f}x bulk)")
+
+
+if __name__ == "__main__":
+    main()
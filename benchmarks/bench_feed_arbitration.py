@@ -0,0 +1,211 @@
+"""Benchmark: A/B feed line arbitration.
+
+Part 1 times SequenceArbiter.accept on a synthetic A/B stream (every tick
+arrives twice, B usually second).
+
+Part 2 serves a local MarketDataFeed on two lines, B delayed with jitter and
+lossy, and runs an A/B FeedHandler for RUN_SECONDS. It checks that every
+published tick was delivered exactly once, in sequence per symbol, and
+prints the per-line win/duplicate split and lead over the other line.
+
+Part 3 stalls line A for STALL_SECONDS mid-run and compares a single-line
+handler on A against the A/B handler: the longest gap between delivered
+ticks and the worst tick age at delivery.
+
+Part 4 restarts the feed under an A/B handler, so its seq starts again at 1:
+once as a new process (both lines drop and reconnect), and once in place
+with the lines still connected. It checks that every tick published after
+each restart is delivered.
+
+Run from the repo root:
+    python -m benchmarks.bench_feed_arbitration
+"""
+
+import asyncio
+import functools
+import random
+import time
+from common.config import FEED_RECONNECT_INTERVAL
+from common.histogram import LatencyHistogram
+from common.utils import configure_logging
+from market_data.arbitration import SequenceArbiter
+from market_data.feed_generator import MarketDataFeed
+from market_data.feed_handler import FeedHandler
+
+PORTS = (8821, 8822)
+SYMBOLS = [f"SYM{i:02d}" for i in range(20)]
+RATE = 2000
+RUN_SECONDS = 3.0
+STALL_SECONDS = 1.0
+B_IMPAIRMENT = (0.002, 0.002, 0.01)  # delay, jitter, drop probability
+N_ARBITRATED = 200_000
+
+
+def arbitration_cost():
+    arbiter = SequenceArbiter(["A", "B"])
+    a, b = arbiter.lines["A"], arbiter.lines["B"]
+    rng = random.Random(1)
+    stream = []
+    for seq in range(1, N_ARBITRATED // 2 + 1):
+        symbol = SYMBOLS[seq % len(SYMBOLS)]
+        first, second = (b, a) if rng.random() < 0.2 else (a, b)
+        stream.append((first, symbol, seq, seq * 1000))
+        stream.append((second, symbol, seq, seq * 1000 + 2000))
+    accept = arbiter.accept
+    start = time.perf_counter_ns()
+    for line, symbol, seq, recv_ns in stream:
+        accept(line, symbol, seq, recv_ns)
+    elapsed = time.perf_counter_ns() - start
+    print(f"SequenceArbiter.accept: {elapsed / len(stream):.0f} ns/message over {len(stream):,} messages "
+          f"(A won {a.won:,}, B won {b.won:,})")
+
+
+class Recorder:
+    """on_tick callback: inter-delivery gaps, tick age and sequence checks."""
+
+    def __init__(self):
+        self.seqs = []
+        self.last_seq = {}
+        self.out_of_order = 0
+        self.last_at = None
+        self.max_gap = 0.0
+        self.age = LatencyHistogram()
+
+    def on_tick(self, tick):
+        now = time.time()
+        if self.last_at is not None:
+            self.max_gap = max(self.max_gap, now - self.last_at)
+        self.last_at = now
+        self.age.record(int((now - tick.timestamp) * 1e9))
+        if tick.seq <= self.last_seq.get(tick.symbol, 0):
+            self.out_of_order += 1
+        self.last_seq[tick.symbol] = tick.seq
+        self.seqs.append(tick.seq)
+
+
+async def serve(feed: MarketDataFeed):
+    import websockets
+    return [await websockets.serve(functools.partial(feed.handle_client, port=port), "localhost", port)
+            for port in feed.ports]
+
+
+async def close(servers):
+    for server in servers:
+        server.close()
+        await server.wait_closed()
+
+
+async def run_feed(feed: MarketDataFeed, handlers, seconds: float, stall_port=None):
+    servers = await serve(feed)
+    listeners = []
+    for handler in handlers:
+        await handler.connect()
+        listeners.append(asyncio.create_task(handler.listen()))
+    await asyncio.sleep(0.2)  # subscriptions registered before the first tick
+    feeding = asyncio.create_task(feed.run_feed())
+    if stall_port is not None:
+        await asyncio.sleep(seconds / 3)
+        feed.stall(stall_port, STALL_SECONDS)
+        await asyncio.sleep(seconds * 2 / 3)
+    else:
+        await asyncio.sleep(seconds)
+    feeding.cancel()
+    await asyncio.sleep(STALL_SECONDS + 0.5)  # drain delayed and stalled lines
+    for task in listeners:
+        task.cancel()
+    for handler in handlers:
+        await handler.disconnect()
+    await close(servers)
+    for task in feed._senders.values():
+        task.cancel()
+
+
+def live_ab():
+    feed = MarketDataFeed(symbols=SYMBOLS, rate=RATE, ports=PORTS, impairments={PORTS[1]: B_IMPAIRMENT})
+    recorder = Recorder()
+    handler = FeedHandler(recorder.on_tick, ports=PORTS)
+    asyncio.run(run_feed(feed, [handler], RUN_SECONDS))
+
+    delivered = len(recorder.seqs)
+    unique = len(set(recorder.seqs))
+    print(f"Live A/B ({RATE} ticks/s for {RUN_SECONDS:.0f}s, B delayed {B_IMPAIRMENT[0] * 1000:.0f}ms "
+          f"+ up to {B_IMPAIRMENT[1] * 1000:.0f}ms jitter, {B_IMPAIRMENT[2]:.0%} dropped):")
+    print(f"  published {feed.seq}, delivered {delivered} ({unique} unique, "
+          f"{delivered - unique} duplicates, {recorder.out_of_order} out of order, "
+          f"{feed.seq - unique} missing)")
+    for name, line in handler.get_line_stats().items():
+        lead = line["advantage_us"]
+        print(f"  line {name}: received {line['received']:5d}  won {line['won']:5d} ({line['win_rate']:4.0%})  "
+              f"dup {line['duplicates']:5d}  stale {line['stale']:3d}  sole {line['sole']:3d}  "
+              f"lead p50 {lead['p50']:7.0f}us p99 {lead['p99']:7.0f}us")
+
+
+def stall_comparison():
+    feed = MarketDataFeed(symbols=SYMBOLS, rate=RATE, ports=PORTS, impairments={PORTS[1]: (0.001, 0.001, 0.0)})
+    single, redundant = Recorder(), Recorder()
+    handlers = [FeedHandler(single.on_tick, port=PORTS[0]), FeedHandler(redundant.on_tick, ports=PORTS)]
+    asyncio.run(run_feed(feed, handlers, RUN_SECONDS, stall_port=PORTS[0]))
+
+    print(f"Line A stalled for {STALL_SECONDS:.1f}s ({RUN_SECONDS:.0f}s run, B delayed 1-2ms):")
+    for label, recorder in (("single line A", single), ("A/B arbitrated", redundant)):
+        age = recorder.age.summary()
+        print(f"  {label:<15} delivered {len(recorder.seqs):5d}  longest gap {recorder.max_gap * 1000:7.1f} ms  "
+              f"tick age p50 {age['p50'] / 1000:6.2f} ms p99 {age['p99'] / 1000:7.1f} ms "
+              f"max {age['max'] / 1000:7.1f} ms")
+
+
+async def restarts():
+    recorder = Recorder()
+    handler = FeedHandler(recorder.on_tick, ports=PORTS)
+
+    async def publish(feed: MarketDataFeed) -> tuple:
+        """Publish for 1s; (published, delivered) in that time."""
+        recorder.last_seq.clear()
+        start_seq, delivered = feed.seq, len(recorder.seqs)
+        feeding = asyncio.create_task(feed.run_feed())
+        await asyncio.sleep(1.0)
+        feeding.cancel()
+        await asyncio.sleep(0.2)
+        return feed.seq - start_seq, len(recorder.seqs) - delivered
+
+    first = MarketDataFeed(symbols=SYMBOLS, rate=RATE / 2, ports=PORTS)
+    servers = await serve(first)
+    await handler.connect()
+    listening = asyncio.create_task(handler.listen())
+    await asyncio.sleep(0.2)
+    phases = [("first session", await publish(first))]
+
+    # New feed process: both lines drop, reconnect and see seq from 1 again
+    await close(servers)
+    second = MarketDataFeed(symbols=SYMBOLS, rate=RATE / 2, ports=PORTS)
+    servers = await serve(second)
+    deadline = time.monotonic() + 5 * FEED_RECONNECT_INTERVAL
+    while handler.connected_lines() < len(PORTS) and time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+    await asyncio.sleep(0.2)
+    phases.append(("process restart", await publish(second)))
+
+    # Sequence restarts with both lines still connected
+    second.seq = 0
+    phases.append(("in-place restart", await publish(second)))
+
+    listening.cancel()
+    await handler.disconnect()
+    await close(servers)
+    print(f"Feed restarts (A/B, {RATE // 2} ticks/s, 1s per phase):")
+    for label, (published, delivered) in phases:
+        print(f"  {label:<17} published {published:5d}  delivered {delivered:5d}")
+    print(f"  sequence sessions reset: {handler.arbiter.resets}, "
+          f"out of order within a session: {recorder.out_of_order}")
+
+
+def main():
+    configure_logging(level="WARNING")
+    arbitration_cost()
+    live_ab()
+    stall_comparison()
+    asyncio.run(restarts())
+
+
+if __name__ == "__main__":
+    main()
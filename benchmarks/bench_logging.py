@@ -0,0 +1,59 @@
+"""Benchmark: hot-path ticks/s with logging off, synchronous and asynchronous.
+
+Drives OrderBook.update and StrategyEngine.generate_signal (plus the
+"Received tick" line from TradingSystem.on_tick) with output sent to
+/dev/null, so the numbers are the cost on the trading thread only.
+
+Run from the repo root:
+    python -m benchmarks.bench_logging
+"""
+
+import os
+import time
+from common.utils import configure_logging, flush_logging, get_logging_stats, setup_logger
+from tickerplant.orderbook import OrderBook
+from strategy.strategy_engine import StrategyEngine
+from benchmarks.bench_spread_quantiles import make_ticks
+
+N_TICKS = 50_000
+
+MODES = [
+    ("off (WARNING)", dict(async_mode=False, level="WARNING", rate_limit=0)),
+    ("sync INFO", dict(async_mode=False, level="INFO", rate_limit=0)),
+    ("async INFO", dict(async_mode=True, level="INFO", rate_limit=0)),
+    ("async INFO, 10/s per call site", dict(async_mode=True, level="INFO", rate_limit=10)),
+    ("sync DEBUG", dict(async_mode=False, level="DEBUG", rate_limit=0)),
+    ("async DEBUG", dict(async_mode=True, level="DEBUG", rate_limit=0)),
+]
+
+
+def run(ticks) -> float:
+    logger = setup_logger("main_trading_system")
+    orderbook = OrderBook()
+    strategy = StrategyEngine()
+    positions = {}
+    start = time.perf_counter()
+    for tick in ticks:
+        logger.info("Received tick: %s", tick)
+        book = orderbook.update(tick)
+        strategy.generate_signal(book, positions)
+    return len(ticks) / (time.perf_counter() - start)
+
+
+def main():
+    ticks = make_ticks(N_TICKS)
+    results = []
+    with open(os.devnull, "w") as devnull:
+        for label, options in MODES:
+            configure_logging(stream=devnull, **options)
+            rate = run(ticks)
+            flush_logging()
+            results.append((label, rate, get_logging_stats()))
+        configure_logging(async_mode=False, level="INFO", rate_limit=0, stream=None)
+
+    for label, rate, stats in results:
+        print(f"{label:<32} {rate:>10,.0f} ticks/s   (suppressed so far: {stats['suppressed']}, dropped: {stats['dropped']})")
+
+
+if __name__ == "__main__":
+    main()
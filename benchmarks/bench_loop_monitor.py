@@ -0,0 +1,91 @@
+"""Benchmark: event loop health monitor.
+
+Part 1 drives N_TICKS feed messages through TradingSystem.on_tick with
+orders and fills (so OMS fill commits and journal writes run on the loop),
+yielding between ticks like a socket read would, with the LoopMonitor
+running. It prints the lag distribution, depths and the blocking call
+sites the watchdog attributed stalls to.
+
+Part 2 measures the monitor's cost: order-free tick throughput with and
+without the monitor task running.
+
+Run from the repo root:
+    python -m benchmarks.bench_loop_monitor
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+from benchmarks.bench_tick_to_trade import make_messages
+from common.utils import configure_logging
+from market_data.feed_handler import decode_tick
+from market_data.schemas import Tick
+
+N_TICKS = 2000
+N_QUIET_TICKS = 50_000
+
+
+async def with_monitor(system, coro, monitored: bool):
+    monitor = asyncio.create_task(system.loop_monitor.run()) if monitored else None
+    await asyncio.sleep(0)
+    try:
+        return await coro
+    finally:
+        if monitor is not None:
+            monitor.cancel()
+
+
+async def drive(system, messages):
+    for message in messages:
+        tick = decode_tick(message)
+        tick.recv_ns = time.perf_counter_ns()
+        await system.on_tick(tick)
+        await asyncio.sleep(0)
+
+
+async def drive_quiet(system, n: int) -> float:
+    start = time.perf_counter()
+    for i in range(n):
+        # Spread between the thresholds: no orders
+        await system.on_tick(Tick(symbol="SYM", bid=99.0, ask=99.045, bid_size=100, ask_size=100,
+                                  timestamp=0.0))
+        if i % 16 == 0:
+            await asyncio.sleep(0)
+    return n / (time.perf_counter() - start)
+
+
+def main():
+    configure_logging(level="ERROR")
+    os.chdir(tempfile.mkdtemp())
+    from main_trading_system import TradingSystem
+
+    system = TradingSystem()
+    system.exchange.latency_ms = (0.1, 0.5)
+    asyncio.run(with_monitor(system, drive(system, make_messages(N_TICKS)), True))
+    system.oms.flush()
+
+    health = system.loop_monitor.summary()
+    lag = health["lag"]
+    print(f"{N_TICKS} ticks, {system.stats['orders_sent']} orders, {system.stats['fills_received']} fills")
+    print(f"Loop lag (us): n={lag['count']} p50={lag['p50']:.0f} p99={lag['p99']:.0f} max={lag['max']:.0f}")
+    print(f"Stalls over {system.loop_monitor.threshold * 1000:.0f}ms: {health['stalls']}, "
+          f"depths at last sample: {health['depths']}")
+    for site in health["top_sites"]:
+        print(f"  {site['count']:4d}x total {site['total_ms']:7.1f}ms max {site['max_ms']:6.1f}ms  "
+              f"{site['where']}  [{site['task']}]")
+
+    print(f"Monitor overhead ({N_QUIET_TICKS:,} order-free ticks):")
+    rates = {}
+    for monitored in (False, True, False, True):
+        system = TradingSystem()
+        rates.setdefault(monitored, []).append(
+            asyncio.run(with_monitor(system, drive_quiet(system, N_QUIET_TICKS), monitored))
+        )
+    off, on = max(rates[False]), max(rates[True])
+    print(f"  without monitor: {off:9.0f} ticks/s")
+    print(f"  with monitor   : {on:9.0f} ticks/s ({(off - on) / off:+.1%} slower)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Benchmark: memory accounting accuracy, cost and leak detection.
+
+Part 1 fills the structures MemoryMonitor sizes (risk order paths, OMS order
+store, books) to N entries, and compares approx_size with the bytes
+tracemalloc attributes to the fill, and times one sample().
+
+Part 2 simulates a leak: a registered dict grows every sampling interval on a
+compressed clock, so the growth alert fires; then two tracemalloc snapshots
+around more growth name the allocating line.
+
+Run from the repo root:
+    python -m benchmarks.bench_memory
+"""
+
+import os
+import tempfile
+import time
+import tracemalloc
+from common.memory import MemoryMonitor, approx_size
+from common.utils import configure_logging
+from market_data.schemas import Order, Tick
+from oms.order_store import OrderStore
+from risk.risk_engine import RiskEngine
+from tickerplant.orderbook import OrderBook
+
+SIZES = (10_000, 100_000, 1_000_000)
+
+
+def fill(n: int):
+    risk, store, books = RiskEngine(max_tracked_orders=n), OrderStore(max_terminal=n), OrderBook()
+    for i in range(n):
+        order = Order(order_id=f"ORD{i:08d}", symbol=f"SYM{i % 500:03d}", side="BUY", quantity=100,
+                      price=100.0 + i % 7, timestamp=float(i), strategy="bench")
+        risk.orders[order.order_id] = risk.limit_path(order)
+        store.add(order)
+        if i < 5000:
+            books.update(Tick(symbol=f"S{i:05d}", bid=99.0, ask=99.05, bid_size=100, ask_size=100, timestamp=0.0))
+    return {"risk.orders": risk.orders, "oms.orders": store, "orderbook.books": books.books}
+
+
+def accuracy():
+    print(f"{'structure':<16} {'entries':>9} {'approx MB':>10} {'traced MB':>10} {'ratio':>6} {'size ms':>8}")
+    for n in SIZES:
+        tracemalloc.start()
+        structures = fill(n)
+        traced = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        approx = 0
+        for name, obj in structures.items():
+            start = time.perf_counter()
+            size = approx_size(obj)
+            ms = (time.perf_counter() - start) * 1000
+            approx += size
+            print(f"{name:<16} {len(obj):9d} {size / 2**20:10.1f} {'':>10} {'':>6} {ms:8.2f}")
+        print(f"{'all':<16} {n:9d} {approx / 2**20:10.1f} {traced / 2**20:10.1f} {approx / traced:6.2f}")
+        del structures
+
+
+def leak():
+    clock = [0.0]
+    monitor = MemoryMonitor(window=3600.0, min_span=600.0, structure_alert_mb_per_hour=10.0)
+    leaked = {}
+    monitor.register("leaky.cache", lambda: leaked)
+    time_monotonic = time.monotonic
+    time.monotonic = lambda: clock[0]
+    try:
+        for minute in range(30):
+            for i in range(2000):
+                leaked[(minute, i)] = "x" * 100
+            clock[0] += 60.0
+            report = monitor.sample()
+    finally:
+        time.monotonic = time_monotonic
+    values = report["leaky.cache"]
+    print(f"leaky.cache after 30 simulated minutes: {values['entries']} entries, {values['bytes'] / 2**20:.1f} MB, "
+          f"{values['mb_per_hour']:+.1f} MB/h, {values['entries_per_hour']:+.0f} entries/h")
+
+    monitor.snapshot()
+    for i in range(20000):
+        leaked[("after", i)] = "y" * 100
+    growth = monitor.snapshot(top=3)
+    monitor.stop_tracing()
+    print("Top growth sites between snapshots:")
+    for site in growth:
+        print(f"  {site['size_diff_kb']:+9.1f} KB {site['count_diff']:+7d} blocks  {site['where']}")
+
+
+def main():
+    configure_logging(level="WARNING")
+    os.chdir(tempfile.mkdtemp())
+    accuracy()
+    leak()
+
+
+if __name__ == "__main__":
+    main()
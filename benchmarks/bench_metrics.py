@@ -0,0 +1,114 @@
+"""Benchmark: cost of recording metrics on the hot path and of a scrape.
+
+Hot-path operations (counter inc, labelled inc, gauge set, histogram
+record) must each stay under HOT_PATH_BUDGET_NS; the scrape renders the
+registry after a TradingSystem has processed ticks, collectors included.
+
+Run from the repo root:
+    python -m benchmarks.bench_metrics
+"""
+
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from common.metrics import MetricsRegistry
+from common.utils import configure_logging
+
+N_OPS = 1_000_000
+N_SCRAPES = 50
+N_TICKS = 20_000
+HOT_PATH_BUDGET_NS = 1000
+
+
+def per_op_ns(fn, n: int = N_OPS) -> float:
+    start = time.perf_counter_ns()
+    fn(n)
+    return (time.perf_counter_ns() - start) / n
+
+
+def record_costs(registry: MetricsRegistry):
+    counter = registry.counter("bench_plain_total", "Unlabelled counter")
+    labelled = registry.counter("bench_labelled_total", "Labelled counter", ("symbol", "strategy"))
+    gauge = registry.gauge("bench_gauge", "Gauge")
+    histogram = registry.histogram("bench_seconds", "Histogram", ("op",))
+    symbols = [f"SYM{i:02d}" for i in range(20)]
+    latencies = [random.randint(500, 5_000_000) for _ in range(4096)]
+
+    def empty_loop(n):
+        for i in range(n):
+            pass
+
+    def counter_inc(n):
+        inc = counter.inc
+        for i in range(n):
+            inc()
+
+    def labelled_inc(n):
+        for i in range(n):
+            labelled.labels(symbols[i % 20], "bench").inc()
+
+    def gauge_set(n):
+        set_ = gauge.set
+        for i in range(n):
+            set_(i)
+
+    def histogram_record(n):
+        child = histogram.labels("fill")
+        for i in range(n):
+            child.record(latencies[i & 4095])
+
+    loop = per_op_ns(empty_loop)
+    return {
+        "counter.inc": per_op_ns(counter_inc) - loop,
+        "counter.labels(symbol, strategy).inc": per_op_ns(labelled_inc) - loop,
+        "gauge.set": per_op_ns(gauge_set) - loop,
+        "histogram.labels(op).record": per_op_ns(histogram_record) - loop,
+    }
+
+
+def scrape_cost() -> tuple:
+    from common.metrics import REGISTRY
+    from main_trading_system import TradingSystem
+    from market_data.schemas import Tick
+
+    system = TradingSystem()
+    rng = random.Random(3)
+
+    async def drive():
+        for i in range(N_TICKS):
+            bid = round(rng.uniform(99, 100), 2)
+            # Spreads between the thresholds: no orders, so no disk-bound fills
+            await system.on_tick(Tick(symbol=f"SYM{i % 20:02d}", bid=bid, ask=round(bid + 0.045, 2),
+                                      bid_size=100, ask_size=100, timestamp=time.time()))
+
+    asyncio.run(drive())
+    start = time.perf_counter()
+    for _ in range(N_SCRAPES):
+        body = REGISTRY.exposition()
+    return (time.perf_counter() - start) / N_SCRAPES * 1000, len(body), body.count("\n")
+
+
+def main():
+    configure_logging(level="WARNING")
+    os.chdir(tempfile.mkdtemp())
+
+    print(f"Record cost ({N_OPS:,} ops, loop overhead subtracted):")
+    over = []
+    for name, ns in record_costs(MetricsRegistry()).items():
+        print(f"  {name:<38}: {ns:7.1f} ns")
+        if ns > HOT_PATH_BUDGET_NS:
+            over.append(name)
+
+    ms, size, lines = scrape_cost()
+    print(f"Scrape after {N_TICKS:,} ticks: {ms:.2f} ms per exposition ({size:,} bytes, {lines:,} lines)")
+
+    if over:
+        print(f"Over the {HOT_PATH_BUDGET_NS} ns budget: {', '.join(over)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Benchmark: OMS order lifecycle throughput and memory bound.
+
+Drives submit -> fill -> FILLED (with some rejects) through the OMS and
+compares batched write-behind against one SQLite transaction per update
+(the previous behaviour). Fills are still committed individually, so the
+batched figure is bounded by fill commits. Open-order lookups use the store's indexes.
+
+Run from the repo root (the database is created in a temp directory):
+    python -m benchmarks.bench_oms
+"""
+
+import os
+import random
+import tempfile
+import time
+from common.utils import configure_logging
+from market_data.schemas import Fill, Order
+
+N_ORDERS = 2_000
+N_SYMBOLS = 50
+
+
+def make_order(i: int, rng: random.Random):
+    return Order(
+        order_id=f"ord-{i}",
+        symbol=f"SYM{rng.randrange(N_SYMBOLS):02d}",
+        side=rng.choice(["BUY", "SELL"]),
+        quantity=100,
+        price=100.0,
+        timestamp=float(i),
+        status="APPROVED",
+        strategy="bench",
+    )
+
+
+def drive(oms, n: int) -> float:
+    rng = random.Random(1)
+    start = time.perf_counter()
+    for i in range(n):
+        order = make_order(i, rng)
+        oms.submit_order(order)
+        if rng.random() < 0.1:
+            oms.update_order_status(order.order_id, "REJECTED", "MARKET_REJECT")
+            continue
+        oms.record_fill(Fill(
+            order_id=order.order_id, symbol=order.symbol, side=order.side,
+            quantity=rng.choice([100, 50]), price=order.price, timestamp=order.timestamp,
+            fill_id=f"fill-{i}",
+        ))
+        oms.update_order_status(order.order_id, "FILLED")
+    oms.flush()
+    return n / (time.perf_counter() - start)
+
+
+def main():
+    configure_logging(level="WARNING")
+    workdir = tempfile.mkdtemp()
+    os.chdir(workdir)
+    from oms.oms import OrderManagementService
+
+    oms = OrderManagementService()
+    oms.orders.max_terminal = 500
+    batched = drive(oms, N_ORDERS)
+
+    # Previous behaviour: every order write committed on its own
+    import oms.oms as oms_module
+    oms_module.OMS_FLUSH_BATCH = 1
+    os.chdir(tempfile.mkdtemp())
+    unbatched_oms = OrderManagementService()
+    unbatched = drive(unbatched_oms, N_ORDERS // 10)
+    os.chdir(workdir)
+
+    open_orders = [make_order(N_ORDERS * 2 + i, random.Random(i)) for i in range(1000)]
+    for order in open_orders:
+        oms.submit_order(order)
+    start = time.perf_counter()
+    for i in range(10_000):
+        oms.get_open_orders(symbol=f"SYM{i % N_SYMBOLS:02d}")
+    lookups = 10_000 / (time.perf_counter() - start)
+
+    print(f"Order lifecycles, batched writes ({N_ORDERS}):  {batched:>10,.0f} orders/s")
+    print(f"Order lifecycles, per-update commit ({N_ORDERS // 10}): {unbatched:>10,.0f} orders/s")
+    print(f"Open-order lookups by symbol (1000 live):     {lookups:>10,.0f} lookups/s")
+    print(f"Store stats: {oms.orders.stats()}")
+    print(f"Orders persisted: {len(oms.get_orders(limit=N_ORDERS * 3))}")
+
+
+if __name__ == "__main__":
+    main()
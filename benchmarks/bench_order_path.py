@@ -0,0 +1,120 @@
+"""Benchmark: per-order latency and memory on the strategy -> risk -> OMS -> exchange path.
+
+Part 1 compares the memory held per order and the cost of building one
+order and passing it through three stages, using dicts copied with
+{**order, ...} (the old order path) and one slotted Order updated in place.
+Part 2 times the real in-memory pipeline: generate_signal, check_order,
+submit_order, execute, apply_fill and the OMS status update. Batched OMS
+writes are deferred; the only database writes left are the flushes
+triggered when terminal orders are evicted (they show up in max).
+
+Run from the repo root:
+    python -m benchmarks.bench_order_path
+"""
+
+import os
+import tempfile
+import time
+import tracemalloc
+import uuid
+from common.utils import configure_logging
+from market_data.schemas import Order
+
+N = 50_000
+
+
+def dict_path(i: int):
+    order = {
+        "order_id": str(uuid.uuid4()), "symbol": "AAPL", "side": "BUY", "quantity": 100,
+        "price": 150.0, "order_type": "LIMIT", "timestamp": float(i), "strategy": "bench",
+    }
+    approved = {**order, "order_id": str(uuid.uuid4()), "status": "APPROVED"}
+    submitted = {**order, "order_id": approved["order_id"], "status": approved["status"]}
+    sent = {**order, "order_id": approved["order_id"]}
+    return submitted, sent
+
+
+def record_path(i: int):
+    order = Order(
+        order_id=str(uuid.uuid4()), symbol="AAPL", side="BUY", quantity=100,
+        price=150.0, timestamp=float(i), strategy="bench",
+    )
+    order.order_id = str(uuid.uuid4())
+    order.status = "APPROVED"
+    return order
+
+
+def retained_bytes(factory) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [factory(i) for i in range(N)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return (after - before) / N
+
+
+def per_call_us(fn) -> float:
+    start = time.perf_counter()
+    for i in range(N):
+        fn(i)
+    return (time.perf_counter() - start) / N * 1e6
+
+
+def pipeline():
+    import oms.oms as oms_module
+    from exchange_sim.exchange import ExchangeSimulator
+    from risk.limits import LimitTree
+    from risk.risk_engine import RiskEngine
+    from strategy.strategy_engine import StrategyEngine
+
+    os.chdir(tempfile.mkdtemp())
+    oms_module.OMS_FLUSH_BATCH = N * 2
+    strategy = StrategyEngine()
+    risk = RiskEngine(position_limit=10**9, notional_limit=10**15, limits=LimitTree())
+    oms = oms_module.OrderManagementService()
+    exchange = ExchangeSimulator()
+    exchange.fill_rate = 1.0
+    books = [{"symbol": f"SYM{i:02d}", "bid": 99.99, "ask": 100.0} for i in range(50)]
+
+    def one(i: int):
+        order = strategy.generate_signal(books[i % 50], {})
+        risk.check_order(order)
+        oms.submit_order(order)
+        fill = exchange.execute(order)
+        risk.apply_fill(fill)
+        oms.orders.apply_fill(fill.order_id, fill.quantity)
+        oms.update_order_status(fill.order_id, "FILLED")
+
+    latencies = []
+    for i in range(N):
+        t0 = time.perf_counter_ns()
+        one(i)
+        latencies.append(time.perf_counter_ns() - t0)
+    latencies.sort()
+
+    # Second pass under tracemalloc (which slows everything down) for memory only
+    tracemalloc.start()
+    start_mem = tracemalloc.get_traced_memory()[0]
+    for i in range(N):
+        one(i)
+    held = (tracemalloc.get_traced_memory()[0] - start_mem) / N
+    tracemalloc.stop()
+    return latencies, held
+
+
+def main():
+    configure_logging(level="WARNING")
+    print(f"Memory held per order:   dict path {retained_bytes(dict_path):7.0f} B   "
+          f"slotted record {retained_bytes(record_path):7.0f} B")
+    print(f"Build + 3 stage handoff: dict path {per_call_us(dict_path):7.2f} us  "
+          f"slotted record {per_call_us(record_path):7.2f} us")
+
+    latencies, held = pipeline()
+    p = lambda q: latencies[int(q * (len(latencies) - 1))] / 1000
+    print(f"Order path ({N} orders, in memory): p50={p(0.5):.1f}us p99={p(0.99):.1f}us "
+          f"max={latencies[-1] / 1000:.1f}us, {held:.0f} B retained/order (OMS store + pending writes)")
+
+
+if __name__ == "__main__":
+    main()
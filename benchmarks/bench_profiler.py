@@ -0,0 +1,95 @@
+"""Benchmark: sampling profiler cost and output on a live tick loop.
+
+Part 1 measures the cost of sampling: order-free feed messages through
+TradingSystem.on_tick for RUN_SECONDS with the profiler off and sampling at
+each of RATES (the profile runs on another thread, as it does behind the
+admin endpoint).
+
+Part 2 profiles a run with orders and fills and prints the per-stage split
+and hottest stacks. Collapsed stacks are written to the temp directory.
+
+Run from the repo root:
+    python -m benchmarks.bench_profiler
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import Counter
+from benchmarks.bench_tick_to_trade import make_messages
+from common.utils import configure_logging
+from market_data.feed_handler import decode_tick
+
+RUN_SECONDS = 3.0
+RATES = (100, 1000)
+
+
+def quiet_messages(n: int):
+    # Spread between the buy and sell thresholds: no orders, so no disk-bound commits
+    return [json.dumps({"symbol": f"SYM{i % 20:02d}", "bid": 99.0, "ask": 99.045, "bid_size": 100,
+                        "ask_size": 100, "timestamp": time.time()}) for i in range(n)]
+
+
+async def drive(system, messages, seconds: float) -> float:
+    ticks = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        tick = decode_tick(messages[ticks % len(messages)])
+        tick.recv_ns = time.perf_counter_ns()
+        await system.on_tick(tick)
+        ticks += 1
+    return ticks / seconds
+
+
+def run(system, messages, rate: int) -> float:
+    async def main():
+        system.profiler.attach()
+        profiling = None
+        if rate:
+            profiling = threading.Thread(target=system.profiler.profile, args=(RUN_SECONDS, rate))
+            profiling.start()
+        tps = await drive(system, messages, RUN_SECONDS)
+        if profiling is not None:
+            profiling.join()
+        return tps
+
+    return asyncio.run(main())
+
+
+def main():
+    configure_logging(level="WARNING")
+    os.chdir(tempfile.mkdtemp())
+    from main_trading_system import TradingSystem
+
+    print(f"Sampling cost (order-free ticks, {RUN_SECONDS:.0f}s per run):")
+    system = TradingSystem()
+    messages = quiet_messages(1000)
+    baseline = max(run(system, messages, 0) for _ in range(2))
+    print(f"  profiler off     : {baseline:8.0f} ticks/s")
+    for rate in RATES:
+        tps = run(system, messages, rate)
+        print(f"  sampling {rate:5d} Hz: {tps:8.0f} ticks/s ({(baseline - tps) / baseline:+.1%} slower), "
+              f"{system.profiler.last_samples} samples")
+
+    print("Profile with orders and fills (100 Hz):")
+    system = TradingSystem()
+    system.exchange.latency_ms = (0.1, 0.5)
+    run(system, make_messages(5000), 100)
+    with open(system.profiler.last_path) as f:
+        stacks = [line.rsplit(" ", 1) for line in f.read().splitlines()]
+    stages = Counter()
+    for stack, count in stacks:
+        stages[stack.split(";", 1)[0]] += int(count)
+    total = sum(stages.values())
+    print("  stage split: " + ", ".join(f"{stage} {n / total:.0%}" for stage, n in stages.most_common()))
+    print(f"  hottest stacks (innermost first), full output in {os.path.abspath(system.profiler.last_path)}:")
+    for stack, count in stacks[:5]:
+        frames = stack.split(";")
+        print(f"  {int(count):5d}  {frames[0]} {' <- '.join(reversed(frames[-3:]))}")
+
+
+if __name__ == "__main__":
+    main()
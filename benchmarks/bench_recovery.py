@@ -0,0 +1,82 @@
+"""Benchmark: journal append rate and warm-restart recovery time.
+
+Writes a journal of order/status/fill events, then restarts TradingSystem
+twice: once with no snapshot (full replay) and once from the snapshot the
+first recovery wrote plus a short tail of newer events.
+
+Run from the repo root (journal and database go to a temp directory):
+    python -m benchmarks.bench_recovery
+"""
+
+import os
+import random
+import tempfile
+import time
+from common.config import JOURNAL_DIR
+from common.journal import EventJournal, FILL_EVENT, ORDER_EVENT, STATUS_EVENT
+from common.utils import configure_logging
+
+N_ORDERS = 200_000
+TAIL_ORDERS = 2_000
+SYMBOLS = [f"SYM{i:02d}" for i in range(20)]
+
+
+def write_orders(journal: EventJournal, start: int, n: int, rng: random.Random):
+    for i in range(start, start + n):
+        order = {
+            "order_id": f"ord-{i}",
+            "symbol": rng.choice(SYMBOLS),
+            "side": rng.choice(["BUY", "SELL"]),
+            "quantity": 10,
+            "price": round(rng.uniform(90, 110), 2),
+            "order_type": "LIMIT",
+            "timestamp": time.time(),
+            "status": "APPROVED",
+            "strategy": "SimpleSpreadStrategy",
+        }
+        journal.append(ORDER_EVENT, order)
+        if rng.random() < 0.1:
+            journal.append(STATUS_EVENT, {"order_id": order["order_id"], "status": "REJECTED", "reason": "MARKET_REJECT"})
+            continue
+        journal.append(FILL_EVENT, {**order, "fill_id": f"fill-{i}", "status": "FILLED"})
+        journal.append(STATUS_EVENT, {"order_id": order["order_id"], "status": "FILLED", "reason": None})
+
+
+def restart():
+    from main_trading_system import TradingSystem
+    start = time.perf_counter()
+    system = TradingSystem()
+    elapsed = time.perf_counter() - start
+    system.journal.close()
+    return system, elapsed
+
+
+def main():
+    configure_logging(level="WARNING")
+    os.chdir(tempfile.mkdtemp())
+    rng = random.Random(7)
+
+    journal = EventJournal(JOURNAL_DIR)
+    start = time.perf_counter()
+    write_orders(journal, 0, N_ORDERS, rng)
+    append_rate = journal.seq / (time.perf_counter() - start)
+    events = journal.seq
+    journal.close()
+
+    system, cold = restart()
+    positions = system.risk.get_positions()
+
+    journal = EventJournal(JOURNAL_DIR)
+    write_orders(journal, N_ORDERS, TAIL_ORDERS, rng)
+    journal.close()
+    system, warm = restart()
+
+    print(f"Journal append:                          {append_rate:>10,.0f} events/s")
+    print(f"Cold recovery, {events:,} events (no snapshot): {cold:>8.2f} s")
+    print(f"Warm recovery, snapshot + {TAIL_ORDERS} order tail:   {warm:>8.2f} s")
+    print(f"Symbols with positions after recovery: {len(positions)}")
+    print(f"Journal: {system.journal.stats()}")
+
+
+if __name__ == "__main__":
+    main()
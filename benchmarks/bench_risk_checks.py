@@ -0,0 +1,80 @@
+"""Benchmark: RiskEngine.check_order throughput with 10k open positions.
+
+Compares the running notional aggregate against re-summing every position
+per check (the previous behaviour), and shows order tracking stays bounded.
+
+Run from the repo root:
+    python -m benchmarks.bench_risk_checks
+"""
+
+import random
+import time
+from common.utils import configure_logging
+from market_data.schemas import Fill, Order
+from risk.limits import LimitTree
+from risk.risk_engine import RiskEngine
+
+N_SYMBOLS = 10_000
+N_CHECKS = 50_000
+
+
+def build_engine() -> RiskEngine:
+    rng = random.Random(1)
+    # Tree without limits: every check still walks firm/account/strategy/symbol
+    engine = RiskEngine(notional_limit=10**12, limits=LimitTree())
+    for i in range(N_SYMBOLS):
+        engine.apply_fill(Fill(
+            order_id=f"seed-{i}",
+            symbol=f"SYM{i:05d}",
+            side=rng.choice(["BUY", "SELL"]),
+            quantity=rng.randint(1, 500),
+            price=rng.uniform(10, 500),
+            timestamp=0.0,
+        ))
+    return engine
+
+
+def make_orders(n: int):
+    rng = random.Random(2)
+    return [Order(
+        order_id="",
+        symbol=f"SYM{rng.randrange(N_SYMBOLS):05d}",
+        side=rng.choice(["BUY", "SELL"]),
+        quantity=100,
+        price=100.0,
+        timestamp=0.0,
+    ) for _ in range(n)]
+
+
+def main():
+    configure_logging(level="WARNING")
+    engine = build_engine()
+    orders = make_orders(N_CHECKS)
+
+    start = time.perf_counter()
+    for order in orders:
+        engine.check_order(order)
+    incremental = N_CHECKS / (time.perf_counter() - start)
+
+    # Previous behaviour: O(symbols) sum on every check
+    start = time.perf_counter()
+    for order in orders[:N_CHECKS // 100]:
+        sum(abs(pos["quantity"] * pos["avg_price"]) for pos in engine.positions.values())
+        engine.check_order(order)
+    rescan = (N_CHECKS // 100) / (time.perf_counter() - start)
+
+    drift = abs(engine.gross_notional - sum(abs(p["quantity"] * p["avg_price"]) for p in engine.positions.values()))
+    print(f"{N_SYMBOLS} symbols")
+    print(f"check_order, running aggregate: {incremental:>12,.0f} checks/s")
+    print(f"check_order, full re-sum:       {rescan:>12,.0f} checks/s")
+    print(f"Tracked orders after {N_CHECKS + N_CHECKS // 100} checks: {len(engine.orders)} (cap {engine.max_tracked_orders})")
+    print(f"Aggregate drift vs re-sum: {drift:.6f}")
+    latency = engine.get_check_latency()
+    print(
+        f"check_order latency (us): p50={latency['p50']:.2f} p99={latency['p99']:.2f} "
+        f"p99.9={latency['p99.9']:.2f} max={latency['max']:.2f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Benchmark: symbol sharding across worker processes.
+
+Part 1 measures what the shared firm limit adds to RiskEngine.check_order
+(cross-process lock + shared-memory sum) in a single process.
+
+Part 2 splits N_SYMBOLS symbols over 1, 2, 4 and 8 worker processes with
+shard_symbols. Each worker builds a full TradingSystem (own database and
+journal, shared firm risk) and drives its shard's share of N_TICKS feed
+messages through decode + on_tick, starting together on a barrier. Spreads
+sit between the buy and sell thresholds so no orders are sent: fill commits
+are disk-bound and would measure the disk rather than the tick path.
+
+Scaling is bounded by the cores available (printed first).
+
+Run from the repo root:
+    python -m benchmarks.bench_sharding
+"""
+
+import asyncio
+import json
+import multiprocessing as mp
+import os
+import random
+import tempfile
+import time
+from common.utils import configure_logging
+from market_data.schemas import Order
+
+N_SYMBOLS = 64
+N_TICKS = 40_000
+WORKER_COUNTS = (1, 2, 4, 8)
+N_CHECKS = 50_000
+
+
+def make_messages(symbols, n: int):
+    rng = random.Random(5)
+    messages = []
+    for i in range(n):
+        bid = round(rng.uniform(99, 100), 2)
+        messages.append(json.dumps({
+            "symbol": rng.choice(symbols), "bid": bid, "ask": round(bid + 0.045, 2),
+            "bid_size": rng.randint(100, 1000), "ask_size": rng.randint(100, 1000),
+            "timestamp": time.time(), "seq": i + 1,
+        }))
+    return messages
+
+
+def worker(index, symbols, all_symbols, firm_risk, root, barrier, results):
+    configure_logging(level="WARNING")
+    os.chdir(os.path.join(root, f"shard-{index}"))
+    from main_trading_system import TradingSystem
+    from market_data.feed_handler import decode_tick
+
+    mine = set(symbols)
+    # Every worker sees the same global stream; a real feed only sends its shard
+    messages = [m for m in make_messages(all_symbols, N_TICKS) if json.loads(m)["symbol"] in mine]
+    system = TradingSystem(symbols=symbols, firm_risk=firm_risk)
+
+    async def drive():
+        for message in messages:
+            await system.on_tick(decode_tick(message))
+
+    barrier.wait()
+    start = time.perf_counter()
+    asyncio.run(drive())
+    results.put((index, len(messages), time.perf_counter() - start))
+    firm_risk.close()
+
+
+def scaling(n_workers: int, all_symbols) -> float:
+    from risk.shared_limits import SharedFirmRisk
+    from sharded_trading_system import shard_symbols
+
+    ctx = mp.get_context("spawn")
+    shards = [shard for shard in shard_symbols(all_symbols, n_workers) if shard]
+    firm = SharedFirmRisk(len(shards), 50_000_000.0, ctx=ctx)
+    root = tempfile.mkdtemp()
+    barrier = ctx.Barrier(len(shards) + 1)
+    results = ctx.Queue()
+    procs = []
+    for index, symbols in enumerate(shards):
+        os.makedirs(os.path.join(root, f"shard-{index}"))
+        proc = ctx.Process(target=worker, args=(
+            index, symbols, all_symbols, firm.for_worker(index), root, barrier, results,
+        ))
+        proc.start()
+        procs.append(proc)
+
+    barrier.wait()
+    start = time.perf_counter()
+    done = [results.get() for _ in procs]
+    elapsed = time.perf_counter() - start
+    for proc in procs:
+        proc.join()
+    firm.close()
+
+    ticks = sum(count for _, count, _ in done)
+    slowest = max(seconds for _, _, seconds in done)
+    print(f"  {n_workers} worker(s): {ticks} ticks in {elapsed:6.2f}s = {ticks / elapsed:9.0f} ticks/s "
+          f"(slowest shard {slowest:.2f}s, shard sizes {sorted(count for _, count, _ in done)})")
+    return ticks / elapsed
+
+
+def firm_check_overhead():
+    from risk.risk_engine import RiskEngine
+    from risk.shared_limits import SharedFirmRisk
+
+    firm = SharedFirmRisk(1, 50_000_000.0)
+    orders = [
+        Order(order_id="", symbol=f"SYM{i % 20:02d}", side="BUY" if i % 2 else "SELL",
+              quantity=100, price=100.0, timestamp=float(i), strategy="bench")
+        for i in range(N_CHECKS)
+    ]
+    for label, risk in (("local limits only", RiskEngine()),
+                        ("with shared firm risk", RiskEngine(firm_risk=firm.for_worker(0)))):
+        start = time.perf_counter()
+        for order in orders:
+            order.status = "NEW"
+            risk.check_order(order)
+            risk.release_order(order.order_id)
+        per_check = (time.perf_counter() - start) / N_CHECKS * 1e6
+        print(f"  check_order + release_order, {label:<22}: {per_check:6.2f} us")
+    firm.close()
+
+
+def main():
+    configure_logging(level="WARNING")
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+    print(f"{cores} core(s) available")
+
+    print("Shared firm limit overhead:")
+    firm_check_overhead()
+
+    print(f"Sharded tick throughput ({N_SYMBOLS} symbols, {N_TICKS} ticks):")
+    all_symbols = [f"SYM{i:03d}" for i in range(N_SYMBOLS)]
+    rates = {n: scaling(n, all_symbols) for n in WORKER_COUNTS}
+    for n, rate in rates.items():
+        print(f"  {n} worker(s): speedup {rate / rates[1]:4.2f}x, efficiency {rate / rates[1] / n:5.1%}")
+
+
+if __name__ == "__main__":
+    main()
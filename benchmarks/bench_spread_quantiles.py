@@ -0,0 +1,70 @@
+"""Benchmark: cost of spread-quantile sketch updates per tick.
+
+Run from the repo root:
+    python -m benchmarks.bench_spread_quantiles
+"""
+
+import random
+import time
+from common.config import SYMBOLS
+from market_data.schemas import Tick
+from tickerplant.orderbook import OrderBook
+from tickerplant.spread_quantiles import KLLSketch
+
+N_TICKS = 200_000
+
+
+def make_ticks(n: int, seed: int = 42):
+    """Synthetic ticks with the same spread distribution as MarketDataFeed."""
+    rng = random.Random(seed)
+    ticks = []
+    for _ in range(n):
+        bid = round(rng.uniform(100, 300), 2)
+        ask = round(bid + rng.uniform(0.01, 0.10), 2)
+        ticks.append(Tick(rng.choice(SYMBOLS), bid, ask, 100, 100, time.time()))
+    return ticks
+
+
+def bench_sketch_update(n: int) -> float:
+    sketch = KLLSketch()
+    values = [random.uniform(0.01, 0.10) for _ in range(n)]
+    start = time.perf_counter_ns()
+    for v in values:
+        sketch.update(v)
+    return (time.perf_counter_ns() - start) / n
+
+
+def bench_orderbook(ticks, track: bool) -> float:
+    book = OrderBook(track_spread_quantiles=track)
+    start = time.perf_counter_ns()
+    for tick in ticks:
+        book.update(tick)
+    return (time.perf_counter_ns() - start) / len(ticks)
+
+
+def main():
+    ticks = make_ticks(N_TICKS)
+
+    print(f"KLLSketch.update:              {bench_sketch_update(N_TICKS):8.0f} ns/update")
+    plain = bench_orderbook(ticks, track=False)
+    tracked = bench_orderbook(ticks, track=True)
+    print(f"OrderBook.update (no sketch):  {plain:8.0f} ns/tick")
+    print(f"OrderBook.update (sketch):     {tracked:8.0f} ns/tick")
+    print(f"Sketch overhead:               {tracked - plain:8.0f} ns/tick")
+
+    # Accuracy check against the exact distribution
+    book = OrderBook()
+    for tick in ticks:
+        book.update(tick)
+    symbol = SYMBOLS[0]
+    spreads = sorted(round(t.ask - t.bid, 4) for t in ticks if t.symbol == symbol)
+    for q in (0.4, 0.7):
+        exact = spreads[int(q * (len(spreads) - 1))]
+        approx = book.spread_quantiles.quantile(symbol, q)
+        print(f"{symbol} p{int(q * 100)}: sketch={approx:.4f} exact={exact:.4f}")
+    retained = len(book.spread_quantiles.sketches[symbol])
+    print(f"{symbol} retained items: {retained} of {len(spreads)} observed")
+
+
+if __name__ == "__main__":
+    main()
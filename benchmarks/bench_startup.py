@@ -0,0 +1,147 @@
+"""Benchmark: import-time profile and time-to-first-tick.
+
+Part 1 runs ``python -X importtime -c "import main_trading_system"`` and
+prints the slowest imports (cumulative), and which optional libraries the
+engine import pulls in.
+
+Part 2 starts a fresh interpreter per run against a database holding N_FILLS
+of today's fills and measures, from process launch, the time until the
+first tick has been through TradingSystem.on_tick:
+  eager          FAST_STARTUP off: dashboard imported, PnL built by full scan
+  fast (cold)    FAST_STARTUP on, no PnL snapshot yet (full scan, then written)
+  fast (warm)    FAST_STARTUP on, PnL warmed from the snapshot
+
+Run from the repo root:
+    python -m benchmarks.bench_startup
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+N_FILLS = 200_000
+RUNS = 3
+OPTIONAL = ("flask", "flask_socketio", "engineio", "websockets")
+
+
+def import_profile(top: int = 12):
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main_trading_system"],
+        cwd=tempfile.mkdtemp(), env={**os.environ, "PYTHONPATH": ROOT}, capture_output=True, text=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us), int(self_us), name.strip()))
+    total = next(c for c, _, name in rows if name == "main_trading_system")
+    print(f"import main_trading_system: {total / 1000:.1f} ms")
+    for cumulative, own, name in sorted(rows, reverse=True)[1:top + 1]:
+        print(f"  {cumulative / 1000:7.1f} ms cumulative {own / 1000:6.1f} ms self  {name}")
+
+    loaded = subprocess.run(
+        [sys.executable, "-c", f"import sys, main_trading_system; print([m for m in {OPTIONAL!r} if m in sys.modules])"],
+        cwd=tempfile.mkdtemp(), env={**os.environ, "PYTHONPATH": ROOT}, capture_output=True, text=True,
+    ).stdout.strip()
+    print(f"optional libraries loaded by the engine import: {loaded}")
+
+
+def child(fast: bool, launched: float):
+    """One startup, run in a fresh interpreter: report phase times as JSON."""
+    import asyncio
+    import common.config as config
+    config.FAST_STARTUP = fast
+    from common.utils import configure_logging
+    configure_logging(level="WARNING")
+
+    start = time.perf_counter()
+    from main_trading_system import TradingSystem
+    from market_data.schemas import Tick
+    imported = time.perf_counter()
+    system = TradingSystem()
+    built = time.perf_counter()
+    tick = Tick(symbol="AAPL", bid=99.0, ask=99.045, bid_size=100, ask_size=100, timestamp=time.time())
+    asyncio.run(system.on_tick(tick))
+    ticked = time.perf_counter()
+    first_tick = time.time()
+    # As on shutdown, so the next fast run can warm from it
+    system.pnl_calc.write_snapshot()
+    print(json.dumps({
+        "import_ms": (imported - start) * 1000,
+        "init_ms": (built - imported) * 1000,
+        "tick_ms": (ticked - built) * 1000,
+        "ttft_ms": (first_tick - launched) * 1000,
+        "positions": len(system.pnl_calc.net_quantities),
+    }))
+
+
+def seed_database(workdir: str):
+    """Schema from a first TradingSystem, then N_FILLS fills from today."""
+    code = (
+        "import sqlite3, time, random\n"
+        "import common.config as config\n"
+        "from common.utils import configure_logging\n"
+        "configure_logging(level='WARNING')\n"
+        "from main_trading_system import TradingSystem\n"
+        "TradingSystem()\n"
+        "rng = random.Random(1)\n"
+        "now = time.time()\n"
+        f"rows = [(f'F{{i}}', f'O{{i}}', f'SYM{{i % 50:02d}}', 'BUY' if rng.random() < 0.55 else 'SELL',\n"
+        f"         rng.randint(1, 10) * 100, round(rng.uniform(90, 110), 2), now - 0.001 * i) for i in range({N_FILLS})]\n"
+        "conn = sqlite3.connect(config.DB_PATH)\n"
+        "conn.executemany('INSERT INTO fills VALUES (?, ?, ?, ?, ?, ?, ?)', rows)\n"
+        "conn.commit()\n"
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=workdir, env={**os.environ, "PYTHONPATH": ROOT}, check=True)
+
+
+def startup(workdir: str, fast: bool):
+    launched = time.time()
+    proc = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_startup", "--child", "--fast", str(int(fast)),
+         "--launched", repr(launched)],
+        cwd=workdir, env={**os.environ, "PYTHONPATH": ROOT}, capture_output=True, text=True, check=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def time_to_first_tick():
+    workdir = tempfile.mkdtemp()
+    seed_database(workdir)
+    snapshot = os.path.join(workdir, "pnl_snapshot.json")
+    print(f"Time to first tick ({N_FILLS:,} fills in the database, median of {RUNS} runs):")
+    print(f"  {'mode':<13} {'ttft':>8} {'import':>8} {'init':>8} {'1st tick':>9}  (ms)")
+    for label, fast, keep_snapshot in (("eager", False, False), ("fast (cold)", True, False),
+                                       ("fast (warm)", True, True)):
+        runs = []
+        for _ in range(RUNS):
+            if not keep_snapshot and os.path.exists(snapshot):
+                os.remove(snapshot)
+            runs.append(startup(workdir, fast))
+        med = {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+        print(f"  {label:<13} {med['ttft_ms']:8.1f} {med['import_ms']:8.1f} {med['init_ms']:8.1f} "
+              f"{med['tick_ms']:9.1f}  ({int(med['positions'])} positions)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--fast", type=int, default=1, help=argparse.SUPPRESS)
+    parser.add_argument("--launched", type=float, default=0.0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(bool(args.fast), args.launched)
+        return
+    import_profile()
+    time_to_first_tick()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Benchmark: PnL/order queries before and after archiving closed sessions.
+
+Fills a live database with several days of orders and fills, times the
+dashboard queries, rolls closed days into the archive and times them again.
+
+Run from the repo root (database and archive go to a temp directory):
+    python -m benchmarks.bench_storage
+"""
+
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from common.config import ARCHIVE_DIR, DB_PATH
+from common.utils import configure_logging
+
+DAYS = 20
+FILLS_PER_DAY = 20_000
+SYMBOLS = [f"SYM{i:02d}" for i in range(20)]
+
+
+def populate(today: str):
+    from common.storage import session_start
+    rng = random.Random(5)
+    first_day = session_start(today) - (DAYS - 1) * 86400
+    orders, fills = [], []
+    for i in range(DAYS * FILLS_PER_DAY):
+        ts = first_day + (i // FILLS_PER_DAY) * 86400 + (i % FILLS_PER_DAY) * 2.0
+        symbol, side = rng.choice(SYMBOLS), rng.choice(["BUY", "SELL"])
+        quantity, price = rng.randint(1, 100), round(rng.uniform(90, 110), 2)
+        orders.append((f"o{i}", symbol, side, quantity, price, ts, "FILLED", "bench", quantity))
+        fills.append((f"f{i}", f"o{i}", symbol, side, quantity, price, ts))
+    conn = sqlite3.connect(DB_PATH)
+    conn.executemany("INSERT INTO orders VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", orders)
+    conn.executemany("INSERT INTO fills VALUES (?, ?, ?, ?, ?, ?, ?)", fills)
+    conn.commit()
+    conn.close()
+
+
+def time_queries(oms, pnl, repeat: int = 5) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        pnl.calculate_realized_pnl()
+        pnl.get_positions_summary()
+        oms.get_orders(limit=20)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def dir_size(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def main():
+    configure_logging(level="WARNING")
+    os.chdir(tempfile.mkdtemp())
+    from analytics.pnl import PnLCalculator
+    from common.storage import query_fills, rollover, session_date
+    from oms.oms import OrderManagementService
+
+    oms, pnl = OrderManagementService(), PnLCalculator()
+    today = session_date()
+    populate(today)
+    before_pnl = pnl.calculate_realized_pnl()
+    before_ms = time_queries(oms, pnl)
+    before_db = os.path.getsize(DB_PATH)
+
+    start = time.perf_counter()
+    closed = rollover(today=today, on_close=pnl.close_partition)
+    rollover_s = time.perf_counter() - start
+
+    after_ms = time_queries(oms, pnl)
+    after_pnl = pnl.calculate_realized_pnl()
+    drift = max(abs(before_pnl[s] - after_pnl.get(s, 0.0)) for s in before_pnl)
+
+    start = time.perf_counter()
+    history = query_fills(closed[0], closed[-1])
+    history_ms = (time.perf_counter() - start) * 1000
+
+    print(f"{DAYS} sessions x {FILLS_PER_DAY:,} fills")
+    print(f"PnL + positions + recent orders, all sessions live: {before_ms:>8.1f} ms")
+    print(f"PnL + positions + recent orders, today only live:   {after_ms:>8.1f} ms")
+    print(f"Rollover of {len(closed)} sessions: {rollover_s:.2f} s")
+    print(f"Live DB {before_db / 1e6:.1f} MB -> {os.path.getsize(DB_PATH) / 1e6:.1f} MB, "
+          f"archive {dir_size(ARCHIVE_DIR) / 1e6:.1f} MB")
+    print(f"Archive range query ({len(history):,} fills): {history_ms:.1f} ms")
+    print(f"Max realized PnL difference after rollover: {drift:.6f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Benchmark + check: bytes allocated per tick on the receive path (tracemalloc).
+
+Measures, per tick:
+  * memory held when N ticks are kept as Tick objects (old dataclass with
+    __dict__ vs slotted) and as one TickBatch;
+  * memory left behind by decode + OrderBook.update in steady state (the
+    book is updated in place, so this should be ~0);
+  * decode + book update latency, per tick and via TickBatch.
+
+Exits non-zero if the budgets below are exceeded, so it can be run as a check:
+    python -m benchmarks.bench_tick_alloc
+"""
+
+import json
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from common.utils import configure_logging
+from market_data.feed_handler import decode_tick
+from market_data.tick_batch import TickBatch
+from tickerplant.orderbook import OrderBook
+
+N = 100_000
+
+# Budgets (bytes per tick)
+MAX_STEADY_STATE_GROWTH = 1.0   # decode + in-place book update, nothing retained
+MAX_BATCH_BYTES = 64.0          # eight numeric columns: 4 + 7 * 8 = 60 bytes
+
+
+@dataclass
+class DictTick:
+    """The previous Tick: a plain dataclass with a per-instance __dict__."""
+    symbol: str
+    bid: float
+    ask: float
+    bid_size: int
+    ask_size: int
+    timestamp: float
+
+
+def make_messages(n: int):
+    rng = random.Random(9)
+    symbols = [f"SYM{i:02d}" for i in range(20)]
+    return [json.dumps({
+        "symbol": rng.choice(symbols),
+        "bid": round(rng.uniform(99, 100), 2),
+        "ask": round(rng.uniform(100, 101), 2),
+        "bid_size": rng.randint(100, 1000),
+        "ask_size": rng.randint(100, 1000),
+        "timestamp": 1.7e9 + i * 0.001,
+    }) for i in range(n)]
+
+
+def held_per_tick(fn) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = fn()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return (after - before) / N
+
+
+def main():
+    configure_logging(level="WARNING")
+    messages = make_messages(N)
+
+    dict_ticks = held_per_tick(lambda: [DictTick(**json.loads(m)) for m in messages])
+    slotted_ticks = held_per_tick(lambda: [decode_tick(m) for m in messages])
+
+    def fill_batch():
+        batch = TickBatch(N)
+        for m in messages:
+            batch.decode(m)
+        return batch
+    batch_bytes = held_per_tick(fill_batch)
+
+    # Steady state: warm the books up first so only per-tick churn is measured
+    book = OrderBook(track_spread_quantiles=False)
+    for m in messages[:1000]:
+        book.update(decode_tick(m))
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for m in messages:
+        book.update(decode_tick(m))
+    growth = (tracemalloc.get_traced_memory()[0] - before) / N
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for m in messages:
+        book.update(decode_tick(m))
+    per_tick_us = (time.perf_counter() - start) / N * 1e6
+
+    batch = TickBatch(256)
+    start = time.perf_counter()
+    for i in range(0, N, 256):
+        for m in messages[i:i + 256]:
+            batch.decode(m)
+        book.update_batch(batch)
+        batch.clear()
+    batched_us = (time.perf_counter() - start) / N * 1e6
+
+    print(f"Held per tick:  dataclass+__dict__ {dict_ticks:6.0f} B   slotted Tick {slotted_ticks:6.0f} B   "
+          f"TickBatch {batch_bytes:6.1f} B")
+    print(f"Steady-state growth, decode + OrderBook.update: {growth:.3f} B/tick")
+    print(f"decode + update: per tick {per_tick_us:.2f} us, TickBatch(256) {batched_us:.2f} us")
+
+    failures = []
+    if growth > MAX_STEADY_STATE_GROWTH:
+        failures.append(f"steady-state growth {growth:.2f} B/tick > {MAX_STEADY_STATE_GROWTH}")
+    if batch_bytes > MAX_BATCH_BYTES:
+        failures.append(f"TickBatch {batch_bytes:.1f} B/tick > {MAX_BATCH_BYTES}")
+    if slotted_ticks >= dict_ticks:
+        failures.append("slotted Tick is not smaller than the __dict__ dataclass")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
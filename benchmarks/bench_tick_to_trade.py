@@ -0,0 +1,65 @@
+"""Benchmark: tick-to-trade latency breakdown through TradingSystem.on_tick.
+
+Feeds N_TICKS synthetic feed messages through decode_tick and on_tick (as
+FeedHandler.listen does, receive stamp included) against a fresh database
+and journal in a temp directory, then prints the per-stage histograms from
+TradingSystem.get_latency(). Exchange latency is shrunk so the run is short.
+
+Run from the repo root:
+    python -m benchmarks.bench_tick_to_trade
+"""
+
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+from common.utils import configure_logging
+from market_data.feed_handler import decode_tick
+
+N_TICKS = 2000
+
+
+def make_messages(n: int):
+    rng = random.Random(3)
+    symbols = ["AAPL", "MSFT", "GOOGL", "TSLA", "NVDA"]
+    messages = []
+    for i in range(n):
+        bid = round(rng.uniform(99, 100), 2)
+        messages.append(json.dumps({
+            "symbol": rng.choice(symbols), "bid": bid, "ask": round(bid + rng.uniform(0.01, 0.10), 2),
+            "bid_size": rng.randint(100, 1000), "ask_size": rng.randint(100, 1000),
+            "timestamp": time.time(),
+        }))
+    return messages
+
+
+async def drive(system, messages):
+    for message in messages:
+        recv_ns = time.perf_counter_ns()
+        tick = decode_tick(message)
+        tick.recv_ns = recv_ns
+        await system.on_tick(tick)
+
+
+def main():
+    configure_logging(level="WARNING")
+    os.chdir(tempfile.mkdtemp())
+    # Imported after chdir so the database and journal land in the temp dir
+    from main_trading_system import TradingSystem
+
+    system = TradingSystem()
+    system.exchange.latency_ms = (0.1, 0.5)
+    asyncio.run(drive(system, make_messages(N_TICKS)))
+    system.oms.flush()
+
+    print(f"{N_TICKS} ticks, {system.stats['orders_sent']} orders, {system.stats['fills_received']} fills")
+    print(f"{'stage':>14} {'count':>7} {'mean':>9} {'p50':>9} {'p99':>9} {'p99.9':>9} {'max':>9}  (us)")
+    for stage, s in system.get_latency().items():
+        print(f"{stage:>14} {s['count']:7d} {s['mean']:9.1f} {s['p50']:9.1f} {s['p99']:9.1f} "
+              f"{s['p99.9']:9.1f} {s['max']:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""End-to-end load / soak harness: local MarketDataFeed -> full TradingSystem.
+
+The feed runs in a child process (so it does not share the trading loop's
+core) on its own port, publishing --symbols symbols at a rate the harness
+controls. The TradingSystem runs here, in a temp directory with its own
+database and journal, and is observed from the outside:
+
+  * tick lag     - wall-clock receive time minus the tick's feed timestamp
+  * dropped      - gaps in the feed sequence numbers seen by on_tick
+  * conflated    - ticks the feed skipped because it fell behind schedule
+                   (the consumer not draining its socket pushes back on it)
+  * CPU and RSS  - of the trading process, sampled every --sample seconds
+
+Ramp: rates in --rates are offered for --step seconds each. A step is
+saturated when the received rate drops below 95% of the offered rate, the
+feed conflates, or p99 lag exceeds --max-lag-ms; the saturation point is the
+first saturated rate. Soak: --soak seconds at --soak-rate (default: 80% of
+the highest sustained rate), reporting RSS growth as a least-squares slope.
+
+Run from the repo root, e.g.:
+    python -m benchmarks.load_test --rates 50,100,200,400 --step 20
+    python -m benchmarks.load_test --rates 100 --step 10 --soak 7200 --json soak.json
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing as mp
+import os
+import tempfile
+import time
+from typing import Dict, List, Optional
+from common.histogram import LatencyHistogram
+from common.memory import rss_bytes
+from common.utils import configure_logging
+
+DEFAULT_PORT = 8799
+SATURATION_RATIO = 0.95  # received / offered below this is saturated
+
+
+def run_feed(port: int, n_symbols: int, rate, published, conflated, ready):
+    """Child process: serve the feed, following the shared rate and exporting counters."""
+    configure_logging(level="WARNING")
+    from market_data.feed_generator import MarketDataFeed
+    feed = MarketDataFeed(symbols=[f"SYM{i:03d}" for i in range(n_symbols)], rate=rate.value, port=port)
+
+    async def control():
+        while True:
+            feed.rate = rate.value
+            published.value = feed.seq
+            conflated.value = feed.conflated
+            await asyncio.sleep(0.05)
+
+    async def main():
+        import websockets
+        async with websockets.serve(feed.handle_client, "localhost", port):
+            ready.set()
+            await asyncio.gather(feed.run_feed(), control())
+
+    asyncio.run(main())
+
+
+class TickMonitor:
+    """Wraps TradingSystem.on_tick to measure lag and sequence gaps."""
+
+    def __init__(self, downstream):
+        self.downstream = downstream
+        self.lag = LatencyHistogram()
+        self.received = 0
+        self.dropped = 0
+        self.last_seq = 0
+
+    async def on_tick(self, tick):
+        self.lag.record(time.time_ns() - int(tick.timestamp * 1e9))
+        self.received += 1
+        if tick.seq:
+            if self.last_seq and tick.seq > self.last_seq + 1:
+                self.dropped += tick.seq - self.last_seq - 1
+            self.last_seq = max(self.last_seq, tick.seq)
+        await self.downstream(tick)
+
+    def take(self) -> Dict[str, float]:
+        """Counters since the previous call; lag in milliseconds."""
+        summary = self.lag.summary(scale=1e6)
+        result = {"received": self.received, "dropped": self.dropped, "lag_ms": summary}
+        self.lag.reset()
+        self.received = 0
+        self.dropped = 0
+        return result
+
+
+class Sampler:
+    """Periodic CPU% and RSS of this process."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.samples: List[Dict[str, float]] = []
+        self.start = time.monotonic()
+
+    async def run(self):
+        wall, cpu = time.monotonic(), time.process_time()
+        while True:
+            await asyncio.sleep(self.interval)
+            now_wall, now_cpu = time.monotonic(), time.process_time()
+            self.samples.append({
+                "t": round(now_wall - self.start, 2),
+                "cpu_pct": round(100.0 * (now_cpu - cpu) / (now_wall - wall), 1),
+                "rss_mb": round(rss_bytes() / 2**20, 2),
+            })
+            wall, cpu = now_wall, now_cpu
+
+    def since(self, t: float) -> List[Dict[str, float]]:
+        return [s for s in self.samples if s["t"] >= t]
+
+
+def rss_slope_mb_per_hour(samples: List[Dict[str, float]]) -> float:
+    """Least-squares slope of RSS over time."""
+    if len(samples) < 2:
+        return 0.0
+    n = len(samples)
+    mean_t = sum(s["t"] for s in samples) / n
+    mean_r = sum(s["rss_mb"] for s in samples) / n
+    var = sum((s["t"] - mean_t) ** 2 for s in samples)
+    if not var:
+        return 0.0
+    cov = sum((s["t"] - mean_t) * (s["rss_mb"] - mean_r) for s in samples)
+    return cov / var * 3600
+
+
+class Harness:
+    def __init__(self, args):
+        self.args = args
+        ctx = mp.get_context("spawn")
+        self.rate = ctx.Value("d", 0.0)
+        self.published = ctx.Value("q", 0)
+        self.conflated = ctx.Value("q", 0)
+        self.ready = ctx.Event()
+        self.feed = ctx.Process(
+            target=run_feed,
+            args=(args.port, args.symbols, self.rate, self.published, self.conflated, self.ready),
+            daemon=True,
+        )
+        self.steps: List[Dict] = []
+        self.soak: Optional[Dict] = None
+
+    async def hold(self, rate: float, seconds: float, monitor: TickMonitor, sampler: Sampler) -> Dict:
+        """Offer ``rate`` ticks/s for ``seconds`` and summarise what the system kept up with."""
+        self.rate.value = rate
+        await asyncio.sleep(min(1.0, seconds / 10))  # let the new rate take hold
+        monitor.take()
+        published, conflated = self.published.value, self.conflated.value
+        start = time.monotonic()
+        t0 = start - sampler.start
+        await asyncio.sleep(seconds)
+        elapsed = time.monotonic() - start
+        counts = monitor.take()
+        samples = sampler.since(t0)
+        step = {
+            "offered": rate,
+            "published_per_s": round((self.published.value - published) / elapsed, 1),
+            "received_per_s": round(counts["received"] / elapsed, 1),
+            "conflated": self.conflated.value - conflated,
+            "dropped": counts["dropped"],
+            "lag_ms": {k: round(v, 3) for k, v in counts["lag_ms"].items()},
+            "cpu_pct": max((s["cpu_pct"] for s in samples), default=0.0),
+            "rss_mb": samples[-1]["rss_mb"] if samples else round(rss_bytes() / 2**20, 2),
+        }
+        step["saturated"] = (
+            step["received_per_s"] < SATURATION_RATIO * rate
+            or step["conflated"] > 0
+            or step["lag_ms"]["p99"] > self.args.max_lag_ms
+        )
+        return step
+
+    async def drain(self, monitor: TickMonitor, timeout: float = 120.0):
+        """Stop the feed and wait until the system has worked through its backlog."""
+        self.rate.value = 0.0
+        deadline = time.monotonic() + timeout
+        last = -1
+        while monitor.received != last and time.monotonic() < deadline:
+            last = monitor.received
+            await asyncio.sleep(1.0)
+
+    async def run(self):
+        from main_trading_system import TradingSystem
+        from market_data.feed_handler import FeedHandler
+
+        system = TradingSystem()
+        monitor = TickMonitor(system.on_tick)
+        # One line: the harness measures the engine, not arbitration
+        system.feed_handler = FeedHandler(monitor.on_tick, symbols=system.symbols, port=self.args.port)
+        sampler = Sampler(self.args.sample)
+        trading = asyncio.create_task(system.run())
+        sampling = asyncio.create_task(sampler.run())
+        try:
+            for rate in self.args.rates:
+                step = await self.hold(rate, self.args.step, monitor, sampler)
+                self.steps.append(step)
+                print_step(step)
+                if step["saturated"] and not self.args.keep_going:
+                    break
+
+            if self.args.soak:
+                sustained = [s["offered"] for s in self.steps if not s["saturated"]]
+                rate = self.args.soak_rate or 0.8 * (max(sustained) if sustained else self.args.rates[0])
+                print(f"Soak at {rate:.0f} ticks/s for {self.args.soak:.0f}s ...")
+                await self.drain(monitor)
+                start = time.monotonic() - sampler.start
+                step = await self.hold(rate, self.args.soak, monitor, sampler)
+                samples = sampler.since(start)
+                self.soak = {
+                    **step,
+                    "seconds": self.args.soak,
+                    "rss_start_mb": samples[0]["rss_mb"] if samples else None,
+                    "rss_end_mb": samples[-1]["rss_mb"] if samples else None,
+                    "rss_peak_mb": max((s["rss_mb"] for s in samples), default=None),
+                    "rss_slope_mb_per_hour": round(rss_slope_mb_per_hour(samples), 2),
+                    "samples": samples,
+                }
+        finally:
+            self.rate.value = 0.0
+            trading.cancel()
+            sampling.cancel()
+            await asyncio.gather(trading, sampling, return_exceptions=True)
+
+    def report(self) -> Dict:
+        saturated = [s["offered"] for s in self.steps if s["saturated"]]
+        sustained = [s["offered"] for s in self.steps if not s["saturated"]]
+        result = {
+            "symbols": self.args.symbols,
+            "max_sustained_rate": max(sustained) if sustained else None,
+            "saturation_rate": saturated[0] if saturated else None,
+            "steps": self.steps,
+            "soak": self.soak,
+        }
+        if result["saturation_rate"] is not None:
+            print(f"Saturation point: {result['saturation_rate']:.0f} ticks/s "
+                  f"(highest sustained: {result['max_sustained_rate']})")
+        else:
+            print(f"Not saturated up to {max(self.args.rates):.0f} ticks/s")
+        if self.soak:
+            print(f"Soak RSS: {self.soak['rss_start_mb']} -> {self.soak['rss_end_mb']} MB "
+                  f"(peak {self.soak['rss_peak_mb']} MB, slope {self.soak['rss_slope_mb_per_hour']:+.2f} MB/h), "
+                  f"lag p99 {self.soak['lag_ms']['p99']:.1f} ms, dropped {self.soak['dropped']}, "
+                  f"conflated {self.soak['conflated']}")
+        return result
+
+
+def print_step(step: Dict):
+    lag = step["lag_ms"]
+    print(
+        f"offered {step['offered']:8.0f}/s  published {step['published_per_s']:8.1f}/s  "
+        f"received {step['received_per_s']:8.1f}/s  conflated {step['conflated']:6d}  "
+        f"dropped {step['dropped']:4d}  lag p50 {lag['p50']:8.2f} p99 {lag['p99']:8.2f} "
+        f"max {lag['max']:8.2f} ms  cpu {step['cpu_pct']:5.1f}%  rss {step['rss_mb']:7.1f} MB"
+        f"{'  SATURATED' if step['saturated'] else ''}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rates", default="50,100,200,400,800,1600",
+                        type=lambda s: [float(r) for r in s.split(",")], help="offered ticks/s, ramped in order")
+    parser.add_argument("--step", type=float, default=20.0, help="seconds per ramp step")
+    parser.add_argument("--symbols", type=int, default=50)
+    parser.add_argument("--max-lag-ms", type=float, default=100.0, help="p99 lag that counts as saturated")
+    parser.add_argument("--keep-going", action="store_true", help="run every rate even after saturating")
+    parser.add_argument("--soak", type=float, default=0.0, help="soak duration in seconds (0 = no soak)")
+    parser.add_argument("--soak-rate", type=float, default=None)
+    parser.add_argument("--sample", type=float, default=1.0, help="CPU/RSS sampling interval in seconds")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--log-level", default="WARNING")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+    if args.json:
+        args.json = os.path.abspath(args.json)
+
+    configure_logging(level=args.log_level)
+    os.chdir(tempfile.mkdtemp())
+
+    harness = Harness(args)
+    harness.feed.start()
+    if not harness.ready.wait(30):
+        raise SystemExit("feed process did not start")
+    try:
+        asyncio.run(harness.run())
+    finally:
+        harness.feed.terminate()
+        harness.feed.join()
+    result = harness.report()
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+"""Component micro-benchmark suite with JSON regression baselines.
+
+Runs offline (no feed, no dashboard) against a fresh database per case in a
+temp directory and reports the best-of-N time per operation for:
+
+  orderbook.update                      OrderBook.update per tick
+  strategy.generate_signal              StrategyEngine.generate_signal per book
+  risk.check_order                      RiskEngine.check_order (+ release_order)
+  risk.apply_fill                       RiskEngine.apply_fill
+  oms.submit_order                      OMS submit with write-behind flushes
+  oms.record_fill                       OMS fill insert + commit
+  pnl.realized.<n> / pnl.positions.<n>  PnLCalculator over n fills (10k/100k/1M)
+  exchange.process_order                one order per call, in virtual time
+  exchange.process_orders               bulk calls of BULK orders, virtual time
+
+Exchange cases run on an event loop whose clock jumps over sleeps, so the
+simulated network latency costs nothing and only the CPU work is measured.
+
+Usage (from the repo root):
+    python -m benchmarks.suite                  # run and compare to the baseline
+    python -m benchmarks.suite --save           # run and store a new baseline
+    python -m benchmarks.suite --quick -k risk  # small sizes, matching cases only
+
+Exits 1 when a case is slower than its baseline by more than --threshold.
+The stored baseline is from a full-size run; --quick comparisons are indicative.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, Tuple
+from common.utils import configure_logging
+from market_data.schemas import Fill, Order, Tick
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+DEFAULT_THRESHOLD = 0.20  # fractional slowdown reported as a regression
+REPEAT = 5
+BULK = 20
+PNL_SIZES = (10_000, 100_000, 1_000_000)
+SYMBOLS = [f"SYM{i:02d}" for i in range(20)]
+
+# name -> factory(quick) returning (run, ops); run() is timed and may be called repeatedly
+CASES: Dict[str, Callable[[bool], Tuple[Callable[[], None], int]]] = {}
+
+
+def case(name: str):
+    def register(factory):
+        CASES[name] = factory
+        return factory
+    return register
+
+
+def make_ticks(n: int):
+    rng = random.Random(1)
+    ticks = []
+    for i in range(n):
+        bid = round(rng.uniform(99, 100), 2)
+        ticks.append(Tick(rng.choice(SYMBOLS), bid, round(bid + rng.uniform(0.01, 0.10), 2),
+                          rng.randint(100, 1000), rng.randint(100, 1000), float(i)))
+    return ticks
+
+
+def make_orders(n: int, prefix: str = "ord"):
+    rng = random.Random(2)
+    return [
+        Order(order_id=f"{prefix}-{i}", symbol=rng.choice(SYMBOLS), side="BUY" if i % 2 else "SELL",
+              quantity=100, price=100.0, timestamp=float(i), strategy="bench")
+        for i in range(n)
+    ]
+
+
+def fill_for(order: Order, fill_id: str) -> Fill:
+    return Fill(order_id=order.order_id, symbol=order.symbol, side=order.side, quantity=order.quantity,
+                price=order.price, timestamp=order.timestamp, fill_id=fill_id, strategy=order.strategy)
+
+
+class VirtualTimeLoop(asyncio.SelectorEventLoop):
+    """Event loop whose clock advances instantly to the next timer instead of waiting."""
+
+    def __init__(self):
+        super().__init__()
+        self.virtual_time = 0.0
+        select = self._selector.select
+
+        def skip_ahead(timeout=None):
+            if timeout:
+                self.virtual_time += timeout
+            return select(0)
+        self._selector.select = skip_ahead
+
+    def time(self) -> float:
+        return self.virtual_time
+
+
+@case("orderbook.update")
+def orderbook_update(quick: bool):
+    from tickerplant.orderbook import OrderBook
+    book = OrderBook()
+    ticks = make_ticks(20_000 if quick else 200_000)
+
+    def run():
+        update = book.update
+        for tick in ticks:
+            update(tick)
+    return run, len(ticks)
+
+
+@case("strategy.generate_signal")
+def strategy_generate_signal(quick: bool):
+    from strategy.strategy_engine import StrategyEngine
+    from tickerplant.orderbook import OrderBook
+    strategy = StrategyEngine()
+    orderbook = OrderBook(track_spread_quantiles=False)
+    books = [dict(orderbook.update(tick)) for tick in make_ticks(20_000 if quick else 200_000)]
+    positions = {symbol: 0 for symbol in SYMBOLS}
+
+    def run():
+        generate = strategy.generate_signal
+        for book in books:
+            generate(book, positions)
+    return run, len(books)
+
+
+@case("risk.check_order")
+def risk_check_order(quick: bool):
+    from risk.risk_engine import RiskEngine
+    orders = make_orders(10_000 if quick else 100_000)
+
+    def run():
+        risk = RiskEngine()
+        for order in orders:
+            order.status = "NEW"
+            risk.check_order(order)
+            risk.release_order(order.order_id)
+    return run, len(orders)
+
+
+@case("risk.apply_fill")
+def risk_apply_fill(quick: bool):
+    from risk.risk_engine import RiskEngine
+    fills = [fill_for(order, f"fill-{i}") for i, order in enumerate(make_orders(10_000 if quick else 100_000))]
+
+    def run():
+        risk = RiskEngine()
+        apply = risk._apply_fill  # apply_fill minus its per-fill log line
+        for fill in fills:
+            apply(fill)
+    return run, len(fills)
+
+
+@case("oms.submit_order")
+def oms_submit_order(quick: bool):
+    from oms.oms import OrderManagementService
+    oms = OrderManagementService()
+    n = 500 if quick else 2_000
+    batches = iter(range(1_000_000))
+
+    def run():
+        # Fresh IDs each repeat; every OMS_FLUSH_BATCH submits cost one commit
+        for order in make_orders(n, prefix=f"sub{next(batches)}"):
+            order.status = "APPROVED"
+            oms.submit_order(order)
+        oms.flush()
+    return run, n
+
+
+@case("oms.record_fill")
+def oms_record_fill(quick: bool):
+    from oms.oms import OrderManagementService
+    oms = OrderManagementService()
+    n = 20 if quick else 50
+    batches = iter(range(1_000_000))
+
+    def run():
+        for i, order in enumerate(make_orders(n, prefix=f"fill{next(batches)}")):
+            order.status = "APPROVED"
+            oms.submit_order(order)
+            oms.record_fill(fill_for(order, f"{order.order_id}-f"))
+    return run, n
+
+
+def seed_fills(n: int):
+    """Insert n fills across SYMBOLS into the current directory's database."""
+    import sqlite3
+    from common.config import DB_PATH
+    from common.storage import FILL_COLUMNS
+    from oms.oms import OrderManagementService
+    OrderManagementService()  # creates the schema
+    rng = random.Random(3)
+    rows = (
+        (f"f{i}", f"o{i}", rng.choice(SYMBOLS), rng.choice(("BUY", "SELL")),
+         rng.randint(1, 10) * 10, round(rng.uniform(95, 105), 2), float(i))
+        for i in range(n)
+    )
+    conn = sqlite3.connect(DB_PATH)
+    conn.executemany(
+        f"INSERT INTO fills ({', '.join(FILL_COLUMNS)}) VALUES ({', '.join('?' * len(FILL_COLUMNS))})", rows
+    )
+    conn.commit()
+    conn.close()
+
+
+def pnl_case(n: int, method: str):
+    def factory(quick: bool):
+        from analytics.pnl import PnLCalculator
+        seed_fills(n)
+        calc = PnLCalculator()
+        return getattr(calc, method), n
+    return factory
+
+
+for _n in PNL_SIZES:
+    CASES[f"pnl.realized.{_n}"] = pnl_case(_n, "calculate_realized_pnl")
+    CASES[f"pnl.positions.{_n}"] = pnl_case(_n, "get_positions_summary")
+
+
+def exchange_case(bulk: bool):
+    def factory(quick: bool):
+        from exchange_sim.exchange import ExchangeSimulator
+        exchange = ExchangeSimulator()
+        orders = make_orders(2_000 if quick else 20_000)
+        bursts = [orders[i:i + BULK] for i in range(0, len(orders), BULK)]
+
+        async def drive():
+            if bulk:
+                for burst in bursts:
+                    await exchange.process_orders(burst)
+            else:
+                await asyncio.gather(*(exchange.process_order(order) for order in orders))
+
+        def run():
+            loop = VirtualTimeLoop()
+            try:
+                loop.run_until_complete(drive())
+            finally:
+                loop.close()
+        return run, len(orders)
+    return factory
+
+
+CASES["exchange.process_order"] = exchange_case(bulk=False)
+CASES["exchange.process_orders"] = exchange_case(bulk=True)
+
+
+def run_case(name: str, quick: bool, repeat: int) -> Dict[str, float]:
+    run, ops = CASES[name](quick)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        run()
+        times.append((time.perf_counter_ns() - start) / ops)
+    times.sort()
+    return {"ns_per_op": round(times[0], 1), "median_ns_per_op": round(times[len(times) // 2], 1), "ops": ops}
+
+
+def compare(results, baseline, threshold: float):
+    """Print each case against its baseline; returns the names that regressed."""
+    regressions = []
+    print(f"{'case':<26} {'ns/op':>12} {'baseline':>12} {'change':>8}")
+    for name, result in results.items():
+        base = baseline.get(name)
+        line = f"{name:<26} {result['ns_per_op']:12.1f}"
+        if base is None:
+            print(f"{line} {'-':>12} {'new':>8}")
+            continue
+        change = result["ns_per_op"] / base["ns_per_op"] - 1
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        elif change < -threshold:
+            flag = "  faster"
+        print(f"{line} {base['ns_per_op']:12.1f} {change:+7.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", dest="pattern", default="", help="only run cases containing this string")
+    parser.add_argument("--quick", action="store_true", help="smaller inputs, skips the 1M-fill PnL cases")
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--save", action="store_true", help="write results as the new baseline")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+
+    configure_logging(level="WARNING")
+    names = [name for name in CASES if args.pattern in name]
+    if args.quick:
+        names = [name for name in names if not name.endswith(f".{PNL_SIZES[-1]}")]
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)["cases"]
+
+    root = tempfile.mkdtemp()
+    results = {}
+    for name in names:
+        # Each case gets its own working directory, hence its own database
+        workdir = os.path.join(root, name)
+        os.makedirs(workdir)
+        os.chdir(workdir)
+        results[name] = run_case(name, args.quick, args.repeat)
+        print(f"  ran {name}", file=sys.stderr)
+
+    regressions = compare(results, baseline, args.threshold)
+
+    if args.save:
+        saved = dict(baseline)
+        saved.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "cases": saved,
+            }, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.baseline}")
+    elif regressions:
+        print(f"{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
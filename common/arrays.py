@@ -0,0 +1,45 @@
+"""NumPy helpers for per-symbol (grouped) operations on columnar data."""
+
+from typing import Tuple
+import numpy as np
+
+
+def group_order(group_id: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Stable sort by group and a mask marking the first row of each group."""
+    order = np.argsort(group_id, kind="stable")
+    sorted_ids = group_id[order]
+    starts = np.empty(len(order), dtype=bool)
+    starts[:1] = True
+    starts[1:] = sorted_ids[1:] != sorted_ids[:-1]
+    return order, starts
+
+
+def group_cumsum(values: np.ndarray, order: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Cumulative sum of ``values`` restarted for every group, in original order."""
+    sorted_vals = values[order]
+    cs = np.cumsum(sorted_vals)
+    if not len(cs):
+        return cs
+    first = np.flatnonzero(starts)
+    lengths = np.diff(np.append(first, len(sorted_vals)))
+    cs -= np.repeat(cs[first] - sorted_vals[first], lengths)
+    out = np.empty_like(cs)
+    out[order] = cs
+    return out
+
+
+def group_diff(values: np.ndarray, order: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Change in ``values`` since the previous row of the same group."""
+    sorted_vals = values[order]
+    prev = np.empty_like(sorted_vals)
+    prev[1:] = sorted_vals[:-1]
+    prev[starts] = 0
+    out = np.empty_like(sorted_vals)
+    out[order] = sorted_vals - prev
+    return out
+
+
+def group_last(order: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Index of the last row of each group."""
+    first = np.flatnonzero(starts)
+    return order[np.append(first[1:], len(order)) - 1]
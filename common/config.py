@@ -10,11 +10,33 @@ TICK_INTERVAL = 0.1  # seconds
 MAX_POSITION = 500       
 MAX_NOTIONAL = 1000000
 
+# Hierarchical limits (risk.limits.LimitTree); None disables a level
+DEFAULT_ACCOUNT = "MAIN"
+FIRM_NOTIONAL_LIMIT = 50000000
+ACCOUNT_NOTIONAL_LIMIT = 50000000
+STRATEGY_NOTIONAL_LIMIT = MAX_NOTIONAL
+SYMBOL_NOTIONAL_LIMIT = None
+SYMBOL_POSITION_LIMIT = MAX_POSITION
+
+# Portfolio VaR / stress (risk.analytics.RiskAnalytics)
+VAR_CONFIDENCE = 0.99
+VAR_WINDOW = 1000             # rolling return samples kept
+VAR_SAMPLE_INTERVAL = 1.0     # seconds between mid-return samples
+VAR_RECOMPUTE_INTERVAL = 5.0  # seconds between VaR/stress recomputes
+
 # 🎯 CALIBRATED Strategy parameters for your feed (spreads: 0.01-0.10)
 SPREAD_THRESHOLD = 0.03      # BUY when spread < 4 cents (bottom 40% of spreads)
 SPREAD_SELL_THRESHOLD = 0.06 # SELL when spread > 7 cents (top 30% of spreads)
 
 
+# Adaptive thresholds: replace the fixed values above with live per-symbol
+# spread percentiles measured by tickerplant.spread_quantiles
+ADAPTIVE_SPREAD_THRESHOLDS = False
+SPREAD_BUY_QUANTILE = 0.40       # BUY when spread is in the bottom 40%
+SPREAD_SELL_QUANTILE = 0.70      # SELL when spread is in the top 30%
+SPREAD_SKETCH_K = 200            # KLL accuracy/memory parameter
+SPREAD_SKETCH_MIN_SAMPLES = 100  # fall back to fixed thresholds until warmed up
+
 # Spread 0.01-0.04: BUY zone (market very tight - good entry)
 # Spread 0.04-0.07: HOLD zone (neutral market)  
 # Spread 0.07-0.10: SELL zone (market widening - take profits)
@@ -24,5 +46,69 @@ SPREAD_SELL_THRESHOLD = 0.06 # SELL when spread > 7 cents (top 30% of spreads)
 # SPREAD_SELL_THRESHOLD = 0.06 # SELL when spread > 6 cents (quicker exit)
 
 
+# Logging
+LOG_LEVEL = "INFO"
+ASYNC_LOGGING = False     # queue handler + background writer thread
+LOG_QUEUE_SIZE = 100000   # async records beyond this are dropped (and counted)
+LOG_RATE_LIMIT = 0        # max INFO/DEBUG records per second per call site (0 = off)
+
+# OMS in-memory order store
+OMS_MAX_TERMINAL_ORDERS = 10000  # terminal orders kept in memory before eviction
+OMS_TERMINAL_ORDER_TTL = 300.0   # seconds a terminal order stays in memory
+OMS_FLUSH_BATCH = 50             # pending order writes before a batched DB flush
+
+# Event journal / crash recovery
+JOURNAL_ENABLED = True
+JOURNAL_DIR = "trading_journal"
+JOURNAL_FSYNC = False                       # fsync every record (survives power loss, much slower)
+JOURNAL_SEGMENT_BYTES = 64 * 1024 * 1024    # start a new segment file past this size
+JOURNAL_SNAPSHOT_INTERVAL = 60.0            # seconds between state snapshots
+JOURNAL_SNAPSHOTS_KEPT = 2                  # older snapshots and their segments are deleted
+
 # Database
-DB_PATH = "trading_data.db"
\ No newline at end of file
+DB_PATH = "trading_data.db"
+ARCHIVE_DIR = "trading_archive"      # closed sessions as compressed columnar files
+SESSION_CHECK_INTERVAL = 60.0        # seconds between session rollover checks
+
+# Multi-process symbol sharding (sharded_trading_system.py)
+SHARD_WORKERS = 4                    # worker processes; symbols are hashed across them
+SHARD_DIR = "shards"                 # each worker keeps its DB/journal/archive in shards/shard-<i>
+SHARD_MONITOR_INTERVAL = 10.0        # seconds between coordinator firm-risk reports
+SHARD_STOP_TIMEOUT = 15.0            # seconds workers get to flush and snapshot before terminate()
+
+# Prometheus metrics endpoint (common.metrics)
+METRICS_ENABLED = True
+METRICS_HOST = "127.0.0.1"
+METRICS_PORT = 9108                  # sharded mode: coordinator here, shard i on METRICS_PORT + 1 + i
+
+# Event loop health (common.loop_monitor)
+LOOP_MONITOR_ENABLED = True
+LOOP_MONITOR_INTERVAL = 0.01         # lag sampling period, seconds
+LOOP_STALL_THRESHOLD = 0.025         # loop blocked longer than this is reported with its stack
+LOOP_STALL_STACK_DEPTH = 12          # innermost frames kept per stall
+
+# On-demand sampling profiler (common.profiler)
+PROFILE_SIGNAL = "SIGUSR1"            # kill -USR1 <pid> profiles for PROFILE_SECONDS
+PROFILE_SECONDS = 10.0
+PROFILE_RATE_HZ = 100
+PROFILE_DIR = "profiles"             # collapsed-stack output (flamegraph.pl / speedscope)
+
+# Memory accounting (common.memory)
+MEMORY_MONITOR_ENABLED = True
+MEMORY_CHECK_INTERVAL = 60.0         # seconds between structure/RSS samples
+MEMORY_GROWTH_WINDOW = 3600.0        # samples kept for the growth trend, seconds
+MEMORY_GROWTH_MIN_SPAN = 600.0       # no growth alerts before this much history
+MEMORY_STRUCTURE_ALERT_MB_PER_HOUR = 10.0
+MEMORY_RSS_ALERT_MB_PER_HOUR = 100.0
+MEMORY_SIZE_SAMPLE = 32              # items sampled per container level when sizing
+MEMORY_TRACEMALLOC_FRAMES = 10
+
+# Startup (main.py / TradingSystem)
+FAST_STARTUP = True                  # defer dashboard/websocket imports, warm PnL from PNL_SNAPSHOT_PATH
+PNL_SNAPSHOT_PATH = "pnl_snapshot.json"
+
+# Redundant feed lines (market_data.feed_handler / market_data.arbitration)
+FEED_LINE_PORTS = (MARKET_DATA_WS_PORT, MARKET_DATA_WS_PORT + 1)  # A, B, ...; one port disables arbitration
+FEED_ARBITRATION_WINDOW = 4096       # recent wins kept to match slower copies (advantage stats)
+FEED_RECONNECT_INTERVAL = 1.0        # seconds between reconnect attempts on a dropped line
+FEED_LINE_IMPAIRMENTS = {}           # test feed only: port -> (delay seconds, jitter seconds, drop probability)
\ No newline at end of file
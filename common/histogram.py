@@ -0,0 +1,124 @@
+"""HDR-style latency histogram with log-linear buckets."""
+
+from typing import Dict, List, Optional
+
+
+class LatencyHistogram:
+    """Fixed-precision histogram of non-negative integer values (nanoseconds).
+
+    Values below 2**sub_bucket_bits are counted exactly; above that each
+    power of two is split into 2**(sub_bucket_bits - 1) linear sub-buckets,
+    so the relative error stays under 1 / 2**(sub_bucket_bits - 1) over the
+    whole range while ``record`` remains O(1).
+    """
+
+    __slots__ = ("sub_bucket_bits", "_sub_count", "_half", "counts", "count", "total", "min", "max")
+
+    def __init__(self, sub_bucket_bits: int = 7):
+        self.sub_bucket_bits = sub_bucket_bits
+        self._sub_count = 1 << sub_bucket_bits
+        self._half = self._sub_count >> 1
+        self.counts: List[int] = [0] * self._sub_count
+        self.count = 0
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max = 0
+
+    def _index(self, value: int) -> int:
+        if value < self._sub_count:
+            return value
+        shift = value.bit_length() - self.sub_bucket_bits
+        return self._sub_count + (shift - 1) * self._half + ((value >> shift) - self._half)
+
+    def _lowest_value(self, index: int) -> int:
+        if index < self._sub_count:
+            return index
+        shift, offset = divmod(index - self._sub_count, self._half)
+        return (self._half + offset) << (shift + 1)
+
+    def _highest_value(self, index: int) -> int:
+        if index < self._sub_count:
+            return index
+        shift = (index - self._sub_count) // self._half + 1
+        return self._lowest_value(index) + (1 << shift) - 1
+
+    def record(self, value: int):
+        """Record one value (e.g. a perf_counter_ns delta)."""
+        value = int(value) if value > 0 else 0
+        idx = self._index(value)
+        counts = self.counts
+        if idx >= len(counts):
+            counts.extend([0] * (idx + 1 - len(counts)))
+        counts[idx] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, q: float) -> int:
+        """Value at percentile ``q`` (0-100), reported as its bucket's upper bound."""
+        if not self.count:
+            return 0
+        target = max(1, int(round(q / 100.0 * self.count + 0.5 - 1e-9)))
+        cumulative = 0
+        for idx, c in enumerate(self.counts):
+            cumulative += c
+            if cumulative >= target:
+                return min(self._highest_value(idx), self.max)
+        return self.max
+
+    def cumulative_counts(self, bounds: List[int]) -> List[int]:
+        """Counts at or below each of the ascending ``bounds`` (fixed-bucket export).
+
+        Each bucket is attributed by its upper bound, so a value may be counted
+        in the next bound up by at most the histogram's relative error.
+        """
+        counts = [0] * len(bounds)
+        b = 0
+        for idx, c in enumerate(self.counts):
+            if not c:
+                continue
+            highest = min(self._highest_value(idx), self.max)
+            while b < len(bounds) and bounds[b] < highest:
+                b += 1
+            if b == len(bounds):
+                break
+            counts[b] += c
+        for i in range(1, len(counts)):
+            counts[i] += counts[i - 1]
+        return counts
+
+    def merge(self, other: "LatencyHistogram"):
+        """Add another histogram's counts into this one."""
+        if other.sub_bucket_bits != self.sub_bucket_bits:
+            raise ValueError("Cannot merge histograms with different precision")
+        if len(other.counts) > len(self.counts):
+            self.counts.extend([0] * (len(other.counts) - len(self.counts)))
+        for idx, c in enumerate(other.counts):
+            self.counts[idx] += c
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        self.max = max(self.max, other.max)
+
+    def reset(self):
+        self.counts = [0] * self._sub_count
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    def summary(self, scale: float = 1000.0) -> Dict[str, float]:
+        """count/mean/p50/p90/p99/p99.9/max, divided by ``scale`` (default: ns -> us)."""
+        return {
+            "count": self.count,
+            "mean": (self.total / self.count / scale) if self.count else 0.0,
+            "p50": self.percentile(50) / scale,
+            "p90": self.percentile(90) / scale,
+            "p99": self.percentile(99) / scale,
+            "p99.9": self.percentile(99.9) / scale,
+            "max": self.max / scale,
+        }
@@ -0,0 +1,249 @@
+"""Append-only event journal - length-prefixed records plus checksummed snapshots."""
+
+import json
+import os
+import struct
+import zlib
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from common.utils import setup_logger
+
+logger = setup_logger(__name__)
+
+# Event types
+ORDER_EVENT = 1    # order accepted into the OMS (full order dict)
+STATUS_EVENT = 2   # {"order_id", "status", "reason"}
+FILL_EVENT = 3     # fill dict as returned by the exchange
+
+# Record: payload length, crc32 of (seq, type, payload), sequence number, event type
+RECORD_HEADER = struct.Struct("<IIQB")
+# Snapshot: magic, format version, last journal seq included, crc32 of payload, payload length
+SNAPSHOT_HEADER = struct.Struct("<4sHQII")
+SNAPSHOT_MAGIC = b"TSNP"
+SNAPSHOT_VERSION = 1
+
+SEGMENT_PREFIX = "journal-"
+SEGMENT_SUFFIX = ".log"
+SNAPSHOT_PREFIX = "snapshot-"
+SNAPSHOT_SUFFIX = ".snap"
+
+
+def _encode(payload: Dict[str, Any]) -> bytes:
+    return json.dumps(payload, separators=(",", ":"), default=str).encode()
+
+
+def _checksum(seq: int, event_type: int, data: bytes) -> int:
+    return zlib.crc32(data, zlib.crc32(struct.pack("<QB", seq, event_type)))
+
+
+def read_segment(path: str) -> Tuple[List[Tuple[int, int, bytes]], int]:
+    """Decode every intact record in a segment file.
+
+    Returns ([(seq, event_type, payload_bytes)], valid_length). Reading stops
+    at the first truncated or corrupt record, which is what a crash in the
+    middle of a write leaves behind.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    records = []
+    offset = 0
+    header_size = RECORD_HEADER.size
+    while offset + header_size <= len(data):
+        length, crc, seq, event_type = RECORD_HEADER.unpack_from(data, offset)
+        end = offset + header_size + length
+        if end > len(data):
+            break
+        payload = data[offset + header_size:end]
+        if _checksum(seq, event_type, payload) != crc:
+            break
+        records.append((seq, event_type, payload))
+        offset = end
+    return records, offset
+
+
+class EventJournal:
+    """Sequenced event log split into segment files, with periodic snapshots.
+
+    ``append`` writes one record and flushes it to the OS (so it survives a
+    process crash; pass ``fsync=True`` to survive power loss as well).
+    ``write_snapshot`` stores a full state image tagged with the last
+    sequence number it covers, starts a new segment and drops segments and
+    snapshots that are no longer needed. Recovery is ``load_snapshot`` plus
+    ``replay`` of everything after the snapshot's sequence number.
+    """
+
+    def __init__(self, directory: str, fsync: bool = False,
+                 segment_bytes: int = 64 * 1024 * 1024, snapshots_kept: int = 2):
+        self.directory = directory
+        self.fsync = fsync
+        self.segment_bytes = segment_bytes
+        self.snapshots_kept = max(1, snapshots_kept)
+        os.makedirs(directory, exist_ok=True)
+
+        self.seq = 0
+        self._file = None
+        self._segment_size = 0
+        self.appended = 0
+        self._open_tail()
+
+    # ------------------------------------------------------------------ files
+
+    def _list(self, prefix: str, suffix: str) -> List[Tuple[int, str]]:
+        """(sequence number from the file name, path) sorted by sequence."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.startswith(prefix) and name.endswith(suffix):
+                try:
+                    seq = int(name[len(prefix):-len(suffix)])
+                except ValueError:
+                    continue
+                entries.append((seq, os.path.join(self.directory, name)))
+        entries.sort()
+        return entries
+
+    def segments(self) -> List[Tuple[int, str]]:
+        """(first seq, path) for every journal segment, oldest first."""
+        return self._list(SEGMENT_PREFIX, SEGMENT_SUFFIX)
+
+    def snapshots(self) -> List[Tuple[int, str]]:
+        """(last covered seq, path) for every snapshot, oldest first."""
+        return self._list(SNAPSHOT_PREFIX, SNAPSHOT_SUFFIX)
+
+    def _open_tail(self):
+        """Find the last sequence number and reopen the newest segment for appends."""
+        segments = self.segments()
+        snapshots = self.snapshots()
+        self.seq = snapshots[-1][0] if snapshots else 0
+        if not segments:
+            self._roll()
+            return
+
+        first_seq, path = segments[-1]
+        records, valid_length = read_segment(path)
+        if valid_length != os.path.getsize(path):
+            logger.warning(
+                "Journal segment %s has a torn tail; truncating %d bytes",
+                path, os.path.getsize(path) - valid_length,
+            )
+            with open(path, "r+b") as f:
+                f.truncate(valid_length)
+        if records:
+            self.seq = max(self.seq, records[-1][0])
+        else:
+            self.seq = max(self.seq, first_seq - 1)
+        self._file = open(path, "ab")
+        self._segment_size = valid_length
+
+    def _roll(self):
+        """Close the current segment and start a new one at the next seq."""
+        if self._file is not None:
+            self._sync()
+            self._file.close()
+        path = os.path.join(self.directory, f"{SEGMENT_PREFIX}{self.seq + 1:020d}{SEGMENT_SUFFIX}")
+        self._file = open(path, "ab")
+        self._segment_size = 0
+
+    def _sync(self):
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    # ---------------------------------------------------------------- records
+
+    def append(self, event_type: int, payload: Dict[str, Any]) -> int:
+        """Write one event and return its sequence number."""
+        if self._segment_size >= self.segment_bytes:
+            self._roll()
+        self.seq += 1
+        data = _encode(payload)
+        record = RECORD_HEADER.pack(len(data), _checksum(self.seq, event_type, data), self.seq, event_type) + data
+        self._file.write(record)
+        self._sync()
+        self._segment_size += len(record)
+        self.appended += 1
+        return self.seq
+
+    def replay(self, after_seq: int = 0) -> Iterator[Tuple[int, int, Dict[str, Any]]]:
+        """Yield (seq, event_type, payload) for every event after ``after_seq``."""
+        self._file.flush()
+        segments = self.segments()
+        for i, (first_seq, path) in enumerate(segments):
+            # Skip segments that end at or before after_seq
+            if i + 1 < len(segments) and segments[i + 1][0] - 1 <= after_seq:
+                continue
+            records, _ = read_segment(path)
+            for seq, event_type, data in records:
+                if seq > after_seq:
+                    yield seq, event_type, json.loads(data)
+
+    # -------------------------------------------------------------- snapshots
+
+    def write_snapshot(self, state: Dict[str, Any]) -> str:
+        """Persist a state image covering every event up to the current seq."""
+        self._sync()
+        data = _encode(state)
+        header = SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, self.seq, zlib.crc32(data), len(data))
+        path = os.path.join(self.directory, f"{SNAPSHOT_PREFIX}{self.seq:020d}{SNAPSHOT_SUFFIX}")
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(header)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+        if self._segment_size:
+            self._roll()
+        self._prune()
+        logger.info("Journal snapshot written at seq %d (%d bytes)", self.seq, len(data))
+        return path
+
+    def _prune(self):
+        snapshots = self.snapshots()
+        for _, path in snapshots[:-self.snapshots_kept]:
+            os.remove(path)
+        kept = snapshots[-self.snapshots_kept:]
+        if not kept:
+            return
+        # Segments are only needed after the oldest snapshot we still keep
+        oldest = kept[0][0]
+        segments = self.segments()
+        for i in range(len(segments) - 1):
+            if segments[i + 1][0] - 1 <= oldest:
+                os.remove(segments[i][1])
+
+    @staticmethod
+    def read_snapshot(path: str) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """(seq, state) from a snapshot file, or None if it is damaged."""
+        try:
+            with open(path, "rb") as f:
+                raw = f.read()
+            magic, version, seq, crc, length = SNAPSHOT_HEADER.unpack_from(raw)
+        except (OSError, struct.error):
+            return None
+        data = raw[SNAPSHOT_HEADER.size:SNAPSHOT_HEADER.size + length]
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION or len(data) != length or zlib.crc32(data) != crc:
+            return None
+        return seq, json.loads(data)
+
+    def load_snapshot(self) -> Tuple[int, Optional[Dict[str, Any]]]:
+        """Newest intact snapshot as (seq, state); (0, None) when there is none."""
+        for seq, path in reversed(self.snapshots()):
+            snapshot = self.read_snapshot(path)
+            if snapshot is not None:
+                return snapshot
+            logger.warning("Skipping damaged journal snapshot %s", path)
+        return 0, None
+
+    def close(self):
+        if self._file is not None:
+            self._sync()
+            self._file.close()
+            self._file = None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "seq": self.seq,
+            "appended": self.appended,
+            "segments": len(self.segments()),
+            "snapshots": len(self.snapshots()),
+        }
@@ -0,0 +1,49 @@
+"""Latency tracing - per-stage and end-to-end histograms for the tick-to-trade path."""
+
+import time
+from typing import Dict, Iterable, Optional
+from common.histogram import LatencyHistogram
+
+# Stages in pipeline order. Timestamps are time.perf_counter_ns() (monotonic).
+#   feed          socket receive -> decoded tick handed to on_tick
+#   book          OrderBook.update
+#   positions     current-position lookup for the strategies
+#   strategy      StrategyRegistry.on_book (every strategy for the symbol)
+#   risk          check_order, per order
+#   oms           submit_order, per order
+#   exchange      exchange round trip, per call (one per bulk batch)
+#   execution     applying one execution report to risk and OMS
+#   tick_to_trade tick received -> order handed to the exchange
+#   tick_to_fill  tick received -> execution report applied
+STAGES = (
+    "feed", "book", "positions", "strategy", "risk", "oms",
+    "exchange", "execution", "tick_to_trade", "tick_to_fill",
+)
+
+now_ns = time.perf_counter_ns
+
+
+class LatencyTracer:
+    """One LatencyHistogram per stage, recorded from monotonic-ns stamps."""
+
+    def __init__(self, stages: Iterable[str] = STAGES):
+        self.histograms: Dict[str, LatencyHistogram] = {stage: LatencyHistogram() for stage in stages}
+
+    def lap(self, stage: str, start_ns: int) -> int:
+        """Record now - start_ns under ``stage``; returns now so stages can be chained."""
+        now = now_ns()
+        self.histograms[stage].record(now - start_ns)
+        return now
+
+    def record(self, stage: str, elapsed_ns: int):
+        self.histograms[stage].record(elapsed_ns)
+
+    def summary(self, stage: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+        """Percentiles in microseconds for every stage that has samples (or just ``stage``)."""
+        if stage is not None:
+            return {stage: self.histograms[stage].summary()}
+        return {name: hist.summary() for name, hist in self.histograms.items() if hist.count}
+
+    def reset(self):
+        for hist in self.histograms.values():
+            hist.reset()
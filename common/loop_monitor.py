@@ -0,0 +1,204 @@
+"""Event loop health - lag histogram, stall detection with stacks, task and queue depths.
+
+LoopMonitor.run() is a background task that sleeps ``interval`` and records
+how late it wakes up (loop lag). A watchdog thread watches the heartbeat that
+task leaves; when the loop has not come back for ``threshold`` it captures the
+loop thread's Python stack and the running task, so synchronous work that
+blocks the loop (SQLite commits, logging I/O, long callbacks) is reported
+where it happens. Stalls are aggregated by stack, so a blocking call site
+is logged once at WARNING and then counted.
+
+Nothing is added to the tick path: the cost is one timer wake-up per interval
+and a thread polling a timestamp.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+from common.config import LOOP_MONITOR_INTERVAL, LOOP_STALL_STACK_DEPTH, LOOP_STALL_THRESHOLD
+from common.histogram import LatencyHistogram
+from common.latency import now_ns
+from common.metrics import Family, histogram_family
+from common.utils import setup_logger
+
+logger = setup_logger(__name__)
+
+StackKey = Tuple[Tuple[str, int, str], ...]
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _where(summary: traceback.StackSummary) -> str:
+    """Innermost frame in this repo (the caller of the blocking library code)."""
+    for frame in reversed(summary):
+        if frame.filename.startswith(_REPO_ROOT) and not frame.filename.endswith("loop_monitor.py"):
+            break
+    else:
+        frame = summary[-1]
+    return f"{os.path.relpath(frame.filename, _REPO_ROOT)}:{frame.lineno} {frame.name}"
+
+
+class StallSite:
+    """One blocking call site: how often and how long the loop stalled in it."""
+
+    __slots__ = ("where", "stack", "task", "count", "total_ns", "max_ns")
+
+    def __init__(self, where: str, stack: List[str], task: str):
+        self.where = where
+        self.stack = stack
+        self.task = task
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "task": self.task,
+            "count": self.count,
+            "total_ms": self.total_ns / 1e6,
+            "max_ms": self.max_ns / 1e6,
+            "where": self.where,
+            "stack": self.stack,
+        }
+
+
+class LoopMonitor:
+    def __init__(
+        self,
+        interval: float = LOOP_MONITOR_INTERVAL,
+        threshold: float = LOOP_STALL_THRESHOLD,
+        stack_depth: int = LOOP_STALL_STACK_DEPTH,
+    ):
+        self.interval = interval
+        self.threshold = threshold
+        self.stack_depth = stack_depth
+        self.lag = LatencyHistogram()
+        self.sites: Dict[StackKey, StallSite] = {}
+        self.recent: Deque[Tuple[float, str, float]] = deque(maxlen=100)  # (wall time, where, ms)
+        self.stalls = 0
+        self.queues: Dict[str, Callable[[], int]] = {}
+        self.depths: Dict[str, int] = {"tasks": 0, "ready": 0, "scheduled": 0}
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._beat = 0
+        self._stalled: Optional[StallSite] = None
+        self._stop = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+
+    def watch_queue(self, name: str, depth: Callable[[], int]):
+        """Sample ``depth()`` every interval (from the loop, so it may read loop state)."""
+        self.queues[name] = depth
+        self.depths[name] = 0
+
+    async def run(self):
+        """Lag sampler; also starts the watchdog for the loop it runs on."""
+        self.loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._beat = now_ns()
+        self._stop.clear()
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+        interval_ns = int(self.interval * 1e9)
+        try:
+            while True:
+                start = self._beat
+                await asyncio.sleep(self.interval)
+                now = now_ns()
+                lag = now - start - interval_ns
+                self.lag.record(lag)
+                self._beat = now
+                stalled = self._stalled
+                if stalled is not None:
+                    # The watchdog saw it start; the full duration is known only now
+                    self._stalled = None
+                    stalled.total_ns += lag
+                    stalled.max_ns = max(stalled.max_ns, lag)
+                    self.recent.append((time.time(), stalled.where, lag / 1e6))
+                self._sample_depths()
+        finally:
+            self._stop.set()
+
+    def _sample_depths(self):
+        loop = self.loop
+        depths = self.depths
+        depths["tasks"] = len(asyncio.all_tasks(loop))
+        # Private but stable on the default loop: callbacks ready to run / timers pending
+        depths["ready"] = len(getattr(loop, "_ready", ()))
+        depths["scheduled"] = len(getattr(loop, "_scheduled", ()))
+        for name, depth in self.queues.items():
+            try:
+                depths[name] = depth()
+            except Exception:
+                depths[name] = -1
+
+    def _watch(self):
+        threshold_ns = int(self.threshold * 1e9)
+        deadline_ns = int(self.interval * 1e9) + threshold_ns
+        poll = max(self.threshold / 2, 0.001)
+        reported_beat = None
+        while not self._stop.wait(poll):
+            beat = self._beat
+            if beat == reported_beat or now_ns() - beat < deadline_ns:
+                continue
+            reported_beat = beat
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is None:
+                continue
+            self._record_stall(frame)
+
+    def _record_stall(self, frame):
+        summary = traceback.extract_stack(frame)[-self.stack_depth:]
+        key: StackKey = tuple((f.filename, f.lineno, f.name) for f in summary)
+        task = asyncio.current_task(self.loop)
+        task_name = task.get_name() if task is not None else "<callback>"
+        site = self.sites.get(key)
+        new_site = site is None
+        if new_site:
+            site = self.sites[key] = StallSite(_where(summary), traceback.format_list(summary), task_name)
+        site.count += 1
+        self.stalls += 1
+        self._stalled = site
+        if new_site:
+            logger.warning(
+                f"Event loop blocked > {self.threshold * 1000:.0f}ms at {site.where} ({task_name}):\n"
+                + "".join(site.stack)
+            )
+        else:
+            logger.debug("Event loop blocked again at %s (%d times)", site.where, site.count)
+
+    def stop(self):
+        self._stop.set()
+
+    def top_sites(self, n: int = 5) -> List[Dict[str, object]]:
+        """Stall sites by total blocked time, worst first."""
+        ranked = sorted(list(self.sites.values()), key=lambda s: s.total_ns, reverse=True)
+        return [site.to_dict() for site in ranked[:n]]
+
+    def summary(self) -> Dict[str, object]:
+        return {
+            "lag": self.lag.summary(),
+            "stalls": self.stalls,
+            "depths": dict(self.depths),
+            "top_sites": self.top_sites(),
+        }
+
+    def collect_metrics(self) -> List[Family]:
+        """Metrics collector for common.metrics.REGISTRY."""
+        blocked: Dict[str, float] = {}
+        for site in list(self.sites.values()):
+            blocked[site.where] = blocked.get(site.where, 0.0) + site.total_ns / 1e9
+        return [
+            histogram_family("event_loop_lag_seconds", "Event loop wake-up lag", (), {(): self.lag}),
+            Family("event_loop_stalls_total", "counter", "Times the loop was blocked past the threshold", (),
+                   [((), self.stalls)]),
+            Family("event_loop_stall_seconds_total", "counter", "Time blocked per call site", ("where",),
+                   [((where,), seconds) for where, seconds in blocked.items()]),
+            Family("event_loop_depth", "gauge", "Pending tasks, ready callbacks, timers and watched queues",
+                   ("queue",), [((name,), value) for name, value in list(self.depths.items())]),
+        ]
+
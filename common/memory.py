@@ -0,0 +1,253 @@
+"""Memory accounting - sizes of engine structures, tracemalloc diffs and growth alerts.
+
+Structures are registered by name with a getter returning the live container
+(so a container that is replaced is still followed):
+
+    memory.register("risk.orders", lambda: self.risk.orders)
+
+Each sample records len() and an approximate deep size in bytes. The size is
+estimated from a random sample of at most ``sample`` items per container
+level and scaled by len(), so sizing a 1M-entry dict costs the same as a
+small one. A least-squares slope over the last ``window`` seconds of samples
+gives growth per hour; a structure (or process RSS) growing faster than its
+threshold logs a warning.
+
+tracemalloc is only started by snapshot(); it slows allocation noticeably, so
+it is meant to be switched on while hunting a leak and off afterwards.
+"""
+
+import asyncio
+import os
+import random
+import resource
+import sys
+import time
+import tracemalloc
+import types
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+from common.config import (
+    MEMORY_CHECK_INTERVAL,
+    MEMORY_GROWTH_MIN_SPAN,
+    MEMORY_GROWTH_WINDOW,
+    MEMORY_RSS_ALERT_MB_PER_HOUR,
+    MEMORY_SIZE_SAMPLE,
+    MEMORY_STRUCTURE_ALERT_MB_PER_HOUR,
+    MEMORY_TRACEMALLOC_FRAMES,
+)
+from common.metrics import Family
+from common.utils import setup_logger
+
+logger = setup_logger(__name__)
+
+MB = 2 ** 20
+RSS = "process.rss"
+
+# Not followed when sizing: shared or owned elsewhere
+_OPAQUE = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+# More references than the container, the sample list and the loop hold: shared
+_SHARED_REFS = 6
+
+
+def rss_bytes() -> int:
+    """Current resident set size (Linux /proc; peak RSS elsewhere)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def approx_size(obj: Any, sample: int = MEMORY_SIZE_SAMPLE, depth: int = 6) -> int:
+    """Approximate deep size in bytes; containers are sized from a sample of their items.
+
+    Objects referenced from many places (interned symbols, strategy names,
+    small ints) are counted once rather than scaled up with their container.
+    """
+    own, shared = _size(obj, sample, depth, set())
+    return own + shared
+
+
+def _size(obj: Any, sample: int, depth: int, seen: set) -> Tuple[int, int]:
+    """(bytes that scale with the parent container, bytes of shared objects)."""
+    if id(obj) in seen or depth < 0 or isinstance(obj, _OPAQUE):
+        return 0, 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, int, float, bool)) or obj is None:
+        return size, 0
+
+    if isinstance(obj, dict):
+        items = obj.items()
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        items = obj
+    else:
+        fields = getattr(obj, "__dict__", None)
+        if fields is None:
+            slots = getattr(type(obj), "__slots__", ())
+            fields = {name: getattr(obj, name) for name in slots if hasattr(obj, name)}
+        else:
+            size += sys.getsizeof(fields)
+        items = fields.values()
+
+    n = len(items)
+    if not n:
+        return size, 0
+    # Sampling a dict/set means copying it to a list; take a prefix of large ones instead
+    chosen = list(items) if n <= sample else (
+        random.sample(list(items), sample) if n <= 100 * sample else [x for _, x in zip(range(sample), items)]
+    )
+    if isinstance(obj, dict):
+        chosen = [x for item in chosen for x in item]
+        n *= 2
+    own = shared = 0
+    for child in chosen:
+        child_own, child_shared = _size(child, sample, depth - 1, seen)
+        if sys.getrefcount(child) > _SHARED_REFS:
+            shared += child_own + child_shared
+        else:
+            own += child_own
+            shared += child_shared
+    return size + own * n // len(chosen), shared
+
+
+def slope_per_hour(points: Sequence[Tuple[float, float]]) -> float:
+    """Least-squares slope of (seconds, value) points, per hour."""
+    n = len(points)
+    if n < 2:
+        return 0.0
+    mean_t = sum(t for t, _ in points) / n
+    mean_v = sum(v for _, v in points) / n
+    var = sum((t - mean_t) ** 2 for t, _ in points)
+    if not var:
+        return 0.0
+    return sum((t - mean_t) * (v - mean_v) for t, v in points) / var * 3600
+
+
+class MemoryMonitor:
+    def __init__(
+        self,
+        interval: float = MEMORY_CHECK_INTERVAL,
+        window: float = MEMORY_GROWTH_WINDOW,
+        min_span: float = MEMORY_GROWTH_MIN_SPAN,
+        structure_alert_mb_per_hour: float = MEMORY_STRUCTURE_ALERT_MB_PER_HOUR,
+        rss_alert_mb_per_hour: float = MEMORY_RSS_ALERT_MB_PER_HOUR,
+    ):
+        self.interval = interval
+        self.window = window
+        self.min_span = min_span
+        self.structure_alert = structure_alert_mb_per_hour
+        self.rss_alert = rss_alert_mb_per_hour
+        self.structures: Dict[str, Callable[[], Any]] = {}
+        # name -> (monotonic t, entries, bytes)
+        self.history: Dict[str, Deque[Tuple[float, int, int]]] = {RSS: deque()}
+        self.latest: Dict[str, Dict[str, float]] = {}
+        self._alerted: Dict[str, float] = {}
+        self._snapshot: Optional[tracemalloc.Snapshot] = None
+
+    def register(self, name: str, getter: Callable[[], Any]):
+        self.structures[name] = getter
+        self.history.setdefault(name, deque())
+
+    def unregister(self, name: str):
+        self.structures.pop(name, None)
+        self.history.pop(name, None)
+        self.latest.pop(name, None)
+
+    def sample(self) -> Dict[str, Dict[str, float]]:
+        """Measure every structure and RSS, record history and check growth."""
+        now = time.monotonic()
+        report: Dict[str, Dict[str, float]] = {}
+        for name, getter in list(self.structures.items()):
+            try:
+                obj = getter()
+                entries, size = len(obj), approx_size(obj)
+            except Exception as e:
+                logger.error(f"Memory sizing of {name} failed: {e}")
+                continue
+            report[name] = self._record(name, now, entries, size)
+        report[RSS] = self._record(RSS, now, 0, rss_bytes())
+        self.latest = report
+        return report
+
+    def _record(self, name: str, now: float, entries: int, size: int) -> Dict[str, float]:
+        history = self.history.setdefault(name, deque())
+        history.append((now, entries, size))
+        while now - history[0][0] > self.window:
+            history.popleft()
+        span = now - history[0][0]
+        mb_per_hour = slope_per_hour([(t, b / MB) for t, _, b in history])
+        entries_per_hour = slope_per_hour([(t, e) for t, e, _ in history])
+        threshold = self.rss_alert if name == RSS else self.structure_alert
+        growing = span >= self.min_span and mb_per_hour > threshold
+        # At most one alert per structure per window
+        if growing and now - self._alerted.get(name, -self.window) >= self.window:
+            self._alerted[name] = now
+            logger.warning(
+                f"Memory growth: {name} at {size / MB:.1f} MB ({entries} entries) growing "
+                f"{mb_per_hour:+.1f} MB/h, {entries_per_hour:+.0f} entries/h over {span / 60:.0f} min "
+                f"(threshold {threshold:.0f} MB/h)"
+            )
+        return {
+            "entries": entries,
+            "bytes": size,
+            "mb_per_hour": mb_per_hour if span >= self.min_span else 0.0,
+            "entries_per_hour": entries_per_hour if span >= self.min_span else 0.0,
+        }
+
+    async def run(self):
+        """Sample every ``interval`` seconds."""
+        while True:
+            try:
+                self.sample()
+            except Exception as e:
+                logger.error(f"Error sampling memory: {e}")
+            await asyncio.sleep(self.interval)
+
+    def snapshot(self, top: int = 10) -> List[Dict[str, Any]]:
+        """Take a tracemalloc snapshot and diff it against the previous one.
+
+        The first call starts tracemalloc and only records a baseline; call
+        again after the suspected growth to get the top growth sites.
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(MEMORY_TRACEMALLOC_FRAMES)
+            logger.info("tracemalloc started; allocations are traced until stop_tracing()")
+        current = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        previous, self._snapshot = self._snapshot, current
+        if previous is None:
+            return []
+        growth = []
+        for stat in current.compare_to(previous, "traceback")[:top]:
+            frame = stat.traceback[-1]  # innermost (frames are oldest first)
+            growth.append({
+                "where": f"{frame.filename}:{frame.lineno}",
+                "size_diff_kb": stat.size_diff / 1024,
+                "count_diff": stat.count_diff,
+                "size_kb": stat.size / 1024,
+                "traceback": stat.traceback.format(),
+            })
+        return growth
+
+    def stop_tracing(self):
+        tracemalloc.stop()
+        self._snapshot = None
+
+    def collect_metrics(self) -> List[Family]:
+        """Metrics collector for common.metrics.REGISTRY (last sample)."""
+        latest = [(name, values) for name, values in self.latest.items() if name != RSS]
+        families = [
+            Family("memory_structure_entries", "gauge", "Entries in an engine structure", ("structure",),
+                   [((name,), values["entries"]) for name, values in latest]),
+            Family("memory_structure_bytes", "gauge", "Approximate deep size of an engine structure",
+                   ("structure",), [((name,), values["bytes"]) for name, values in latest]),
+            Family("memory_structure_growth_bytes_per_hour", "gauge", "Size trend over the growth window",
+                   ("structure",), [((name,), values["mb_per_hour"] * MB) for name, values in latest]),
+        ]
+        if RSS in self.latest:
+            families.append(Family("process_resident_memory_bytes", "gauge", "Resident set size", (),
+                                   [((), self.latest[RSS]["bytes"])]))
+        return families
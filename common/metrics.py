@@ -0,0 +1,264 @@
+"""Metrics registry - counters, gauges and latency histograms in Prometheus text format.
+
+Hot-path metrics are module-level objects in the default REGISTRY:
+
+    ORDERS = REGISTRY.counter("oms_orders_submitted_total", "Orders submitted", ("symbol", "strategy"))
+    ORDERS.labels(order.symbol, order.strategy).inc()
+
+``labels`` is one dict lookup and ``inc`` one attribute add; histograms
+record nanoseconds into a LatencyHistogram and are exported in seconds.
+State that already lives on objects (books, positions, order store, strategy
+stats) is exported by collectors that run only when the endpoint is scraped.
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl, urlsplit
+from common.histogram import LatencyHistogram
+from common.utils import setup_logger
+
+logger = setup_logger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Exported histogram buckets in nanoseconds (1us .. 10s)
+LATENCY_BUCKETS_NS = [
+    int(m * 10 ** e) for e in range(3, 10) for m in (1, 2.5, 5)
+] + [10 ** 10]
+INF_BUCKET = 'le="+Inf"'
+
+
+class Family(NamedTuple):
+    """One metric as produced by a collector: samples are (label values, value or LatencyHistogram)."""
+    name: str
+    kind: str  # "counter", "gauge" or "histogram"
+    documentation: str
+    labelnames: Tuple[str, ...]
+    samples: List[Tuple[Tuple[str, ...], object]]
+
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+    def dec(self, amount: float = 1):
+        self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+
+class Metric:
+    kind = ""
+    child_type: Callable = _Value
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        # Unlabeled metrics have exactly one child
+        self._default = None if self.labelnames else self.labels()
+
+    def labels(self, *values: str):
+        """Child for one combination of label values (created on first use)."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            child = self._children[values] = self.child_type()
+        return child
+
+    def collect(self) -> Family:
+        samples = [
+            (values, child if self.kind == "histogram" else child.value)
+            for values, child in list(self._children.items())
+        ]
+        return Family(self.name, self.kind, self.documentation, self.labelnames, samples)
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1):
+        self._default.value += amount
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def set(self, value: float):
+        self._default.value = value
+
+    def inc(self, amount: float = 1):
+        self._default.value += amount
+
+    def dec(self, amount: float = 1):
+        self._default.value -= amount
+
+
+class Histogram(Metric):
+    """Latency histogram; observe() takes nanoseconds, exposition is in seconds."""
+    kind = "histogram"
+    child_type = LatencyHistogram
+
+    def observe(self, value_ns: int):
+        self._default.record(value_ns)
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics: Dict[str, Metric] = {}
+        self.collectors: Dict[str, Callable[[], Iterable[Family]]] = {}
+
+    def _register(self, metric: Metric) -> Metric:
+        existing = self.metrics.get(metric.name)
+        if existing is not None:
+            if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                raise ValueError(f"Metric {metric.name} already registered differently")
+            return existing
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames))
+
+    def register_collector(self, key: str, collector: Callable[[], Iterable[Family]]):
+        """Add (or replace) a scrape-time collector returning Family objects."""
+        self.collectors[key] = collector
+
+    def unregister_collector(self, key: str):
+        self.collectors.pop(key, None)
+
+    def collect(self) -> List[Family]:
+        families = [metric.collect() for metric in list(self.metrics.values())]
+        for key, collector in list(self.collectors.items()):
+            try:
+                families.extend(collector())
+            except Exception as e:
+                logger.error(f"Metrics collector {key} failed: {e}")
+        return families
+
+    def exposition(self) -> str:
+        """All metrics in the Prometheus text exposition format (0.0.4)."""
+        lines: List[str] = []
+        for family in self.collect():
+            lines.append(f"# HELP {family.name} {_escape_help(family.documentation)}")
+            lines.append(f"# TYPE {family.name} {family.kind}")
+            for values, value in family.samples:
+                labels = _label_pairs(family.labelnames, values)
+                if family.kind == "histogram":
+                    _histogram_lines(lines, family.name, labels, value)
+                else:
+                    lines.append(f"{family.name}{_braces(labels)} {_number(value)}")
+        lines.append("")
+        return "\n".join(lines)
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _label_pairs(names: Tuple[str, ...], values: Tuple[str, ...]) -> List[str]:
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{name}="{value}"')
+    return pairs
+
+
+def _braces(pairs: List[str]) -> str:
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if value == float("-inf"):
+        return "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _histogram_lines(lines: List[str], name: str, labels: List[str], hist: LatencyHistogram):
+    for bound, count in zip(LATENCY_BUCKETS_NS, hist.cumulative_counts(LATENCY_BUCKETS_NS)):
+        le = 'le="%g"' % (bound / 1e9)
+        lines.append(f"{name}_bucket{_braces(labels + [le])} {count}")
+    lines.append(f"{name}_bucket{_braces(labels + [INF_BUCKET])} {hist.count}")
+    lines.append(f"{name}_sum{_braces(labels)} {hist.total / 1e9!r}")
+    lines.append(f"{name}_count{_braces(labels)} {hist.count}")
+
+
+def histogram_family(name: str, documentation: str, labelnames: Sequence[str],
+                     histograms: Dict[Tuple[str, ...], LatencyHistogram]) -> Family:
+    """Export existing LatencyHistograms (nanoseconds) from a collector."""
+    return Family(name, "histogram", documentation, tuple(labelnames), list(histograms.items()))
+
+
+REGISTRY = MetricsRegistry()
+
+# Admin routes served next to /metrics: path -> handler(query params) -> text body.
+# Handlers run on the server thread; ValueError -> 400, RuntimeError -> 409.
+ROUTES: Dict[str, Callable[[Dict[str, str]], str]] = {}
+
+
+def add_route(path: str, handler: Callable[[Dict[str, str]], str]):
+    ROUTES[path] = handler
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry = REGISTRY
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path in ROUTES:
+            try:
+                body = ROUTES[url.path](dict(parse_qsl(url.query))).encode()
+            except ValueError as e:
+                self.send_error(400, str(e))
+                return
+            except RuntimeError as e:
+                self.send_error(409, str(e))
+                return
+            content_type = "text/plain; charset=utf-8"
+        elif url.path in ("/metrics", "/"):
+            body = self.registry.exposition().encode()
+            content_type = CONTENT_TYPE
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug("metrics %s", format % args)
+
+
+def start_http_server(port: int, host: str = "127.0.0.1",
+                      registry: MetricsRegistry = REGISTRY) -> Optional[ThreadingHTTPServer]:
+    """Serve /metrics from a daemon thread; returns None if the port is unavailable."""
+    handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+    try:
+        server = ThreadingHTTPServer((host, port), handler)
+    except OSError as e:
+        logger.warning(f"Metrics endpoint not started on {host}:{port}: {e}")
+        return None
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True)
+    thread.start()
+    logger.info(f"Metrics endpoint on http://{host}:{port}/metrics")
+    return server
@@ -0,0 +1,172 @@
+"""Sampling profiler - on-demand stack sampling of a running engine, as collapsed stacks.
+
+A daemon thread reads the event loop thread's current frame
+(sys._current_frames) ``rate_hz`` times a second for ``seconds`` and counts
+identical stacks. Nothing runs when no profile is in progress: there is no
+tracing hook and no per-tick bookkeeping.
+
+Each sample is tagged with the pipeline stage (common.latency.STAGES, plus
+the post-fill dashboard broadcast) of the innermost frame that belongs to
+one; the tag is the root frame, so a flamegraph splits by stage first:
+
+    [risk];run (main_trading_system.py:467);...;check_order (risk/risk_engine.py:80) 12
+
+Samples taken while the loop waits in select() are tagged [idle]. Output is
+the collapsed ("folded") format read by flamegraph.pl, inferno and speedscope.
+
+The sampler needs the GIL, so samples land where the loop thread releases it
+(I/O, or every sys.getswitchinterval()); rates above ~200 Hz add little.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional, Tuple
+from common.config import PROFILE_DIR, PROFILE_RATE_HZ, PROFILE_SECONDS
+from common.utils import setup_logger
+
+logger = setup_logger(__name__)
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (file relative to the repo root, function) -> stage; the innermost match wins.
+# The positions stage is a read of PnLCalculator.net_quantities: no function to sample.
+STAGE_FUNCTIONS = {
+    ("market_data/feed_handler.py", "decode_tick"): "feed",
+    ("market_data/feed_handler.py", "listen"): "feed",
+    ("market_data/feed_handler.py", "_listen_batched"): "feed",
+    ("market_data/feed_handler.py", "_read_line"): "feed",
+    ("market_data/feed_handler.py", "_dispatch"): "feed",
+    ("tickerplant/orderbook.py", "update"): "book",
+    ("tickerplant/orderbook.py", "update_batch"): "book",
+    ("strategy/registry.py", "on_book"): "strategy",
+    ("risk/risk_engine.py", "check_order"): "risk",
+    ("risk/risk_engine.py", "check_orders"): "risk",
+    ("oms/oms.py", "submit_order"): "oms",
+    ("exchange_sim/exchange.py", "process_order"): "exchange",
+    ("exchange_sim/exchange.py", "process_orders"): "exchange",
+    ("main_trading_system.py", "_handle_execution"): "execution",
+    ("main_trading_system.py", "_apply_execution"): "execution",
+    ("main_trading_system.py", "_broadcast_fills"): "broadcast",
+}
+IDLE_FUNCTIONS = {("selectors.py", "select")}
+
+
+class SamplingProfiler:
+    def __init__(self, rate_hz: float = PROFILE_RATE_HZ, output_dir: str = PROFILE_DIR):
+        self.rate_hz = rate_hz
+        self.output_dir = output_dir
+        self.thread_id: Optional[int] = None
+        self.last_path: Optional[str] = None
+        self.last_samples = 0
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        # code object -> (frame label, stage or None, idle), filled on first sight
+        self._code_info: Dict[object, Tuple[str, Optional[str], bool]] = {}
+
+    def attach(self, thread_id: Optional[int] = None):
+        """Profile ``thread_id`` (default: the calling thread, i.e. the event loop's)."""
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, seconds: float = PROFILE_SECONDS, rate_hz: Optional[float] = None) -> bool:
+        """Begin a profile in the background; False if one is already running."""
+        with self._lock:
+            if self.running:
+                logger.warning("Profile already in progress")
+                return False
+            if self.thread_id is None:
+                raise RuntimeError("SamplingProfiler.attach() has not been called")
+            self._thread = threading.Thread(
+                target=self._profile, args=(seconds, rate_hz or self.rate_hz), name="profiler", daemon=True
+            )
+            self._thread.start()
+        return True
+
+    def profile(self, seconds: float = PROFILE_SECONDS, rate_hz: Optional[float] = None) -> str:
+        """Run a profile to completion (from a non-loop thread) and return the collapsed stacks."""
+        if not self.start(seconds, rate_hz):
+            raise RuntimeError("Profile already in progress")
+        self._thread.join()
+        with open(self.last_path) as f:
+            return f.read()
+
+    def _profile(self, seconds: float, rate_hz: float):
+        logger.info(f"Profiling for {seconds:.0f}s at {rate_hz:.0f} Hz")
+        stacks = self.sample(seconds, rate_hz)
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, time.strftime("profile-%Y%m%d-%H%M%S.folded"))
+        with open(path, "w") as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        self.last_path = path
+        self.last_samples = sum(stacks.values())
+
+        by_stage: Counter = Counter()
+        for stack, count in stacks.items():
+            by_stage[stack.split(";", 1)[0]] += count
+        total = self.last_samples or 1
+        shares = ", ".join(f"{stage} {count / total:.0%}" for stage, count in by_stage.most_common())
+        logger.info(f"Profile written to {path}: {self.last_samples} samples ({shares})")
+
+    def sample(self, seconds: float, rate_hz: float) -> Counter:
+        """Sample the attached thread; returns collapsed stack -> count."""
+        stacks: Counter = Counter()
+        interval = 1.0 / rate_hz
+        next_at = time.perf_counter()
+        deadline = next_at + seconds
+        while True:
+            next_at += interval
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                stacks[self._collapse(frame)] += 1
+            del frame
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            if next_at > now:
+                time.sleep(next_at - now)
+            else:
+                # Fell behind (GIL held by the loop); don't burst to catch up
+                next_at = now
+        return stacks
+
+    def _collapse(self, frame) -> str:
+        labels = []
+        stage = None
+        idle = False
+        innermost = True
+        while frame is not None:
+            info = self._code_info.get(frame.f_code)
+            if info is None:
+                info = self._code_info[frame.f_code] = self._describe(frame.f_code)
+            label, frame_stage, frame_idle = info
+            labels.append(label)
+            if innermost:
+                idle = frame_idle
+                innermost = False
+            if stage is None:
+                stage = frame_stage
+            frame = frame.f_back
+        tag = "idle" if idle else (stage or "other")
+        labels.append(f"[{tag}]")
+        labels.reverse()
+        return ";".join(labels)
+
+    @staticmethod
+    def _describe(code) -> Tuple[str, Optional[str], bool]:
+        filename = os.path.abspath(code.co_filename)
+        if filename.startswith(_REPO_ROOT + os.sep):
+            where = os.path.relpath(filename, _REPO_ROOT).replace(os.sep, "/")
+        else:
+            where = os.path.basename(filename)
+        return (
+            f"{code.co_name} ({where}:{code.co_firstlineno})",
+            STAGE_FUNCTIONS.get((where, code.co_name)),
+            (os.path.basename(filename), code.co_name) in IDLE_FUNCTIONS,
+        )
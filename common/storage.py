@@ -0,0 +1,206 @@
+"""Daily partitioned storage - live SQLite working set plus compressed columnar archive."""
+
+import calendar
+import os
+import sqlite3
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import numpy as np
+from common.config import ARCHIVE_DIR, DB_PATH
+from common.utils import setup_logger
+
+logger = setup_logger(__name__)
+
+# Column layout shared by the live tables and the archive files
+ORDER_COLUMNS = ("order_id", "symbol", "side", "quantity", "price", "timestamp", "status", "strategy", "filled_qty")
+FILL_COLUMNS = ("fill_id", "order_id", "symbol", "side", "quantity", "price", "timestamp")
+TABLES = {"orders": (ORDER_COLUMNS, "order_id"), "fills": (FILL_COLUMNS, "fill_id")}
+
+# Orders still working are never archived
+TERMINAL_STATUSES = ("FILLED", "REJECTED", "CANCELED")
+
+SECONDS_PER_DAY = 86400
+
+
+def session_date(timestamp: Optional[float] = None) -> str:
+    """Trading session (UTC calendar date, YYYY-MM-DD) for an epoch timestamp."""
+    return time.strftime("%Y-%m-%d", time.gmtime(time.time() if timestamp is None else timestamp))
+
+
+def session_start(date: str) -> float:
+    """Epoch timestamp at which a session date begins."""
+    return float(calendar.timegm(time.strptime(date, "%Y-%m-%d")))
+
+
+def create_indexes(cursor: sqlite3.Cursor):
+    """Timestamp indexes so date-range queries and rollover avoid full scans."""
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_orders_timestamp ON orders (timestamp)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_fills_timestamp ON fills (timestamp)")
+
+
+def _archive_path(archive_dir: str, table: str, date: str) -> str:
+    return os.path.join(archive_dir, date, f"{table}.npz")
+
+
+def archived_dates(archive_dir: str = ARCHIVE_DIR) -> List[str]:
+    """Session dates that have been moved to the archive, oldest first."""
+    if not os.path.isdir(archive_dir):
+        return []
+    return sorted(name for name in os.listdir(archive_dir) if os.path.isdir(os.path.join(archive_dir, name)))
+
+
+def load_archive(table: str, date: str, archive_dir: str = ARCHIVE_DIR) -> Dict[str, np.ndarray]:
+    """Columns of one archived partition (empty dict if it does not exist)."""
+    path = _archive_path(archive_dir, table, date)
+    if not os.path.exists(path):
+        return {}
+    with np.load(path) as data:
+        return {name: data[name] for name in data.files}
+
+
+def _to_columns(rows: List[Tuple], columns: Tuple[str, ...]) -> Dict[str, np.ndarray]:
+    values = list(zip(*rows)) if rows else [()] * len(columns)
+    out = {}
+    for name, column in zip(columns, values):
+        if name in ("quantity", "filled_qty"):
+            out[name] = np.array([v or 0 for v in column], dtype=np.int64)
+        elif name in ("price", "timestamp"):
+            out[name] = np.array(column, dtype=np.float64)
+        else:
+            out[name] = np.array(["" if v is None else str(v) for v in column], dtype=np.str_)
+    return out
+
+
+def _rows(columns: Dict[str, np.ndarray], names: Tuple[str, ...]) -> List[Tuple]:
+    if not columns:
+        return []
+    return list(zip(*(columns[name].tolist() for name in names)))
+
+
+def _write_archive(table: str, date: str, rows: List[Tuple], archive_dir: str) -> List[Tuple]:
+    """Merge rows into a day's archive file; returns the rows that were new."""
+    columns, key = TABLES[table]
+    key_pos = columns.index(key)
+    existing = _rows(load_archive(table, date, archive_dir), columns)
+    seen = {row[key_pos] for row in existing}
+    new_rows = [row for row in rows if row[key_pos] not in seen]
+    if not new_rows:
+        return []
+
+    path = _archive_path(archive_dir, table, date)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    merged = sorted(existing + new_rows, key=lambda row: row[columns.index("timestamp")])
+    tmp_path = path + ".tmp.npz"
+    np.savez_compressed(tmp_path, **_to_columns(merged, columns))
+    os.replace(tmp_path, path)
+    return new_rows
+
+
+def rollover(
+    today: Optional[str] = None,
+    on_close: Optional[Callable[[sqlite3.Cursor, str, List[Tuple]], None]] = None,
+    db_path: str = DB_PATH,
+    archive_dir: str = ARCHIVE_DIR,
+    vacuum: bool = True,
+) -> List[str]:
+    """Archive every closed session (before ``today``) and drop it from the live DB.
+
+    Each closed day's terminal orders and fills are merged into
+    ``archive_dir/<date>/{orders,fills}.npz`` and deleted from SQLite, then
+    the database is vacuumed (unless ``vacuum`` is False: VACUUM rewrites the
+    whole file, so a running engine leaves it to vacuum() at shutdown). ``on_close(cursor, date, new_fills)`` runs in
+    the same transaction before the rows are deleted, so carried-forward
+    state (e.g. PnL positions) stays consistent with what was archived.
+    Returns the dates that were closed.
+    """
+    cutoff = session_start(today or session_date())
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT DISTINCT date(timestamp, 'unixepoch') FROM ("
+        " SELECT timestamp FROM fills WHERE timestamp < ?"
+        " UNION ALL SELECT timestamp FROM orders WHERE timestamp < ?)"
+        " ORDER BY 1",
+        (cutoff, cutoff),
+    )
+    dates = [row[0] for row in cursor.fetchall() if row[0]]
+
+    for date in dates:
+        start, end = session_start(date), session_start(date) + SECONDS_PER_DAY
+        placeholders = ",".join("?" * len(TERMINAL_STATUSES))
+        cursor.execute(
+            f"SELECT {', '.join(FILL_COLUMNS)} FROM fills WHERE timestamp >= ? AND timestamp < ?",
+            (start, end),
+        )
+        fills = cursor.fetchall()
+        cursor.execute(
+            f"SELECT {', '.join(ORDER_COLUMNS)} FROM orders"
+            f" WHERE timestamp >= ? AND timestamp < ? AND status IN ({placeholders})",
+            (start, end, *TERMINAL_STATUSES),
+        )
+        orders = cursor.fetchall()
+
+        # Fills already archived (e.g. re-inserted by journal replay) must not be counted twice
+        new_fills = _write_archive("fills", date, fills, archive_dir)
+        _write_archive("orders", date, orders, archive_dir)
+        if on_close is not None:
+            on_close(cursor, date, sorted(new_fills, key=lambda row: row[FILL_COLUMNS.index("timestamp")]))
+
+        cursor.execute("DELETE FROM fills WHERE timestamp >= ? AND timestamp < ?", (start, end))
+        cursor.execute(
+            f"DELETE FROM orders WHERE timestamp >= ? AND timestamp < ? AND status IN ({placeholders})",
+            (start, end, *TERMINAL_STATUSES),
+        )
+        conn.commit()
+        logger.info("Archived session %s: %d orders, %d fills", date, len(orders), len(fills))
+
+    if dates and vacuum:
+        conn.execute("VACUUM")
+    conn.close()
+    return dates
+
+
+def vacuum(db_path: str = DB_PATH):
+    """Reclaim the space of archived sessions (rewrites the whole database)."""
+    start = time.perf_counter()
+    conn = sqlite3.connect(db_path)
+    conn.execute("VACUUM")
+    conn.close()
+    logger.info("Vacuumed %s in %.2fs", db_path, time.perf_counter() - start)
+
+
+def _query(table: str, start_date: Optional[str], end_date: Optional[str],
+           db_path: str, archive_dir: str) -> List[Dict[str, Any]]:
+    columns, _ = TABLES[table]
+    rows: List[Tuple] = []
+    for date in archived_dates(archive_dir):
+        if (start_date is None or date >= start_date) and (end_date is None or date <= end_date):
+            rows.extend(_rows(load_archive(table, date, archive_dir), columns))
+
+    # Live rows are selected through the timestamp index
+    conditions, params = [], []
+    if start_date:
+        conditions.append("timestamp >= ?")
+        params.append(session_start(start_date))
+    if end_date:
+        conditions.append("timestamp < ?")
+        params.append(session_start(end_date) + SECONDS_PER_DAY)
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT {', '.join(columns)} FROM {table}{where} ORDER BY timestamp", params)
+    rows.extend(cursor.fetchall())
+    conn.close()
+    return [dict(zip(columns, row)) for row in rows]
+
+
+def query_orders(start_date: Optional[str] = None, end_date: Optional[str] = None,
+                 db_path: str = DB_PATH, archive_dir: str = ARCHIVE_DIR) -> List[Dict[str, Any]]:
+    """Orders between two session dates (inclusive), from archive and live DB."""
+    return _query("orders", start_date, end_date, db_path, archive_dir)
+
+
+def query_fills(start_date: Optional[str] = None, end_date: Optional[str] = None,
+                db_path: str = DB_PATH, archive_dir: str = ARCHIVE_DIR) -> List[Dict[str, Any]]:
+    """Fills between two session dates (inclusive), from archive and live DB."""
+    return _query("fills", start_date, end_date, db_path, archive_dir)
@@ -1,24 +1,184 @@
 """Common utilities for the trading system."""
 
+import atexit
+import queue
+import sys
 import time
 import json
 import logging
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, Optional, TextIO, Tuple
+from common.config import ASYNC_LOGGING, LOG_LEVEL, LOG_QUEUE_SIZE, LOG_RATE_LIMIT
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Log args safe to render later on the listener thread
+_SCALARS = (str, int, float, type(None))
+
+
+class LazyQueueHandler(QueueHandler):
+    """QueueHandler that leaves message formatting to the listener thread.
+
+    The stock QueueHandler formats every record in the caller's thread;
+    here a record whose message and args are all immutable scalars is
+    enqueued as-is, so rendering happens on the background thread. Any
+    other record (an Order, a book dict, ...) is rendered in the caller's
+    thread, since the object may be changed before the listener gets to it.
+    """
+
+    def __init__(self, log_queue: queue.SimpleQueue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        args = record.args
+        if args:
+            values = args.values() if isinstance(args, dict) else args
+            if not all(isinstance(value, _SCALARS) for value in values):
+                record.msg = record.getMessage()
+                record.args = None
+        elif not isinstance(record.msg, str):
+            record.msg = str(record.msg)
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        # Never block the trading loop on logging: drop when the writer falls behind
+        if self.queue.qsize() >= LOG_QUEUE_SIZE:
+            self.dropped += 1
+            return
+        self.queue.put_nowait(record)
+
+
+class CallSiteRateLimiter(logging.Filter):
+    """Token bucket per call site (file:line) for records below WARNING.
+
+    Lets hot-path messages through at up to ``rate`` per second each, with
+    bursts of ``burst``; warnings and errors always pass.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self.suppressed = 0
+        self._buckets: Dict[Tuple[str, int], Tuple[float, float]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate <= 0 or record.levelno >= logging.WARNING:
+            return True
+        key = (record.pathname, record.lineno)
+        now = record.created
+        tokens, last = self._buckets.get(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - last) * self.rate)
+        if tokens < 1.0:
+            self._buckets[key] = (tokens, now)
+            self.suppressed += 1
+            return False
+        self._buckets[key] = (tokens - 1.0, now)
+        return True
+
+
+class _LoggingState:
+    """Process-wide logging setup shared by every logger from setup_logger."""
+
+    def __init__(self):
+        self.loggers: Dict[str, logging.Logger] = {}
+        self.async_mode = ASYNC_LOGGING
+        self.level = LOG_LEVEL
+        self.stream: Optional[TextIO] = None
+        self.rate_limiter = CallSiteRateLimiter(LOG_RATE_LIMIT)
+        self.handler: Optional[logging.Handler] = None
+        self.listener: Optional[QueueListener] = None
+
+    def build_handler(self) -> logging.Handler:
+        stream_handler = logging.StreamHandler(self.stream or sys.stderr)
+        stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        if not self.async_mode:
+            handler = stream_handler
+        else:
+            log_queue = queue.SimpleQueue()
+            handler = LazyQueueHandler(log_queue)
+            self.listener = QueueListener(log_queue, stream_handler, respect_handler_level=False)
+            self.listener.start()
+        handler.addFilter(self.rate_limiter)
+        return handler
+
+    def get_handler(self) -> logging.Handler:
+        if self.handler is None:
+            self.handler = self.build_handler()
+        return self.handler
+
+    def stop_listener(self):
+        if self.listener is not None:
+            self.listener.stop()  # drains the queue before returning
+            self.listener = None
+
+
+_logging = _LoggingState()
+atexit.register(_logging.stop_listener)
+
 
 def setup_logger(name: str) -> logging.Logger:
-    """Set up a logger with consistent formatting."""
+    """Set up a logger with consistent formatting.
+
+    All loggers share one handler: a plain StreamHandler, or (with
+    ASYNC_LOGGING) a queue handler drained by a background thread.
+    """
     logger = logging.getLogger(name)
     if not logger.handlers:
-        handler = logging.StreamHandler()
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
-        logger.setLevel(logging.INFO)
+        logger.addHandler(_logging.get_handler())
+        logger.setLevel(_logging.level)
+    _logging.loggers[name] = logger
     return logger
 
+
+def configure_logging(
+    async_mode: Optional[bool] = None,
+    level: Optional[str] = None,
+    rate_limit: Optional[float] = None,
+    stream: Optional[TextIO] = None,
+):
+    """Reconfigure every logger created by setup_logger at runtime."""
+    old_handler = _logging.handler
+    if async_mode is not None:
+        _logging.async_mode = async_mode
+    if level is not None:
+        _logging.level = level
+    if rate_limit is not None:
+        _logging.rate_limiter.rate = rate_limit
+        _logging.rate_limiter.burst = max(1.0, rate_limit)
+    if stream is not None:
+        _logging.stream = stream
+
+    if async_mode is not None or stream is not None:
+        _logging.stop_listener()
+        _logging.handler = _logging.build_handler()
+
+    for logger in _logging.loggers.values():
+        if old_handler is not None and old_handler is not _logging.handler:
+            logger.removeHandler(old_handler)
+        if _logging.handler not in logger.handlers:
+            logger.addHandler(_logging.get_handler())
+        logger.setLevel(_logging.level)
+
+
+def get_logging_stats() -> Dict[str, int]:
+    """Counters for records suppressed by rate limiting or dropped by the queue."""
+    handler = _logging.handler
+    return {
+        "suppressed": _logging.rate_limiter.suppressed,
+        "dropped": handler.dropped if isinstance(handler, LazyQueueHandler) else 0,
+    }
+
+
+def flush_logging():
+    """Block until queued records are written (restarts the listener)."""
+    if _logging.listener is not None:
+        _logging.listener.stop()
+        _logging.listener.start()
+
+
 def get_timestamp() -> float:
     """Get high-precision timestamp."""
     return time.time()
@@ -29,4 +189,4 @@ def serialize_message(data: Dict[str, Any]) -> str:
 
 def deserialize_message(msg: str) -> Dict[str, Any]:
     """Deserialize JSON message."""
-    return json.loads(msg)
\ No newline at end of file
+    return json.loads(msg)
@@ -3,76 +3,133 @@
 import random
 import uuid
 import asyncio
-from typing import Dict, Any
+from typing import List, Sequence
+from market_data.schemas import Fill, Order
+from common.metrics import REGISTRY
 from common.utils import setup_logger, get_timestamp
 
 logger = setup_logger(__name__)
 
+EXECUTIONS = REGISTRY.counter("exchange_executions_total", "Execution reports by outcome", ("symbol", "status"))
+ROUND_TRIPS = REGISTRY.counter("exchange_round_trips_total", "Simulated network round trips", ("mode",))
+
+REQUIRED_FIELDS = ("order_id", "symbol", "side", "quantity", "price")
+
 class ExchangeSimulator:
     def __init__(self):
         self.fill_rate = 0.85  # 85% of orders get filled
+        self.partial_fill_rate = 0.1  # 10% of fills are partial
+        self.slippage = (-0.02, 0.02)  # uniform slippage range in price units
         self.latency_ms = (1, 50)  # simulated latency range
 
-    async def process_order(self, order: Dict[str, Any]) -> Dict[str, Any]:
-        """Process order and return fill or rejection."""
+    @staticmethod
+    def _reject(order: Order, reason: str) -> Fill:
+        EXECUTIONS.labels(order.symbol, "REJECTED").inc()
+        return Fill(
+            order_id=order.order_id,
+            symbol=order.symbol,
+            side=order.side,
+            quantity=0,
+            price=order.price,
+            timestamp=get_timestamp(),
+            status="REJECTED",
+            reason=reason,
+            strategy=order.strategy,
+            account=order.account,
+        )
+
+    def _validate(self, order: Order):
+        """Rejection for an order missing required fields, else None."""
+        missing = [name for name in REQUIRED_FIELDS if getattr(order, name) is None]
+        if missing:
+            logger.error(f"Invalid order, missing fields: {missing}")
+            return self._reject(order, f"INVALID_ORDER: missing {missing}")
+        return None
+
+    async def process_order(self, order: Order) -> Fill:
+        """Process order and return a fill or a rejection (status REJECTED)."""
         try:
             # Validate required fields
-            required = {"order_id", "symbol", "side", "quantity", "price"}
-            if not required.issubset(order):
-                missing = required - set(order.keys())
-                logger.error(f"Invalid order, missing fields: {missing}")
-                return {
-                    "status": "REJECTED",
-                    "reason": f"INVALID_ORDER: missing {missing}",
-                    "timestamp": get_timestamp()
-                }
+            rejection = self._validate(order)
+            if rejection is not None:
+                return rejection
 
             # Simulate network latency
+            ROUND_TRIPS.labels("single").inc()
             latency = random.uniform(*self.latency_ms) / 1000
             await asyncio.sleep(latency)
 
-            # Simulate fill probability
-            if random.random() < self.fill_rate:
-                # Simulate partial fills occasionally
-                fill_quantity = order["quantity"]
-                if random.random() < 0.1:  # 10% chance of partial fill
-                    fill_quantity = random.randint(1, order["quantity"])
-
-                # Add some slippage
-                slippage = random.uniform(-0.02, 0.02)
-                fill_price = order["price"] + slippage
-
-                fill = {
-                    "fill_id": str(uuid.uuid4()),
-                    "order_id": order["order_id"],
-                    "symbol": order["symbol"],
-                    "side": order["side"],
-                    "quantity": fill_quantity,
-                    "price": round(fill_price, 2),
-                    "timestamp": get_timestamp(),
-                    "status": "FILLED"
-                }
-
-                logger.info(
-                    f"FILLED: {fill['quantity']} {fill['symbol']} @ {fill['price']} "
-                    f"(slippage: {slippage:.4f})"
-                )
-                return fill
-            else:
-                # Rejection
-                rejection = {
-                    **order,
-                    "status": "REJECTED",
-                    "reason": "MARKET_REJECT",
-                    "timestamp": get_timestamp()
-                }
-                logger.info(f"REJECTED: {order['order_id']} - {rejection['reason']}")
-                return rejection
+            return self.execute(order)
 
         except Exception as e:
             logger.error(f"Exchange error: {e}", exc_info=True)
-            return {
-                "status": "REJECTED",
-                "reason": "EXCHANGE_ERROR",
-                "timestamp": get_timestamp()
-            }
+            return self._reject(order, "EXCHANGE_ERROR")
+
+    async def process_orders(self, orders: Sequence[Order]) -> List[Fill]:
+        """Bulk entry: one simulated round trip for the whole batch.
+
+        Returns one execution report per order, in order: a fill, or a
+        rejection (status REJECTED) for invalid or unmatched orders. An
+        exchange error rejects only the order it occurred on.
+        """
+        reports: List[Fill] = [None] * len(orders)
+        valid = []
+        for i, order in enumerate(orders):
+            rejection = self._validate(order)
+            if rejection is not None:
+                reports[i] = rejection
+            else:
+                valid.append(i)
+
+        if valid:
+            # Simulate network latency once per batch
+            ROUND_TRIPS.labels("bulk").inc()
+            latency = random.uniform(*self.latency_ms) / 1000
+            await asyncio.sleep(latency)
+
+        for i in valid:
+            try:
+                reports[i] = self.execute(orders[i])
+            except Exception as e:
+                logger.error(f"Exchange error: {e}", exc_info=True)
+                reports[i] = self._reject(orders[i], "EXCHANGE_ERROR")
+        logger.info("Bulk order batch: %d orders, %d filled", len(orders),
+                    sum(1 for report in reports if report.status == "FILLED"))
+        return reports
+
+    def execute(self, order: Order) -> Fill:
+        """Match an order immediately (no simulated latency)."""
+        # Simulate fill probability
+        if random.random() < self.fill_rate:
+            # Simulate partial fills occasionally
+            fill_quantity = order.quantity
+            if random.random() < self.partial_fill_rate:
+                fill_quantity = random.randint(1, order.quantity)
+
+            # Add some slippage
+            slippage = random.uniform(*self.slippage)
+            fill_price = order.price + slippage
+
+            fill = Fill(
+                order_id=order.order_id,
+                symbol=order.symbol,
+                side=order.side,
+                quantity=fill_quantity,
+                price=round(fill_price, 2),
+                timestamp=get_timestamp(),
+                fill_id=str(uuid.uuid4()),
+                strategy=order.strategy,
+                account=order.account,
+            )
+
+            EXECUTIONS.labels(order.symbol, "FILLED").inc()
+            logger.info(
+                "FILLED: %s %s @ %s (slippage: %.4f)",
+                fill.quantity, fill.symbol, fill.price, slippage
+            )
+            return fill
+
+        # Rejection
+        rejection = self._reject(order, "MARKET_REJECT")
+        logger.info("REJECTED: %s - %s", order.order_id, rejection.reason)
+        return rejection
@@ -16,7 +16,7 @@
 #     socketio.run(app, host="0.0.0.0", port=5000)
 
 import asyncio
-from analytics.dashboard import socketio, app
+import threading
 from main_trading_system import TradingSystem
 
 async def trading_system_main():
@@ -42,8 +42,11 @@ def start_trading_system():
 if __name__ == "__main__":
     print("Starting Trading System + Dashboard...")
 
-    # ✅ Start trading system coroutine in its own event loop thread
-    socketio.start_background_task(start_trading_system)
+    # ✅ Start trading system coroutine in its own event loop thread first, so
+    # time-to-first-tick does not wait for Flask/SocketIO to import
+    threading.Thread(target=start_trading_system, name="trading-system", daemon=True).start()
+
+    from analytics.dashboard import socketio, app
 
     # Run Flask + SocketIO server
     socketio.run(app, host="0.0.0.0", port=5000, debug=True)
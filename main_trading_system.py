@@ -1,30 +1,101 @@
 import asyncio
+import functools
+import json
+import signal
+import sys
+import threading
 import time
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, List, Optional
 
 from market_data.feed_handler import FeedHandler
 from tickerplant.orderbook import OrderBook
 from strategy.strategy_engine import StrategyEngine
+from strategy.indicators import IndicatorEngine
+from strategy.registry import StrategyRegistry
 from risk.risk_engine import RiskEngine
+from risk.analytics import RiskAnalytics
+from risk.shared_limits import SharedFirmRisk
 from oms.oms import OrderManagementService
+from oms.order_store import CANCELED, PARTIAL
+from market_data.schemas import Fill, Order
 from exchange_sim.exchange import ExchangeSimulator
 from analytics.pnl import PnLCalculator
-from analytics.dashboard import broadcast_update
+from common.config import (
+    ADAPTIVE_SPREAD_THRESHOLDS,
+    FAST_STARTUP,
+    FEED_LINE_PORTS,
+    VAR_RECOMPUTE_INTERVAL,
+    JOURNAL_ENABLED,
+    JOURNAL_DIR,
+    JOURNAL_FSYNC,
+    JOURNAL_SEGMENT_BYTES,
+    JOURNAL_SNAPSHOT_INTERVAL,
+    JOURNAL_SNAPSHOTS_KEPT,
+    LOOP_MONITOR_ENABLED,
+    MEMORY_MONITOR_ENABLED,
+    METRICS_ENABLED,
+    METRICS_HOST,
+    METRICS_PORT,
+    PROFILE_RATE_HZ,
+    PROFILE_SECONDS,
+    PROFILE_SIGNAL,
+    SESSION_CHECK_INTERVAL,
+)
+from common.journal import EventJournal
+from common.latency import LatencyTracer, now_ns
+from common.loop_monitor import LoopMonitor
+from common.memory import RSS, MemoryMonitor
+from common.metrics import REGISTRY, Family, add_route, histogram_family, start_http_server
+from common.profiler import SamplingProfiler
+from common.storage import rollover, session_date, vacuum
 from common.utils import setup_logger
 
 logger = setup_logger(__name__)
 
+
+def _dashboard():
+    """analytics.dashboard once something has loaded it (main.py, to serve it), else None.
+
+    The engine does not import Flask/SocketIO itself under FAST_STARTUP:
+    dashboard updates are only produced when a dashboard exists to show them.
+    """
+    dashboard = sys.modules.get("analytics.dashboard")
+    # Still importing (main.py imports it while the engine thread is starting)
+    if dashboard is None or not hasattr(dashboard, "broadcast_update"):
+        return None
+    return dashboard
+
+
 class TradingSystem:
-    def __init__(self):
+    def __init__(self, symbols: Optional[Iterable[str]] = None, firm_risk: Optional[SharedFirmRisk] = None,
+                 metrics_port: int = METRICS_PORT):
+        """``symbols`` restricts the feed subscription (one shard of the universe);
+        ``firm_risk`` enforces the firm notional limit across shards.
+        """
+        self.symbols = list(symbols) if symbols is not None else None
+        self.metrics_port = metrics_port
+        self.metrics_server = None
         self.orderbook = OrderBook()
-        self.strategy = StrategyEngine()
-        self.risk = RiskEngine()
-        self.oms = OrderManagementService()
+        self.strategy = StrategyEngine(
+            spread_quantiles=self.orderbook.spread_quantiles if ADAPTIVE_SPREAD_THRESHOLDS else None
+        )
+        self.indicators = IndicatorEngine()
+        self.strategies = StrategyRegistry(self.indicators)
+        self.strategies.register(self.strategy)
+        self.risk = RiskEngine(firm_risk=firm_risk)
+        self.risk_analytics = RiskAnalytics()
+        self.journal = EventJournal(
+            JOURNAL_DIR,
+            fsync=JOURNAL_FSYNC,
+            segment_bytes=JOURNAL_SEGMENT_BYTES,
+            snapshots_kept=JOURNAL_SNAPSHOTS_KEPT,
+        ) if JOURNAL_ENABLED else None
+        self.oms = OrderManagementService(journal=self.journal)
         self.exchange = ExchangeSimulator()
         self.pnl_calc = PnLCalculator()
         
         # Setup feed handler with callback
-        self.feed_handler = FeedHandler(self.on_tick)
+        self.feed_handler = FeedHandler(self.on_tick, symbols=self.symbols, ports=FEED_LINE_PORTS)
         
         # Stats
         self.stats = {
@@ -33,41 +104,136 @@ class TradingSystem:
             "orders_sent": 0,
             "fills_received": 0
         }
+        # Per-stage and tick-to-trade latency histograms
+        self.tracer = LatencyTracer()
+
+        # Symbols filled since the last dashboard broadcast
+        self._filled_symbols = set()
+
+        # Engine state exported at scrape time (nothing recorded on the hot path)
+        REGISTRY.register_collector("trading_system", self.collect_metrics)
+        REGISTRY.register_collector("feed_lines", lambda: self.feed_handler.collect_metrics())
+
+        # Event loop lag and stalls (SQLite, logging and anything else run inline)
+        self.loop_monitor = LoopMonitor()
+        self.loop_monitor.watch_queue("oms_pending_writes", lambda: len(self.oms._pending))
+        self.loop_monitor.watch_queue("feed_backlog", self._feed_backlog)
+        REGISTRY.register_collector("event_loop", self.loop_monitor.collect_metrics)
+
+        # On-demand stack sampling: PROFILE_SIGNAL or GET /profile?seconds=&rate= on the metrics port
+        self.profiler = SamplingProfiler()
+        add_route("/profile", self.profile_request)
+
+        # Sizes of the structures that grow with orders and symbols
+        self.memory = MemoryMonitor()
+        self.memory.register("risk.orders", lambda: self.risk.orders)
+        self.memory.register("risk.positions", lambda: self.risk.positions)
+        self.memory.register("oms.orders", lambda: self.oms.orders)
+        self.memory.register("oms.pending", lambda: self.oms._pending)
+        self.memory.register("orderbook.books", lambda: self.orderbook.books)
+        self.memory.register("indicators.states", lambda: self.indicators.states)
+        self.memory.register("dashboard.latest_prices", lambda: getattr(_dashboard(), "latest_prices", {}))
+        REGISTRY.register_collector("memory", self.memory.collect_metrics)
+        add_route("/memory", self.memory_request)
+        add_route("/memory/snapshot", self.memory_snapshot_request)
+
+        if self.journal is not None:
+            self.recover()
+
+        # Archive sessions that closed while the system was down
+        self._vacuum_pending = False  # a live rollover leaves VACUUM to shutdown
+        self.session = session_date()
+        self.roll_sessions()
+
+        # Positions and PnL in memory from here on; FAST_STARTUP starts from the snapshot
+        self.pnl_calc.warm(use_snapshot=FAST_STARTUP)
+        if not FAST_STARTUP:
+            import analytics.dashboard  # noqa: F401  (eager: Flask/SocketIO at startup)
+
+    def roll_sessions(self):
+        """Move closed sessions out of the live database into the archive (startup, before trading)."""
+        self.oms.flush()
+        self._rolled_over(rollover(on_close=self.pnl_calc.close_partition))
+
+    def _rolled_over(self, closed: List[str]):
+        self.session = session_date()
+        if closed:
+            logger.info(f"Session rollover archived {len(closed)} session(s): {', '.join(closed)}")
+            if self.pnl_calc.warmed:
+                # The carry table changed; the old snapshot no longer matches it
+                self.pnl_calc.write_snapshot()
+
+    def snapshot_state(self) -> Dict[str, Any]:
+        """Everything needed to restart without replaying the whole journal."""
+        return {"risk": self.risk.snapshot_state(), "oms": self.oms.snapshot_state()}
+
+    def recover(self):
+        """Rebuild OMS and risk state from the latest snapshot plus the journal tail.
+
+        PnL is computed from the fills table, which replay back-fills with any
+        journaled fill the database missed. Orders that were live at shutdown
+        are cancelled, since the exchange session they were sent to is gone.
+        """
+        start = time.perf_counter()
+        seq, state = self.journal.load_snapshot()
+        if state is not None:
+            self.risk.restore_state(state["risk"])
+            self.oms.restore_state(state["oms"])
+
+        events = list(self.journal.replay(seq))
+        counts = self.oms.replay(events)
+        self.risk.replay(events)
+        canceled = self.oms.cancel_open_orders("RECOVERY")
+
+        if state is None and not events:
+            return
+        self.journal.write_snapshot(self.snapshot_state())
+        logger.info(
+            f"Recovered from snapshot seq {seq} + {len(events)} journal events "
+            f"({counts['orders']} orders, {counts['fills']} fills, {canceled} open orders cancelled) "
+            f"in {time.perf_counter() - start:.2f}s"
+        )
 
     async def on_tick(self, tick):
         """Process incoming market tick."""
         try:
-            logger.info(f"Received tick: {tick}")
+            # Scalars only, so the async handler can still render it off the loop
+            logger.info("Received tick: %s seq=%d bid=%s ask=%s", tick.symbol, tick.seq, tick.bid, tick.ask)
+            tracer = self.tracer
+            t = now_ns()
+            if tick.recv_ns:
+                tracer.record("feed", t - tick.recv_ns)
+            else:
+                # Not stamped by the feed handler; trace from here
+                tick.recv_ns = t
 
             # Update order book
             book = self.orderbook.update(tick)
             self.stats["ticks_processed"] += 1
-            logger.debug(f"Updated order book for {tick.symbol}: {book}")
+            t = tracer.lap("book", t)
+            logger.debug("Updated order book for %s: %s", tick.symbol, book)
 
-            # Get current positions (symbol -> net quantity)
-            try:
-                current_positions = {
-                    symbol: pos["net_qty"]
-                    for symbol, pos in self.pnl_calc.get_positions_summary().items()
-                }
-            except Exception as e:
-                logger.error(f"Error fetching current positions: {e}")
-                current_positions = {}
+            # Current positions (symbol -> net quantity), kept in memory by the PnL state
+            current_positions = self.pnl_calc.net_quantities
+            t = tracer.lap("positions", t)
 
-            logger.debug(f"Current positions: {current_positions}")
+            logger.debug("Current positions: %s", current_positions)
 
-            # Generate trading signal with current positions
-            try:
-                signal = self.strategy.generate_signal(book, current_positions)
-            except Exception as e:
-                logger.error(f"Error generating signal: {e}")
-                signal = None
+            # Run every strategy subscribed to this symbol (indicators are
+            # updated once inside the registry before dispatch)
+            signals = self.strategies.on_book(book, current_positions)
+            tracer.lap("strategy", t)
+            for signal in signals:
+                signal.tick_ns = tick.recv_ns
 
-            logger.debug(f"Generated signal: {signal}")
+            logger.debug("Generated signals: %s", signals)
 
-            if signal:
-                self.stats["signals_generated"] += 1
-                await self.process_signal(signal)
+            self.stats["signals_generated"] += len(signals)
+            if len(signals) > 1:
+                # Several orders on one tick go out as a single bulk entry
+                await self.process_signals(signals)
+            elif signals:
+                await self.process_signal(signals[0])
 
         except Exception as e:
             import traceback
@@ -76,110 +242,403 @@ class TradingSystem:
 
 
 
-    async def process_signal(self, order: Dict[str, Any]):
-        """Process a trading signal through the pipeline."""
+    async def process_signal(self, order: Order):
+        """Process a trading signal through the pipeline.
+
+        The same Order record is updated in place by risk, OMS and exchange.
+        """
         try:
-            # Risk check
-            risk_result = self.risk.check_order(order)
-            
-            if risk_result["status"] == "REJECTED":
-                logger.warning(f"Order rejected by risk: {risk_result['reason']}")
-                self.oms.update_order_status(
-                    risk_result.get("order_id", "UNKNOWN"),
-                    "REJECTED",
-                    risk_result["reason"]
-                )
+            if not self._pre_trade(order):
                 return
             
-            # Submit to OMS
-            self.oms.submit_order({**order, "order_id": risk_result["order_id"], "status": risk_result["status"]})
-            self.stats["orders_sent"] += 1
-            
             # Send to exchange
-            fill_result = await self.exchange.process_order({**order, "order_id": risk_result["order_id"]})
+            sent = self._trace_sent((order,))
+            fill = await self.exchange.process_order(order)
+            self.tracer.lap("exchange", sent)
 
-            if "status" in fill_result and fill_result["status"] == "FILLED":
-                # Update risk positions
-                self.risk.apply_fill(fill_result)
-                
-                # Record fill in OMS
-                self.oms.record_fill(fill_result)
-                self.oms.update_order_status(fill_result["order_id"], "FILLED")
-                
-                self.stats["fills_received"] += 1
-                
-                logger.info(
-                    f"Order filled: {fill_result['quantity']} {fill_result['symbol']} "
-                    f"@ ${fill_result['price']}"
-                )
-                # Emit WebSocket events for dashboard
-                # Market update
-                book = self.orderbook.books.get(fill_result["symbol"], {})
-                broadcast_update('market_update', {fill_result["symbol"]: book})
-                # Order update
-                recent_orders = self.oms.get_orders(limit=20)
-                broadcast_update('order_update', recent_orders)
-                # Positions update
-                positions = self.risk.get_positions()
-                broadcast_update('positions_update', positions)
-            else:
-                self.oms.update_order_status(
-                    fill_result.get("order_id", "UNKNOWN"),
-                    "REJECTED",
-                    fill_result.get("reason", "EXCHANGE_REJECT")
-                )
+            if self._handle_execution(order, fill):
+                self._broadcast_fills()
                 
         except Exception as e:
             import traceback
             logger.error(f"Error processing signal: {e}")
             logger.error(f"Order: {order}")
-            logger.error(f"Risk result: {risk_result if 'risk_result' in locals() else 'N/A'}")
-            logger.error(f"Fill result: {fill_result if 'fill_result' in locals() else 'N/A'}")
+            logger.error(f"Fill: {fill if 'fill' in locals() else 'N/A'}")
+            logger.error(traceback.format_exc())
+
+    async def process_signals(self, orders: List[Order]):
+        """Process several signals with one bulk exchange round trip.
+
+        Risk and OMS still see each order individually and in order; only the
+        exchange submission is batched. Dashboard updates go out once per batch.
+        """
+        try:
+            approved = [order for order in orders if self._pre_trade(order)]
+            if not approved:
+                return
+
+            sent = self._trace_sent(approved)
+            fills = await self.exchange.process_orders(approved)
+            self.tracer.lap("exchange", sent)
+
+            filled = False
+            for order, fill in zip(approved, fills):
+                filled |= self._handle_execution(order, fill)
+            if filled:
+                self._broadcast_fills()
+
+        except Exception as e:
+            import traceback
+            logger.error(f"Error processing signal batch: {e}")
             logger.error(traceback.format_exc())
 
+    def _pre_trade(self, order: Order) -> bool:
+        """Risk-check an order and submit it to the OMS; False if rejected."""
+        # Risk check
+        t = now_ns()
+        self.risk.check_order(order)
+        t = self.tracer.lap("risk", t)
+
+        if order.status == "REJECTED":
+            logger.warning(f"Order rejected by risk: {order.reason}")
+            return False
+
+        # Submit to OMS
+        self.oms.submit_order(order)
+        self.tracer.lap("oms", t)
+        self.stats["orders_sent"] += 1
+        return True
+
+    def _trace_sent(self, orders) -> int:
+        """Record tick-to-trade for orders about to go to the exchange; returns the send time."""
+        sent = now_ns()
+        for order in orders:
+            if order.tick_ns:
+                self.tracer.record("tick_to_trade", sent - order.tick_ns)
+        return sent
+
+    def _handle_execution(self, order: Order, fill: Fill) -> bool:
+        """Apply one exchange execution report; True if the order filled."""
+        start = now_ns()
+        filled = self._apply_execution(order, fill)
+        done = self.tracer.lap("execution", start)
+        if order.tick_ns:
+            self.tracer.record("tick_to_fill", done - order.tick_ns)
+        return filled
+
+    def _apply_execution(self, order: Order, fill: Fill) -> bool:
+        if fill.status == "FILLED":
+            # Update risk positions
+            self.risk.apply_fill(fill)
+
+            # Record fill in OMS, then fold it into positions/PnL
+            status = self.oms.record_fill(fill)
+            self.pnl_calc.apply_fill(fill)
+            if status == PARTIAL:
+                # One execution report per order: the remainder will never fill
+                self.oms.update_order_status(fill.order_id, CANCELED, "UNFILLED_REMAINDER")
+
+            self.stats["fills_received"] += 1
+
+            logger.info(
+                f"Order filled: {fill.quantity} {fill.symbol} "
+                f"@ ${fill.price}"
+            )
+            self._filled_symbols.add(fill.symbol)
+            return True
+
+        self.risk.release_order(order.order_id)
+        self.oms.update_order_status(
+            order.order_id,
+            "REJECTED",
+            fill.reason or "EXCHANGE_REJECT"
+        )
+        return False
+
+    def _broadcast_fills(self):
+        """Emit WebSocket events for the dashboard after one or more fills."""
+        symbols, self._filled_symbols = self._filled_symbols, set()
+        dashboard = _dashboard()
+        if dashboard is None:
+            return
+        broadcast_update = dashboard.broadcast_update
+        # Market update
+        broadcast_update('market_update', {
+            symbol: self.orderbook.books.get(symbol, {}) for symbol in symbols
+        })
+        # Order update
+        recent_orders = self.oms.get_orders(limit=20)
+        broadcast_update('order_update', recent_orders)
+        # Positions update
+        positions = self.risk.get_positions()
+        broadcast_update('positions_update', positions)
+
+    def collect_metrics(self) -> List[Family]:
+        """Metrics collector: books, positions, order store and strategy stats."""
+        books = list(self.orderbook.books.items())
+        positions = list(self.risk.positions.items())
+        strategy_stats = self.strategies.get_stats()
+        store = self.oms.orders.stats()
+        families = [
+            Family("trading_ticks_processed_total", "counter", "Ticks processed by on_tick", (),
+                   [((), self.stats["ticks_processed"])]),
+            Family("trading_signals_total", "counter", "Signals generated", (),
+                   [((), self.stats["signals_generated"])]),
+            Family("orderbook_spread", "gauge", "Current bid/ask spread", ("symbol",),
+                   [((symbol,), book["spread"]) for symbol, book in books]),
+            Family("orderbook_mid", "gauge", "Current mid price", ("symbol",),
+                   [((symbol,), book["mid"]) for symbol, book in books]),
+            Family("strategy_calls_total", "counter", "Strategy invocations", ("strategy",),
+                   [((name,), s["calls"]) for name, s in strategy_stats.items()]),
+            Family("strategy_signals_total", "counter", "Signals emitted", ("strategy",),
+                   [((name,), s["signals"]) for name, s in strategy_stats.items()]),
+            Family("strategy_errors_total", "counter", "Strategy exceptions", ("strategy",),
+                   [((name,), s["errors"]) for name, s in strategy_stats.items()]),
+            Family("strategy_latency_avg_seconds", "gauge", "Mean strategy call time", ("strategy",),
+                   [((name,), s["avg_us"] / 1e6) for name, s in strategy_stats.items()]),
+            Family("risk_position_quantity", "gauge", "Net filled position", ("symbol",),
+                   [((symbol,), pos["quantity"]) for symbol, pos in positions]),
+            Family("risk_gross_notional", "gauge", "Gross filled notional", (), [((), self.risk.gross_notional)]),
+            Family("risk_net_notional", "gauge", "Net filled notional", (), [((), self.risk.net_notional)]),
+            Family("risk_open_orders", "gauge", "Orders holding a risk reservation", (),
+                   [((), len(self.risk.orders))]),
+            Family("oms_orders", "gauge", "Orders in the OMS store by status", ("status",),
+                   [((key[len("status_"):],), value) for key, value in store.items() if key.startswith("status_")]),
+            Family("oms_pending_writes", "gauge", "Order states not yet written to the DB", (),
+                   [((), len(self.oms._pending))]),
+            histogram_family("risk_check_seconds", "check_order latency", (), {(): self.risk.check_latency}),
+            histogram_family("trading_stage_seconds", "Tick-to-trade pipeline stage latency", ("stage",),
+                             {(stage,): hist for stage, hist in self.tracer.histograms.items()}),
+        ]
+        if self.risk.firm_risk is not None:
+            totals = self.risk.firm_risk.totals()
+            families.append(Family("risk_firm_utilization", "gauge", "Firm notional used across shards", (),
+                                   [((), totals["utilization"])]))
+        return families
+
+    def profile_request(self, params: Dict[str, str]) -> str:
+        """Admin endpoint: profile the loop thread and return collapsed stacks."""
+        seconds = float(params.get("seconds", PROFILE_SECONDS))
+        rate = float(params.get("rate", PROFILE_RATE_HZ))
+        if not 0 < seconds <= 600 or not 0 < rate <= 10000:
+            raise ValueError("seconds must be in (0, 600] and rate in (0, 10000]")
+        return self.profiler.profile(seconds, rate)
+
+    def memory_request(self, params: Dict[str, str]) -> str:
+        """Admin endpoint: the monitor's last sample.
+
+        Sampling walks structures the loop is mutating and extends the growth
+        history, so it only ever runs on the loop, on the monitor's schedule.
+        """
+        if not self.memory.latest:
+            return "no memory sample yet (MemoryMonitor.run samples on start)\n"
+        return json.dumps(self.memory.latest, indent=2)
+
+    def memory_snapshot_request(self, params: Dict[str, str]) -> str:
+        """Admin endpoint: tracemalloc growth since the previous call (?stop=1 ends tracing)."""
+        if params.get("stop"):
+            self.memory.stop_tracing()
+            return "tracemalloc stopped\n"
+        growth = self.memory.snapshot(int(params.get("top", 10)))
+        if not growth:
+            return "tracemalloc baseline taken; request again to see growth\n"
+        return json.dumps(growth, indent=2)
+
+    def _install_profile_signal(self):
+        signum = getattr(signal, PROFILE_SIGNAL, None)
+        # Signal handlers can only be installed from the main thread (not main.py's loop thread)
+        if signum is None or threading.current_thread() is not threading.main_thread():
+            return
+        try:
+            asyncio.get_running_loop().add_signal_handler(signum, self.profiler.start)
+            logger.info(f"Send {PROFILE_SIGNAL} to profile for {PROFILE_SECONDS:.0f}s")
+        except (NotImplementedError, RuntimeError) as e:
+            logger.warning(f"Profile signal not installed: {e}")
+
+    def _feed_backlog(self) -> int:
+        """Messages received by the feed line(s) but not yet handled."""
+        return self.feed_handler.backlog()
+
+    def get_latency(self) -> Dict[str, Dict[str, float]]:
+        """Per-stage and end-to-end latency percentiles (microseconds) so far."""
+        return self.tracer.summary()
+
     async def print_stats(self):
         """Print system statistics periodically."""
         while True:
             await asyncio.sleep(30)  # Every 30 seconds
+
+            # Age-based eviction otherwise only runs when another order turns terminal
+            self.oms.orders.evict()
             
             logger.info("=== SYSTEM STATS ===")
             logger.info(f"Ticks processed: {self.stats['ticks_processed']}")
             logger.info(f"Signals generated: {self.stats['signals_generated']}")
             logger.info(f"Orders sent: {self.stats['orders_sent']}")
             logger.info(f"Fills received: {self.stats['fills_received']}")
+            for name, strategy_stats in self.strategies.get_stats().items():
+                logger.info(
+                    f"Strategy {name}: calls={strategy_stats['calls']} signals={strategy_stats['signals']} "
+                    f"errors={strategy_stats['errors']} avg={strategy_stats['avg_us']:.1f}us "
+                    f"max={strategy_stats['max_us']:.1f}us"
+                )
             
+            latency = self.risk.get_check_latency()
+            if latency["count"]:
+                logger.info(
+                    f"Risk check latency: p50={latency['p50']:.1f}us p99={latency['p99']:.1f}us "
+                    f"p99.9={latency['p99.9']:.1f}us max={latency['max']:.1f}us"
+                )
+
+            stage_latency = self.get_latency()
+            dashboard = _dashboard()
+            if dashboard is not None:
+                dashboard.update_latency_metrics(stage_latency)
+            for stage, summary in stage_latency.items():
+                logger.info(
+                    f"Latency {stage}: n={summary['count']} p50={summary['p50']:.1f}us "
+                    f"p99={summary['p99']:.1f}us p99.9={summary['p99.9']:.1f}us max={summary['max']:.1f}us"
+                )
+
+            if len(self.feed_handler.lines) > 1:
+                for name, line in self.feed_handler.get_line_stats().items():
+                    advantage = line["advantage_us"]
+                    logger.info(
+                        f"Feed line {name} (port {line['port']}, {'up' if line['connected'] else 'down'}): "
+                        f"received={line['received']} won={line['won']} ({line['win_rate']:.0%}) "
+                        f"dup={line['duplicates']} stale={line['stale']} sole={line['sole']} "
+                        f"lead p50={advantage['p50']:.0f}us p99={advantage['p99']:.0f}us"
+                    )
+
+            loop_health = self.loop_monitor.summary()
+            lag = loop_health["lag"]
+            if lag["count"]:
+                logger.info(
+                    f"Event loop lag: p50={lag['p50']:.0f}us p99={lag['p99']:.0f}us max={lag['max']:.0f}us "
+                    f"stalls={loop_health['stalls']} depths={loop_health['depths']}"
+                )
+            for site in loop_health["top_sites"][:3]:
+                logger.info(
+                    f"Loop stall site {site['where']} ({site['task']}): n={site['count']} "
+                    f"total={site['total_ms']:.0f}ms max={site['max_ms']:.0f}ms"
+                )
+
+            memory = self.memory.latest
+            if memory:
+                logger.info("Memory: " + ", ".join(
+                    f"{name}={values['entries']}/{values['bytes'] / 2**20:.1f}MB" if name != RSS
+                    else f"rss={values['bytes'] / 2**20:.0f}MB"
+                    for name, values in memory.items()
+                ))
+
             # Show positions
             positions = self.risk.get_positions()
             if positions:
                 logger.info(f"Current positions: {positions}")
             
             # Show PnL
-            pnl = self.pnl_calc.calculate_realized_pnl()
+            pnl = self.pnl_calc.realized_pnl()
             if pnl:
                 total_pnl = sum(pnl.values())
                 logger.info(f"Total realized PnL: ${total_pnl:.2f}")
 
+    async def run_risk_analytics(self):
+        """Sample mid returns and periodically recompute VaR and stress PnL."""
+        last_compute = 0.0
+        while True:
+            await asyncio.sleep(self.risk_analytics.sample_interval)
+            try:
+                self.risk_analytics.sample(self.orderbook.books)
+                now = time.monotonic()
+                if now - last_compute >= VAR_RECOMPUTE_INTERVAL:
+                    last_compute = now
+                    metrics = self.risk_analytics.compute(self.risk.positions)
+                    dashboard = _dashboard()
+                    if dashboard is not None:
+                        dashboard.update_risk_metrics(metrics)
+                        dashboard.broadcast_update('risk_update', metrics)
+            except Exception as e:
+                logger.error(f"Error computing risk analytics: {e}")
+
+    async def run_session_rollover(self):
+        """Roll over to a new session partition when the date changes."""
+        while True:
+            await asyncio.sleep(SESSION_CHECK_INTERVAL)
+            if session_date() == self.session:
+                continue
+            try:
+                # Archiving only touches SQLite and the archive files, so it runs off
+                # the loop; VACUUM rewrites the whole database and waits for shutdown
+                self.oms.flush()
+                closed = await asyncio.get_running_loop().run_in_executor(
+                    None, functools.partial(rollover, on_close=self.pnl_calc.close_partition, vacuum=False)
+                )
+                self._rolled_over(closed)
+                self._vacuum_pending = self._vacuum_pending or bool(closed)
+            except Exception as e:
+                logger.error(f"Error rolling over session: {e}")
+
+    async def run_journal_snapshots(self):
+        """Snapshot state periodically so recovery only replays a short tail."""
+        last_seq = self.journal.seq
+        while True:
+            await asyncio.sleep(JOURNAL_SNAPSHOT_INTERVAL)
+            if self.journal.seq == last_seq:
+                continue
+            try:
+                self.journal.write_snapshot(self.snapshot_state())
+                self.pnl_calc.write_snapshot()
+                last_seq = self.journal.seq
+            except Exception as e:
+                logger.error(f"Error writing journal snapshot: {e}")
+
     async def run(self):
         """Run the trading system."""
         logger.info("🚀 Starting Trading System...")
         
         try:
+            self.profiler.attach()
+            self._install_profile_signal()
+            if METRICS_ENABLED:
+                self.metrics_server = start_http_server(self.metrics_port, METRICS_HOST)
+
             # Start feed connection
             await self.feed_handler.connect()
             logger.info("✅ Connected to market data feed")
             
             # Run feed listener and stats printer concurrently
-            await asyncio.gather(
+            tasks = [
                 self.feed_handler.listen(),
-                self.print_stats()
-            )
+                self.print_stats(),
+                self.run_risk_analytics(),
+                self.run_session_rollover(),
+            ]
+            if self.journal is not None:
+                tasks.append(self.run_journal_snapshots())
+            if LOOP_MONITOR_ENABLED:
+                tasks.append(self.loop_monitor.run())
+            if MEMORY_MONITOR_ENABLED:
+                tasks.append(self.memory.run())
+            await asyncio.gather(*tasks)
             
         except KeyboardInterrupt:
             logger.info("Shutting down trading system...")
         except Exception as e:
             logger.error(f"System error: {e}")
         finally:
+            self.loop_monitor.stop()
             await self.feed_handler.disconnect()
+            if self.metrics_server is not None:
+                self.metrics_server.shutdown()
+            self.oms.flush()
+            self.pnl_calc.write_snapshot()
+            if self.journal is not None:
+                self.journal.close()
+            if self._vacuum_pending:
+                try:
+                    vacuum()
+                except Exception as e:
+                    logger.error(f"Error vacuuming database: {e}")
 
 async def main():
     system = TradingSystem()
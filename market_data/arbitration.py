@@ -0,0 +1,154 @@
+"""A/B line arbitration - take each tick from whichever feed line delivers it first.
+
+The feed numbers every tick with one global ``seq``. Each line's reader calls
+SequenceArbiter.accept(); a tick is delivered only if its seq is newer than
+the last one delivered for its symbol, so the copy arriving on the slower
+line is dropped. A tick older than what the book already has (e.g. one
+line recovering a backlog) is dropped too, since ticks are top-of-book
+snapshots and delivering it would move the book backwards.
+
+Per line the arbiter counts messages, wins, duplicates and stale ticks,
+plus ticks it was the only line to deliver (a gap on every other line).
+It also keeps a histogram of how far ahead the line was when it won.
+
+The feed's seq starts again at 1 when the feed restarts, so the sequence
+state is reset (a new session) when:
+- a line's own seq goes backwards, since a line delivers in order within
+  a session. A lagging line is never mistaken for a restart.
+- a line reconnects while every other line is down.
+After a reset, a line still delivering the old session is treated as stale
+until it also restarts.
+"""
+
+from collections import OrderedDict
+from typing import Dict, List, Sequence, Tuple
+from common.config import FEED_ARBITRATION_WINDOW
+from common.histogram import LatencyHistogram
+from common.metrics import Family, histogram_family
+from common.utils import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class LineStats:
+    __slots__ = ("name", "received", "won", "duplicates", "stale", "sole", "advantage", "last_seq", "session")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.received = 0
+        self.won = 0          # ticks delivered from this line (it was first)
+        self.duplicates = 0   # copies of ticks another line had already delivered
+        self.stale = 0        # older than the symbol's last delivered tick, not a pending copy
+        self.sole = 0         # won, and no other line delivered it within the window
+        self.advantage = LatencyHistogram()  # ns this line was ahead of each slower copy
+        self.last_seq = 0     # last seq seen on this line (any symbol)
+        self.session = 0      # arbiter session this line's ticks belong to
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "received": self.received,
+            "won": self.won,
+            "win_rate": self.won / self.received if self.received else 0.0,
+            "duplicates": self.duplicates,
+            "stale": self.stale,
+            "sole": self.sole,
+            "advantage_us": self.advantage.summary(),
+        }
+
+
+class SequenceArbiter:
+    def __init__(self, lines: Sequence[str], window: int = FEED_ARBITRATION_WINDOW):
+        """``window`` bounds how many recent wins are kept to match against slower copies."""
+        self.lines: Dict[str, LineStats] = {name: LineStats(name) for name in lines}
+        self.window = window
+        self.session = 0
+        self.resets = 0
+        self.last_seq: Dict[str, int] = {}  # symbol -> seq of the last tick delivered
+        # seq -> (winning line, its receive time, lines that have delivered it)
+        self._pending: "OrderedDict[int, Tuple[LineStats, int, int]]" = OrderedDict()
+
+    def accept(self, line: LineStats, symbol: str, seq: int, recv_ns: int) -> bool:
+        """True if this copy of the tick should be delivered."""
+        line.received += 1
+        if not seq:
+            # Unsequenced feed: nothing to arbitrate on
+            line.won += 1
+            return True
+        if seq < line.last_seq:
+            self._restarted(line, seq)
+        line.last_seq = seq
+        if line.session != self.session:
+            # Still delivering the session another line has already seen restart
+            line.stale += 1
+            return False
+        if seq > self.last_seq.get(symbol, 0):
+            self.last_seq[symbol] = seq
+            line.won += 1
+            pending = self._pending
+            pending[seq] = (line, recv_ns, 1)
+            if len(pending) > self.window:
+                _, (winner, _, seen) = pending.popitem(last=False)
+                if seen < len(self.lines):
+                    winner.sole += 1
+            return True
+
+        entry = self._pending.get(seq)
+        if entry is None:
+            line.stale += 1
+            return False
+        winner, first_ns, seen = entry
+        winner.advantage.record(recv_ns - first_ns)
+        line.duplicates += 1
+        seen += 1
+        if seen >= len(self.lines):
+            del self._pending[seq]
+        else:
+            self._pending[seq] = (winner, first_ns, seen)
+        return False
+
+    def _restarted(self, line: LineStats, seq: int):
+        if line.session == self.session:
+            logger.warning(
+                f"Feed line {line.name} sequence went back from {line.last_seq} to {seq}: "
+                f"feed restarted, starting a new sequence session"
+            )
+            self.reset()
+        line.session = self.session
+
+    def line_connected(self, line: LineStats, only: bool):
+        """A line (re)connected. ``only``: no other line is up, so the feed may have restarted."""
+        if only and self.last_seq:
+            logger.warning(f"Feed line {line.name} reconnected with every line down: starting a new sequence session")
+            self.reset()
+        line.last_seq = 0
+        line.session = self.session
+
+    def reset(self):
+        """Forget all sequence state: the next tick of every symbol is delivered."""
+        self.session += 1
+        self.resets += 1
+        self.last_seq.clear()
+        self._pending.clear()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {name: line.to_dict() for name, line in self.lines.items()}
+
+    def collect_metrics(self) -> List[Family]:
+        """Metrics collector for common.metrics.REGISTRY."""
+        lines = list(self.lines.values())
+        return [
+            Family("feed_line_messages_total", "counter", "Messages received per feed line", ("line",),
+                   [((line.name,), line.received) for line in lines]),
+            Family("feed_line_wins_total", "counter", "Ticks delivered first by this line", ("line",),
+                   [((line.name,), line.won) for line in lines]),
+            Family("feed_line_duplicates_total", "counter", "Ticks already delivered by another line",
+                   ("line",), [((line.name,), line.duplicates) for line in lines]),
+            Family("feed_line_stale_total", "counter", "Ticks older than the book's last update", ("line",),
+                   [((line.name,), line.stale) for line in lines]),
+            Family("feed_line_sole_total", "counter", "Ticks no other line delivered", ("line",),
+                   [((line.name,), line.sole) for line in lines]),
+            Family("feed_arbitration_resets_total", "counter", "Sequence sessions restarted (feed restarts)",
+                   (), [((), self.resets)]),
+            histogram_family("feed_line_advantage_seconds", "Lead over the slower copy when this line won",
+                             ("line",), {(line.name,): line.advantage for line in lines}),
+        ]
@@ -1,18 +1,57 @@
-"""Market data feed generator - simulates real market data."""
+"""Market data feed generator - simulates real market data.
+
+The feed can serve several redundant lines (one port each) carrying the same
+ticks with the same sequence numbers. For exercising A/B arbitration a line
+can be impaired - delivered late, with jitter, or lossy - or stalled outright.
+"""
 
 import asyncio
+import functools
 import json
 import random
 import websockets
-from common.config import SYMBOLS, TICK_INTERVAL, MARKET_DATA_WS_PORT
+from collections import deque
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+from common.config import FEED_LINE_IMPAIRMENTS, FEED_LINE_PORTS, SYMBOLS, TICK_INTERVAL, MARKET_DATA_WS_PORT
 from common.utils import setup_logger, get_timestamp
 
 logger = setup_logger(__name__)
 
 class MarketDataFeed:
-    def __init__(self):
-        self.prices = {symbol: random.uniform(100, 300) for symbol in SYMBOLS}
+    def __init__(
+        self,
+        symbols: Optional[List[str]] = None,
+        rate: float = 1.0 / TICK_INTERVAL,
+        port: int = MARKET_DATA_WS_PORT,
+        max_burst: int = 1000,
+        ports: Optional[Sequence[int]] = None,
+        impairments: Optional[Dict[int, Tuple[float, float, float]]] = None,
+    ):
+        """Publish ticks for ``symbols`` at ``rate`` ticks/s (may be changed while running).
+
+        When broadcasting falls more than ``max_burst`` ticks behind schedule the
+        backlog is skipped rather than sent late, and counted in ``conflated``.
+        ``ports`` (default: just ``port``) are the redundant lines served;
+        ``impairments`` maps a port to (delay s, jitter s, drop probability).
+        """
+        self.symbols = list(symbols) if symbols is not None else list(SYMBOLS)
+        self.prices = {symbol: random.uniform(100, 300) for symbol in self.symbols}
         self.clients = set()
+        # client -> symbols it subscribed to (clients that never subscribe get everything)
+        self.subscriptions = {}
+        self.rate = rate
+        self.ports = list(ports) if ports else [port]
+        self.port = self.ports[0]
+        self.max_burst = max_burst
+        self.impairments = dict(FEED_LINE_IMPAIRMENTS if impairments is None else impairments)
+        self.client_ports = {}  # client -> port (line) it connected on
+        self.dropped: Dict[int, int] = {}  # port -> ticks dropped by its impairment
+        # port -> (due time, client, message) held back by an impairment, in send order
+        self._delayed: Dict[int, Deque[Tuple[float, object, str]]] = {}
+        self._last_due: Dict[int, float] = {}
+        self._senders: Dict[int, asyncio.Task] = {}
+        self.seq = 0        # sequence number of the last tick published
+        self.conflated = 0  # scheduled ticks skipped because the feed fell behind
 
     async def generate_tick(self, symbol: str) -> dict:
         """Generate a realistic market tick."""
@@ -24,7 +63,9 @@ class MarketDataFeed:
         bid = self.prices[symbol] - random.uniform(0.01, 0.05)
         ask = bid + random.uniform(0.01, 0.10)
         
+        self.seq += 1
         return {
+            "seq": self.seq,
             "symbol": symbol,
             "bid": round(bid, 2),
             "ask": round(ask, 2),
@@ -37,8 +78,16 @@ class MarketDataFeed:
         """Broadcast tick to all connected clients."""
         if self.clients:
             message = json.dumps(tick)
+            symbol = tick["symbol"]
             disconnected = set()
-            for client in self.clients:
+            for client in list(self.clients):
+                symbols = self.subscriptions.get(client)
+                if symbols is not None and symbol not in symbols:
+                    continue
+                impairment = self.impairments.get(self.client_ports.get(client))
+                if impairment is not None:
+                    self._impair(client, message, impairment)
+                    continue
                 try:
                     await client.send(message)
                 except websockets.exceptions.ConnectionClosed:
@@ -47,43 +96,106 @@ class MarketDataFeed:
             # Clean up disconnected clients
             self.clients -= disconnected
 
-    async def handle_client(self, websocket, path):
-        """Handle new client connection."""
+    def _impair(self, client, message: str, impairment: Tuple[float, float, float]):
+        """Drop, or queue the message for the line's sender to deliver late."""
+        port = self.client_ports[client]
+        delay, jitter, drop = impairment
+        if drop and random.random() < drop:
+            self.dropped[port] = self.dropped.get(port, 0) + 1
+            return
+        now = asyncio.get_running_loop().time()
+        # Never overtake an earlier message on the same line
+        due = max(now + delay + random.uniform(0.0, jitter), self._last_due.get(port, now))
+        self._last_due[port] = due
+        self._delayed.setdefault(port, deque()).append((due, client, message))
+        if port not in self._senders:
+            self._senders[port] = asyncio.create_task(self._send_delayed(port))
+
+    async def _send_delayed(self, port: int):
+        loop = asyncio.get_running_loop()
+        queue = self._delayed[port]
+        while True:
+            if not queue:
+                await asyncio.sleep(0.001)
+                continue
+            due, client, message = queue[0]
+            wait = due - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+            queue.popleft()
+            try:
+                await client.send(message)
+            except websockets.exceptions.ConnectionClosed:
+                pass
+
+    def stall(self, port: int, seconds: float):
+        """Hold everything on one line for ``seconds``, then release it as a burst."""
+        self.impairments.setdefault(port, (0.0, 0.0, 0.0))
+        until = asyncio.get_running_loop().time() + seconds
+        self._last_due[port] = max(self._last_due.get(port, until), until)
+        logger.info(f"Stalling feed line on port {port} for {seconds:.1f}s")
+
+    async def handle_client(self, websocket, path, port: Optional[int] = None):
+        """Handle new client connection.
+
+        A client may send {"subscribe": [symbols]} to receive only those symbols.
+        """
         self.clients.add(websocket)
+        self.client_ports[websocket] = port
         logger.info(f"New client connected. Total: {len(self.clients)}")
         try:
-            await websocket.wait_closed()
+            async for message in websocket:
+                request = json.loads(message)
+                if "subscribe" in request:
+                    self.subscriptions[websocket] = set(request["subscribe"])
+                    logger.info(f"Client subscribed to {len(request['subscribe'])} symbols")
+        except websockets.exceptions.ConnectionClosed:
+            pass
         finally:
-            self.clients.remove(websocket)
+            self.clients.discard(websocket)
+            self.subscriptions.pop(websocket, None)
+            self.client_ports.pop(websocket, None)
             logger.info(f"Client disconnected. Total: {len(self.clients)}")
 
     async def run_feed(self):
-        """Main feed generation loop."""
+        """Main feed generation loop, paced at ``self.rate`` ticks/s."""
+        loop = asyncio.get_running_loop()
+        last = loop.time()
+        owed = 0.0
         while True:
-            symbol = random.choice(SYMBOLS)
-            tick = await self.generate_tick(symbol)
-            await self.broadcast_tick(tick)
-            await asyncio.sleep(TICK_INTERVAL)
+            now = loop.time()
+            owed += (now - last) * self.rate
+            last = now
+            if owed > self.max_burst:
+                skipped = int(owed) - self.max_burst
+                self.conflated += skipped
+                owed -= skipped
+            for _ in range(int(owed)):
+                symbol = random.choice(self.symbols)
+                tick = await self.generate_tick(symbol)
+                await self.broadcast_tick(tick)
+            owed -= int(owed)
+            await asyncio.sleep((1.0 - owed) / self.rate if self.rate > 0 else TICK_INTERVAL)
 
     async def start_server(self):
         """Start the WebSocket server."""
-        logger.info(f"Starting market data feed on port {MARKET_DATA_WS_PORT}")
+        logger.info(f"Starting market data feed on port(s) {', '.join(map(str, self.ports))}")
         
-        # Start WebSocket server
-        start_server = websockets.serve(
-            self.handle_client, 
-            "localhost", 
-            MARKET_DATA_WS_PORT
-        )
+        # One WebSocket server per line, all fed by the same tick stream
+        servers = [
+            websockets.serve(functools.partial(self.handle_client, port=port), "localhost", port)
+            for port in self.ports
+        ]
         
-        # Run feed and server concurrently
+        # Run feed and servers concurrently
         await asyncio.gather(
-            start_server,
+            *servers,
             self.run_feed()
         )
 
 async def main():
-    feed = MarketDataFeed()
+    feed = MarketDataFeed(ports=FEED_LINE_PORTS)
     await feed.start_server()
 
 if __name__ == "__main__":
@@ -1,51 +1,259 @@
-"""Market data feed handler - consumes and normalizes ticks."""
+"""Market data feed handler - consumes and normalizes ticks.
+
+With more than one port the handler subscribes to redundant A/B feed lines
+at once: each line has its own reader, every tick is taken from whichever
+line delivers it first (market_data.arbitration) and one dispatcher hands
+the winners to the callback in arrival order. A line that drops is
+reconnected in the background while the others keep trading.
+"""
 
 import asyncio
 import json
-import websockets
-from typing import Callable, Optional
-from common.config import MARKET_DATA_WS_PORT
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+from common.config import FEED_RECONNECT_INTERVAL, MARKET_DATA_WS_PORT
+from common.metrics import REGISTRY, Family
 from common.utils import setup_logger, deserialize_message
+from market_data.arbitration import LineStats, SequenceArbiter
 from market_data.schemas import Tick
+from market_data.tick_batch import TickBatch
 
 logger = setup_logger(__name__)
 
+FEED_MESSAGES = REGISTRY.counter("feed_messages_total", "Market data messages received")
+FEED_CONNECTED = REGISTRY.gauge("feed_connected", "Market data feed lines connected")
+
+def decode_tick(message) -> Tick:
+    """Decode one feed message straight into a slotted Tick."""
+    data = deserialize_message(message)
+    return Tick(data["symbol"], data["bid"], data["ask"], data["bid_size"], data["ask_size"], data["timestamp"],
+                seq=data.get("seq", 0))
+
+class FeedLine:
+    """One redundant connection to the feed."""
+
+    __slots__ = ("name", "port", "websocket", "stats")
+
+    def __init__(self, name: str, port: int, stats: LineStats):
+        self.name = name
+        self.port = port
+        self.websocket = None
+        self.stats = stats
+
 class FeedHandler:
-    def __init__(self, on_tick_callback: Callable[[Tick], None]):
+    def __init__(
+        self,
+        on_tick_callback: Optional[Callable[[Tick], None]] = None,
+        on_batch_callback: Optional[Callable[[TickBatch], None]] = None,
+        batch_size: int = 256,
+        port: int = MARKET_DATA_WS_PORT,
+        symbols: Optional[Iterable[str]] = None,
+        ports: Optional[Sequence[int]] = None,
+    ):
+        """Deliver ticks one at a time (``on_tick_callback``) or, when
+        ``on_batch_callback`` is given, as a reused TickBatch holding every
+        message that was already queued on the socket (up to ``batch_size``).
+        When ``symbols`` is given, only those symbols are requested from the feed.
+        ``ports`` (default: just ``port``) lists redundant feed lines, named
+        A, B, ... in order; with two or more, ticks are arbitrated by sequence.
+        """
         self.on_tick_callback = on_tick_callback
-        self.websocket: Optional[websockets.WebSocketServerProtocol] = None
+        self.on_batch_callback = on_batch_callback
+        self.batch = TickBatch(batch_size) if on_batch_callback is not None else None
+        self.batch_size = batch_size
+        self.ports = list(ports) if ports else [port]
+        self.port = self.ports[0]
+        self.symbols = sorted(symbols) if symbols is not None else None
+        names = [chr(ord("A") + i) for i in range(len(self.ports))]
+        self.arbiter = SequenceArbiter(names)
+        self.lines: List[FeedLine] = [
+            FeedLine(name, line_port, self.arbiter.lines[name]) for name, line_port in zip(names, self.ports)
+        ]
+        self._queue: Optional[asyncio.Queue] = None  # arbitrated ticks awaiting dispatch
+
+    @property
+    def websocket(self):
+        """The first connected line's websocket (the only one with a single line)."""
+        return next((line.websocket for line in self.lines if line.websocket is not None), None)
 
     async def connect(self):
-        """Connect to market data feed."""
+        """Connect to every feed line; fails only if none can be reached."""
+        connected = [await self._connect_line(line) for line in self.lines]
+        if not any(connected):
+            raise ConnectionError(f"No market data feed line reachable on ports {self.ports}")
+
+    async def _connect_line(self, line: FeedLine, quiet: bool = False) -> bool:
+        # Imported on first connect: not needed to build (or benchmark) the engine
+        import websockets
+
+        only = self.connected_lines() == 0
         try:
-            self.websocket = await websockets.connect(
-                f"ws://localhost:{MARKET_DATA_WS_PORT}"
-            )
-            logger.info("Connected to market data feed")
+            line.websocket = await websockets.connect(f"ws://localhost:{line.port}")
+            if self.symbols is not None:
+                await line.websocket.send(json.dumps({"subscribe": self.symbols}))
         except Exception as e:
-            logger.error(f"Failed to connect to feed: {e}")
-            raise
+            line.websocket = None
+            if len(self.lines) == 1:
+                logger.error(f"Failed to connect to feed: {e}")
+                raise
+            if not quiet:
+                logger.warning(f"Feed line {line.name} (port {line.port}) unavailable: {e}")
+            return False
+        self.arbiter.line_connected(line.stats, only)
+        FEED_CONNECTED.set(self.connected_lines())
+        if len(self.lines) == 1:
+            logger.info("Connected to market data feed")
+        else:
+            logger.info(f"Connected to market data feed line {line.name} (port {line.port})")
+        return True
+
+    def connected_lines(self) -> int:
+        return sum(line.websocket is not None for line in self.lines)
 
     async def listen(self):
         """Listen for incoming market data."""
         if not self.websocket:
             await self.connect()
-        
+        if len(self.lines) > 1:
+            await self._listen_arbitrated()
+            return
+        from websockets.exceptions import ConnectionClosed
+
         try:
+            if self.batch is not None:
+                await self._listen_batched()
+                return
+            is_async = asyncio.iscoroutinefunction(self.on_tick_callback)
             async for message in self.websocket:
-                tick_data = deserialize_message(message)
-                tick = Tick(**tick_data)
-                if asyncio.iscoroutinefunction(self.on_tick_callback):
+                recv_ns = time.perf_counter_ns()
+                FEED_MESSAGES.inc()
+                tick = decode_tick(message)
+                tick.recv_ns = recv_ns
+                if is_async:
                     await self.on_tick_callback(tick)
                 else:
                     self.on_tick_callback(tick)
-        except websockets.exceptions.ConnectionClosed:
+        except ConnectionClosed:
+            FEED_CONNECTED.set(0)
             logger.warning("Connection to market data feed lost")
         except Exception as e:
             logger.error(f"Error processing market data: {e}")
-            logger.error(f"Tick data: {tick_data if 'tick_data' in locals() else 'N/A'}")
+            logger.error(f"Message: {message if 'message' in locals() else 'N/A'}")
+
+    async def _listen_batched(self):
+        batch = self.batch
+        is_async = asyncio.iscoroutinefunction(self.on_batch_callback)
+        # Messages already received but not yet read (legacy websockets protocol)
+        queued = getattr(self.websocket, "messages", None)
+        async for message in self.websocket:
+            recv_ns = time.perf_counter_ns()
+            FEED_MESSAGES.inc()
+            batch.decode(message, recv_ns)
+            # Deliver once the socket has nothing more waiting, so batching
+            # never holds a tick back to wait for the next one
+            if len(batch) >= self.batch_size or not queued:
+                if is_async:
+                    await self.on_batch_callback(batch)
+                else:
+                    self.on_batch_callback(batch)
+                batch.clear()
+
+    async def _listen_arbitrated(self):
+        """One reader per line feeding a single dispatcher; runs until cancelled."""
+        self._queue = asyncio.Queue()
+        tasks = [asyncio.create_task(self._read_line(line), name=f"feed-line-{line.name}") for line in self.lines]
+        tasks.append(asyncio.create_task(self._dispatch(), name="feed-dispatch"))
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _read_line(self, line: FeedLine):
+        """Read one line, forwarding ticks it wins; reconnect when it drops."""
+        from websockets.exceptions import ConnectionClosed
+
+        accept = self.arbiter.accept
+        stats = line.stats
+        put = self._queue.put_nowait
+        while True:
+            if line.websocket is None and not await self._connect_line(line, quiet=True):
+                await asyncio.sleep(FEED_RECONNECT_INTERVAL)
+                continue
+            try:
+                async for message in line.websocket:
+                    recv_ns = time.perf_counter_ns()
+                    FEED_MESSAGES.inc()
+                    try:
+                        tick = decode_tick(message)
+                    except Exception as e:
+                        logger.error("Bad message on feed line %s: %s (%r)", line.name, e, message)
+                        continue
+                    if accept(stats, tick.symbol, tick.seq, recv_ns):
+                        tick.recv_ns = recv_ns
+                        put(tick)
+            except ConnectionClosed:
+                pass
+            line.websocket = None
+            FEED_CONNECTED.set(self.connected_lines())
+            logger.warning(
+                f"Feed line {line.name} (port {line.port}) lost; {self.connected_lines()} of "
+                f"{len(self.lines)} lines still connected"
+            )
+
+    async def _dispatch(self):
+        """Hand arbitrated ticks to the callback, one at a time (or batched)."""
+        queue = self._queue
+        batch = self.batch
+        callback = self.on_batch_callback if batch is not None else self.on_tick_callback
+        is_async = asyncio.iscoroutinefunction(callback)
+        while True:
+            tick = await queue.get()
+            try:
+                if batch is None:
+                    if is_async:
+                        await callback(tick)
+                    else:
+                        callback(tick)
+                    continue
+                # Like _listen_batched: everything already waiting, up to batch_size
+                batch.append(tick.symbol, tick.bid, tick.ask, tick.bid_size, tick.ask_size, tick.timestamp,
+                             tick.seq, tick.recv_ns)
+                while len(batch) < self.batch_size and not queue.empty():
+                    tick = queue.get_nowait()
+                    batch.append(tick.symbol, tick.bid, tick.ask, tick.bid_size, tick.ask_size, tick.timestamp,
+                                 tick.seq, tick.recv_ns)
+                if is_async:
+                    await callback(batch)
+                else:
+                    callback(batch)
+                batch.clear()
+            except Exception as e:
+                logger.error(f"Error processing market data: {e} (tick {tick})")
+                if batch is not None:
+                    batch.clear()
+
+    def backlog(self) -> int:
+        """Messages received but not yet handled: the fullest line plus ticks awaiting dispatch."""
+        received = max((len(getattr(line.websocket, "messages", ())) for line in self.lines), default=0)
+        return received + (self._queue.qsize() if self._queue is not None else 0)
+
+    def get_line_stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-line arbitration stats (see market_data.arbitration.LineStats)."""
+        stats = self.arbiter.stats()
+        for line in self.lines:
+            stats[line.name]["port"] = line.port
+            stats[line.name]["connected"] = line.websocket is not None
+        return stats
+
+    def collect_metrics(self) -> List[Family]:
+        """Metrics collector for common.metrics.REGISTRY (nothing with a single line)."""
+        return self.arbiter.collect_metrics() if len(self.lines) > 1 else []
 
     async def disconnect(self):
         """Disconnect from feed."""
-        if self.websocket:
-            await self.websocket.close()
\ No newline at end of file
+        for line in self.lines:
+            if line.websocket:
+                await line.websocket.close()
+                line.websocket = None
+        FEED_CONNECTED.set(0)
\ No newline at end of file
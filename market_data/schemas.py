@@ -1,9 +1,9 @@
 """Data schemas for market data and orders."""
 
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Optional
 
-@dataclass
+@dataclass(slots=True)
 class Tick:
     symbol: str
     bid: float
@@ -11,8 +11,14 @@ class Tick:
     bid_size: int
     ask_size: int
     timestamp: float
+    recv_ns: int = 0  # perf_counter_ns at socket receive (latency tracing)
+    seq: int = 0      # feed sequence number (0 if the feed does not send one)
 
-@dataclass
+# Orders and fills are slotted records: one instance travels through strategy,
+# risk, OMS and exchange and is updated in place. Dicts are only produced at
+# the DB, journal and dashboard boundaries (to_dict / from_dict).
+
+@dataclass(slots=True)
 class Order:
     order_id: str
     symbol: str
@@ -21,12 +27,41 @@ class Order:
     price: float
     timestamp: float
     status: str = "NEW"
+    order_type: str = "LIMIT"
+    strategy: str = ""
+    account: Optional[str] = None
+    reason: Optional[str] = None
+    filled_qty: int = 0
+    tick_ns: int = 0  # recv_ns of the tick that triggered it; not persisted
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in ORDER_FIELDS}
 
-@dataclass
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Order":
+        return cls(**{name: data[name] for name in ORDER_FIELDS if name in data})
+
+@dataclass(slots=True)
 class Fill:
+    """Execution report: a (possibly partial) fill, or a rejection when status is REJECTED."""
     order_id: str
     symbol: str
     side: str
     quantity: int
     price: float
-    timestamp: float
\ No newline at end of file
+    timestamp: float
+    fill_id: str = ""
+    status: str = "FILLED"
+    reason: Optional[str] = None
+    strategy: str = ""
+    account: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in FILL_FIELDS}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Fill":
+        return cls(**{name: data[name] for name in FILL_FIELDS if name in data})
+
+ORDER_FIELDS = tuple(f.name for f in fields(Order) if f.name != "tick_ns")
+FILL_FIELDS = tuple(f.name for f in fields(Fill))
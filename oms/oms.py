@@ -1,22 +1,42 @@
 """Order Management Service - handles order lifecycle."""
 
 import sqlite3
-from typing import Dict, Any, List
-from common.config import DB_PATH
+import time
+from typing import Dict, Any, List, Optional
+from common.config import DB_PATH, OMS_FLUSH_BATCH, OMS_MAX_TERMINAL_ORDERS, OMS_TERMINAL_ORDER_TTL
+from common.storage import create_indexes
+from common.journal import EventJournal, FILL_EVENT, ORDER_EVENT, STATUS_EVENT
+from common.metrics import REGISTRY
 from common.utils import setup_logger, get_timestamp
+from market_data.schemas import Fill, Order
+from oms.order_store import CANCELED, OrderStore
 
 logger = setup_logger(__name__)
 
+OMS_ORDERS = REGISTRY.counter("oms_orders_submitted_total", "Orders submitted to the OMS", ("symbol", "strategy"))
+OMS_FILLS = REGISTRY.counter("oms_fills_total", "Fills recorded", ("symbol", "strategy"))
+OMS_DB_WRITES = REGISTRY.histogram("oms_db_write_seconds", "OMS database transaction time", ("op",))
+
 class OrderManagementService:
-    def __init__(self):
+    def __init__(self, journal: Optional[EventJournal] = None):
         self.init_db()
-        self.orders = {}  # order_id -> order
+        # Write-ahead log of order/status/fill events for crash recovery
+        self.journal = journal
+        self._replaying = False
+        # order_id -> order, with lifecycle states and symbol/status/strategy indexes
+        self.orders = OrderStore(
+            max_terminal=OMS_MAX_TERMINAL_ORDERS,
+            max_terminal_age=OMS_TERMINAL_ORDER_TTL,
+            on_evict=self._on_evict,
+        )
+        # Orders whose latest state has not been written to the DB yet
+        self._pending: Dict[str, Order] = {}
 
     def init_db(self):
         """Initialize SQLite database for order history."""
         conn = sqlite3.connect(DB_PATH)
         cursor = conn.cursor()
-        
+
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS orders (
                 order_id TEXT PRIMARY KEY,
@@ -26,10 +46,11 @@ class OrderManagementService:
                 price REAL,
                 timestamp REAL,
                 status TEXT,
-                strategy TEXT
+                strategy TEXT,
+                filled_qty INTEGER DEFAULT 0
             )
         ''')
-        
+
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS fills (
                 fill_id TEXT PRIMARY KEY,
@@ -41,92 +62,222 @@ class OrderManagementService:
                 timestamp REAL
             )
         ''')
-        
+
+        # Databases created before filled_qty was tracked
+        columns = {row[1] for row in cursor.execute("PRAGMA table_info(orders)")}
+        if "filled_qty" not in columns:
+            cursor.execute("ALTER TABLE orders ADD COLUMN filled_qty INTEGER DEFAULT 0")
+        create_indexes(cursor)
+
         conn.commit()
         conn.close()
 
-    def submit_order(self, order: Dict[str, Any]) -> Dict[str, Any]:
-        """Submit order to OMS."""
-        order_id = order["order_id"]
-        self.orders[order_id] = order
-        
-        # Log to database
-        self._save_order_to_db(order)
-        
-        logger.info(f"Order submitted: {order_id}")
+    def submit_order(self, order: Order) -> Order:
+        """Submit order to OMS (the record is kept and updated in place)."""
+        order_id = order.order_id
+        self.orders.add(order)
+        if self.journal is not None:
+            self.journal.append(ORDER_EVENT, order.to_dict())
+
+        # Log to database (batched)
+        self._pending[order_id] = order
+        self._maybe_flush()
+
+        OMS_ORDERS.labels(order.symbol, order.strategy).inc()
+        logger.info("Order submitted: %s", order_id)
         return order
 
     def update_order_status(self, order_id: str, status: str, reason: str = None):
         """Update order status."""
-        if order_id in self.orders:
-            self.orders[order_id]["status"] = status
-            if reason:
-                self.orders[order_id]["reason"] = reason
-            
-            # Update database
-            conn = sqlite3.connect(DB_PATH)
-            cursor = conn.cursor()
-            cursor.execute(
-                "UPDATE orders SET status = ? WHERE order_id = ?",
-                (status, order_id)
-            )
-            conn.commit()
-            conn.close()
+        order = self.orders.get(order_id)
+        if order is None:
+            return
+        if order.status == status:
+            if not reason:
+                # Nothing changed: no journal record, no DB write
+                return
+        elif not self.orders.transition(order_id, status, reason):
+            return
+        if reason:
+            order.reason = reason
+        if self.journal is not None:
+            self.journal.append(STATUS_EVENT, {"order_id": order_id, "status": status, "reason": reason})
 
-    def record_fill(self, fill: Dict[str, Any]):
-        """Record a fill."""
+        # Update database (batched)
+        self._pending[order_id] = order
+        self._maybe_flush()
+
+    @staticmethod
+    def _fill_row(fill: Fill) -> tuple:
+        return (
+            fill.fill_id or fill.order_id + "_fill",
+            fill.order_id,
+            fill.symbol,
+            fill.side,
+            fill.quantity,
+            fill.price,
+            fill.timestamp
+        )
+
+    def record_fill(self, fill: Fill) -> Optional[str]:
+        """Record a fill; returns the order's new status (None if the order is not held)."""
+        order = self.orders.get(fill.order_id)
+        if order is not None and not fill.strategy:
+            # Carry the order's limit path so journal replay can rebuild risk state
+            fill.strategy = order.strategy
+            fill.account = order.account
+        if self.journal is not None:
+            self.journal.append(FILL_EVENT, fill.to_dict())
+        status = self.orders.apply_fill(fill.order_id, fill.quantity)
+
+        # Fills are written straight away (PnL reads them from the DB), together
+        # with any pending order writes in the same transaction
+        start = time.perf_counter_ns()
         conn = sqlite3.connect(DB_PATH)
         cursor = conn.cursor()
-        
+
         cursor.execute('''
             INSERT INTO fills (fill_id, order_id, symbol, side, quantity, price, timestamp)
             VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            fill.get("fill_id", fill["order_id"] + "_fill"),
-            fill["order_id"],
-            fill["symbol"], 
-            fill["side"],
-            fill["quantity"],
-            fill["price"],
-            fill["timestamp"]
-        ))
-        
+        ''', self._fill_row(fill))
+        if order is not None:
+            self._pending[fill.order_id] = order
+        self._write_pending(cursor)
+
+        conn.commit()
+        conn.close()
+        OMS_DB_WRITES.labels("fill").record(time.perf_counter_ns() - start)
+        OMS_FILLS.labels(fill.symbol, fill.strategy).inc()
+
+        logger.info("Fill recorded: %s", fill)
+        return status
+
+    def _maybe_flush(self):
+        if len(self._pending) >= OMS_FLUSH_BATCH:
+            self.flush()
+
+    def _on_evict(self, orders: List[Order]):
+        # Evicted orders must reach the DB before they leave memory; pending
+        # writes hold their own reference, so replay can defer to one flush
+        if not self._replaying and any(order.order_id in self._pending for order in orders):
+            self.flush()
+
+    def flush(self):
+        """Write every pending order state to the database in one transaction."""
+        if not self._pending:
+            return
+        start = time.perf_counter_ns()
+        conn = sqlite3.connect(DB_PATH)
+        cursor = conn.cursor()
+        self._write_pending(cursor)
         conn.commit()
         conn.close()
-        
-        logger.info(f"Fill recorded: {fill}")
+        OMS_DB_WRITES.labels("flush").record(time.perf_counter_ns() - start)
+
+    def _write_pending(self, cursor: sqlite3.Cursor):
+        """Save pending orders to database."""
+        rows = [
+            (
+                order.order_id,
+                order.symbol,
+                order.side,
+                order.quantity,
+                order.price,
+                order.timestamp,
+                order.status,
+                order.strategy,
+                order.filled_qty,
+            )
+            for order in self._pending.values()
+        ]
+        cursor.executemany('''
+            INSERT OR REPLACE INTO orders
+            (order_id, symbol, side, quantity, price, timestamp, status, strategy, filled_qty)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', rows)
+        self._pending.clear()
+
+    def replay(self, events) -> Dict[str, int]:
+        """Rebuild order state from journal events (seq, type, payload).
+
+        Order rows and fills are written to the database once at the end;
+        fills already there are left alone.
+        """
+        counts = {"orders": 0, "statuses": 0, "fills": 0}
+        fills = []
+        self._replaying = True
+        try:
+            for _, event_type, payload in events:
+                order_id = payload.get("order_id")
+                if event_type == ORDER_EVENT:
+                    if order_id not in self.orders:
+                        self.orders.add(Order.from_dict(payload))
+                    counts["orders"] += 1
+                elif event_type == STATUS_EVENT:
+                    order = self.orders.get(order_id)
+                    if order is None:
+                        continue
+                    if order.status != payload["status"]:
+                        self.orders.transition(order_id, payload["status"], payload.get("reason"))
+                    counts["statuses"] += 1
+                elif event_type == FILL_EVENT:
+                    self.orders.apply_fill(order_id, payload["quantity"])
+                    fills.append(Fill.from_dict(payload))
+                    counts["fills"] += 1
+                else:
+                    continue
+                order = self.orders.get(order_id)
+                if order is not None:
+                    self._pending[order_id] = order
+        finally:
+            self._replaying = False
 
-    def _save_order_to_db(self, order: Dict[str, Any]):
-        """Save order to database."""
         conn = sqlite3.connect(DB_PATH)
         cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT OR REPLACE INTO orders 
-            (order_id, symbol, side, quantity, price, timestamp, status, strategy)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            order["order_id"],
-            order["symbol"],
-            order["side"],
-            order["quantity"],
-            order["price"],
-            order["timestamp"],
-            order["status"],
-            order.get("strategy", "")
-        ))
-        
+        cursor.executemany('''
+            INSERT OR IGNORE INTO fills (fill_id, order_id, symbol, side, quantity, price, timestamp)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', [self._fill_row(fill) for fill in fills])
+        self._write_pending(cursor)
         conn.commit()
         conn.close()
+        return counts
+
+    def cancel_open_orders(self, reason: str) -> int:
+        """Cancel every live order (used after recovery: their outcome is unknown)."""
+        open_orders = self.orders.open_orders()
+        for order in open_orders:
+            self.update_order_status(order.order_id, CANCELED, reason)
+        self.flush()
+        return len(open_orders)
+
+    def snapshot_state(self) -> Dict[str, Any]:
+        """Live orders for a journal snapshot (terminal ones are already in the DB)."""
+        self.flush()
+        return {"open_orders": [order.to_dict() for order in self.orders.open_orders()]}
+
+    def restore_state(self, state: Dict[str, Any]):
+        for order in state.get("open_orders", []):
+            if order["order_id"] not in self.orders:
+                self.orders.add(Order.from_dict(order))
+
+    def get_order(self, order_id: str) -> Optional[Order]:
+        """Order by ID while it is still held in memory."""
+        return self.orders.get(order_id)
+
+    def get_open_orders(self, symbol: Optional[str] = None, strategy: Optional[str] = None) -> List[Order]:
+        """Live (non-terminal) orders, optionally for one symbol and/or strategy."""
+        return self.orders.open_orders(symbol=symbol, strategy=strategy)
 
     def get_orders(self, limit: int = 100) -> List[Dict[str, Any]]:
         """Get recent orders in dashboard format."""
+        self.flush()
         conn = sqlite3.connect(DB_PATH)
         cursor = conn.cursor()
         cursor.execute('''
             SELECT timestamp, symbol, side, quantity, price, status, strategy, order_id
-            FROM orders 
-            ORDER BY timestamp DESC 
+            FROM orders
+            ORDER BY timestamp DESC
             LIMIT ?
         ''', (limit,))
         orders = []
@@ -143,4 +294,4 @@ class OrderManagementService:
                 'order_id': order_id
             })
         conn.close()
-        return orders
\ No newline at end of file
+        return orders
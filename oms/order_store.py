@@ -0,0 +1,189 @@
+"""In-memory order store - lifecycle state machine, secondary indexes, bounded size."""
+
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Set
+from common.utils import setup_logger
+from market_data.schemas import Order
+
+logger = setup_logger(__name__)
+
+# Order lifecycle states
+NEW = "NEW"
+APPROVED = "APPROVED"
+PARTIAL = "PARTIAL"
+FILLED = "FILLED"
+REJECTED = "REJECTED"
+CANCELED = "CANCELED"
+
+TERMINAL_STATES = frozenset({FILLED, REJECTED, CANCELED})
+LIVE_STATES = (NEW, APPROVED, PARTIAL)
+
+VALID_TRANSITIONS = {
+    NEW: frozenset({APPROVED, REJECTED, CANCELED}),
+    APPROVED: frozenset({PARTIAL, FILLED, REJECTED, CANCELED}),
+    PARTIAL: frozenset({PARTIAL, FILLED, CANCELED}),
+    FILLED: frozenset(),
+    REJECTED: frozenset(),
+    CANCELED: frozenset(),
+}
+
+
+class OrderStore:
+    """Orders by ID with indexes by symbol, status and strategy.
+
+    Live orders stay in memory until they reach a terminal state. Terminal
+    orders are kept for a while (for lookups right after a fill) and then
+    evicted, oldest first, once there are more than ``max_terminal`` of them
+    or they are older than ``max_terminal_age`` seconds. ``on_evict`` is
+    called with each batch of evicted orders so they can be persisted.
+    """
+
+    def __init__(
+        self,
+        max_terminal: int = 10000,
+        max_terminal_age: float = 300.0,
+        on_evict: Optional[Callable[[List[Order]], None]] = None,
+    ):
+        self.max_terminal = max_terminal
+        self.max_terminal_age = max_terminal_age
+        self.on_evict = on_evict
+        self.orders: Dict[str, Order] = {}
+        self.by_symbol: Dict[str, Set[str]] = {}
+        self.by_status: Dict[str, Set[str]] = {}
+        self.by_strategy: Dict[str, Set[str]] = {}
+        self._terminal: "OrderedDict[str, float]" = OrderedDict()  # order_id -> time it became terminal
+        self.evicted = 0
+
+    def __contains__(self, order_id: str) -> bool:
+        return order_id in self.orders
+
+    def __getitem__(self, order_id: str) -> Order:
+        return self.orders[order_id]
+
+    def __len__(self) -> int:
+        return len(self.orders)
+
+    def get(self, order_id: str) -> Optional[Order]:
+        return self.orders.get(order_id)
+
+    @staticmethod
+    def _index_add(index: Dict[str, Set[str]], key: str, order_id: str):
+        ids = index.get(key)
+        if ids is None:
+            ids = index[key] = set()
+        ids.add(order_id)
+
+    @staticmethod
+    def _index_remove(index: Dict[str, Set[str]], key: str, order_id: str):
+        ids = index.get(key)
+        if ids is not None:
+            ids.discard(order_id)
+            if not ids:
+                del index[key]
+
+    def add(self, order: Order) -> Order:
+        """Insert a new order (the record itself is stored, not a copy)."""
+        order_id = order.order_id
+        if order_id in self.orders:
+            raise ValueError(f"Duplicate order_id {order_id}")
+        status = order.status
+        if status not in VALID_TRANSITIONS:
+            raise ValueError(f"Unknown order status {status}")
+
+        self.orders[order_id] = order
+        self._index_add(self.by_symbol, order.symbol, order_id)
+        self._index_add(self.by_status, status, order_id)
+        self._index_add(self.by_strategy, order.strategy or "", order_id)
+        if status in TERMINAL_STATES:
+            self._mark_terminal(order_id)
+        return order
+
+    def transition(self, order_id: str, status: str, reason: Optional[str] = None) -> bool:
+        """Move an order to a new state; returns False for unknown orders or illegal moves."""
+        order = self.orders.get(order_id)
+        if order is None:
+            return False
+        current = order.status
+        if status not in VALID_TRANSITIONS.get(current, ()):
+            logger.warning(f"Illegal order transition {order_id}: {current} -> {status}")
+            return False
+
+        self._index_remove(self.by_status, current, order_id)
+        self._index_add(self.by_status, status, order_id)
+        order.status = status
+        if reason:
+            order.reason = reason
+        if status in TERMINAL_STATES:
+            self._mark_terminal(order_id)
+        return True
+
+    def apply_fill(self, order_id: str, quantity: int) -> Optional[str]:
+        """Add to the cumulative filled quantity; moves the order to PARTIAL or FILLED."""
+        order = self.orders.get(order_id)
+        if order is None:
+            return None
+        order.filled_qty += quantity
+        status = FILLED if order.filled_qty >= order.quantity else PARTIAL
+        self.transition(order_id, status)
+        return order.status
+
+    def _mark_terminal(self, order_id: str):
+        self._terminal[order_id] = time.monotonic()
+        self.evict()
+
+    def evict(self, now: Optional[float] = None) -> int:
+        """Drop terminal orders beyond the size cap or older than the age limit."""
+        now = time.monotonic() if now is None else now
+        evicted = []
+        while self._terminal:
+            order_id, since = next(iter(self._terminal.items()))
+            if len(self._terminal) <= self.max_terminal and now - since < self.max_terminal_age:
+                break
+            self._terminal.popitem(last=False)
+            evicted.append(self._remove(order_id))
+
+        if evicted:
+            self.evicted += len(evicted)
+            if self.on_evict is not None:
+                self.on_evict(evicted)
+        return len(evicted)
+
+    def _remove(self, order_id: str) -> Order:
+        order = self.orders.pop(order_id)
+        self._index_remove(self.by_symbol, order.symbol, order_id)
+        self._index_remove(self.by_status, order.status, order_id)
+        self._index_remove(self.by_strategy, order.strategy or "", order_id)
+        return order
+
+    def _select(self, ids: Iterable[str]) -> List[Order]:
+        return [self.orders[order_id] for order_id in ids]
+
+    def open_orders(self, symbol: Optional[str] = None, strategy: Optional[str] = None) -> List[Order]:
+        """Non-terminal orders, optionally filtered by symbol and/or strategy."""
+        candidates = None
+        if symbol is not None:
+            candidates = self.by_symbol.get(symbol, set())
+        if strategy is not None:
+            by_strategy = self.by_strategy.get(strategy, set())
+            candidates = by_strategy if candidates is None else candidates & by_strategy
+        if candidates is None:
+            return self._select(oid for status in LIVE_STATES for oid in self.by_status.get(status, ()))
+        return self._select(oid for oid in candidates if self.orders[oid].status not in TERMINAL_STATES)
+
+    def orders_with_status(self, status: str) -> List[Order]:
+        return self._select(self.by_status.get(status, ()))
+
+    def orders_for_symbol(self, symbol: str) -> List[Order]:
+        return self._select(self.by_symbol.get(symbol, ()))
+
+    def orders_for_strategy(self, strategy: str) -> List[Order]:
+        return self._select(self.by_strategy.get(strategy, ()))
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "orders": len(self.orders),
+            "terminal": len(self._terminal),
+            "evicted": self.evicted,
+            **{f"status_{status}": len(ids) for status, ids in self.by_status.items()},
+        }
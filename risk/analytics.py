@@ -0,0 +1,149 @@
+"""Portfolio risk analytics - historical-simulation VaR/ES and stress scenarios."""
+
+import math
+from typing import Any, Dict, List, Optional
+import numpy as np
+from common.config import VAR_CONFIDENCE, VAR_SAMPLE_INTERVAL, VAR_WINDOW
+from common.utils import setup_logger, get_timestamp
+
+logger = setup_logger(__name__)
+
+# Built-in scenarios: uniform relative shocks applied to every symbol
+DEFAULT_SCENARIOS = {
+    "market_down_5pct": -0.05,
+    "market_down_10pct": -0.10,
+    "market_up_5pct": 0.05,
+    "market_up_10pct": 0.10,
+}
+
+
+class RiskAnalytics:
+    """Rolling matrix of per-symbol mid returns plus vectorized VaR and stress.
+
+    ``sample`` is called on a fixed interval with the current order books
+    and appends one row of log returns to a ring buffer of ``window`` rows.
+    ``compute`` revalues the live positions against every historical row and
+    every stress scenario with two matrix-vector products.
+    """
+
+    def __init__(self, window: int = VAR_WINDOW, confidence: float = VAR_CONFIDENCE,
+                 sample_interval: float = VAR_SAMPLE_INTERVAL):
+        self.window = window
+        self.confidence = confidence
+        self.sample_interval = sample_interval
+        self.symbols: List[str] = []
+        self.symbol_index: Dict[str, int] = {}
+        self._returns = np.zeros((window, 8))
+        self._last_mid = np.full(8, np.nan)
+        self._row = 0
+        self.samples = 0
+        # name -> (default shock, {symbol: shock})
+        self.scenarios: Dict[str, Any] = {name: (shock, {}) for name, shock in DEFAULT_SCENARIOS.items()}
+        self._shock_matrix: Optional[np.ndarray] = None
+        self.latest: Dict[str, Any] = {}
+
+    def _index(self, symbol: str) -> int:
+        idx = self.symbol_index.get(symbol)
+        if idx is None:
+            idx = self.symbol_index[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+            if idx >= self._returns.shape[1]:
+                # Grow columns geometrically; new symbols have zero return history
+                cols = self._returns.shape[1] * 2
+                returns = np.zeros((self.window, cols))
+                returns[:, :idx] = self._returns
+                last_mid = np.full(cols, np.nan)
+                last_mid[:idx] = self._last_mid
+                self._returns, self._last_mid = returns, last_mid
+            self._shock_matrix = None
+        return idx
+
+    def add_scenario(self, name: str, shocks: Dict[str, float], default: float = 0.0):
+        """Register a stress scenario of relative price shocks (e.g. -0.05 = -5%)."""
+        self.scenarios[name] = (default, dict(shocks))
+        self._shock_matrix = None
+
+    def remove_scenario(self, name: str):
+        self.scenarios.pop(name, None)
+        self._shock_matrix = None
+
+    def _shocks(self) -> np.ndarray:
+        if self._shock_matrix is None:
+            n = len(self.symbols)
+            matrix = np.empty((len(self.scenarios), n))
+            for row, (default, shocks) in enumerate(self.scenarios.values()):
+                matrix[row] = default
+                for symbol, shock in shocks.items():
+                    idx = self.symbol_index.get(symbol)
+                    if idx is not None:
+                        matrix[row, idx] = shock
+            self._shock_matrix = matrix
+        return self._shock_matrix
+
+    def sample(self, books: Dict[str, Dict[str, Any]]):
+        """Append one row of log mid returns since the previous sample."""
+        for symbol in books:
+            if symbol not in self.symbol_index:
+                self._index(symbol)
+        n = len(self.symbols)
+        mids = self._last_mid[:n].copy()
+        for symbol, book in books.items():
+            mid = book.get("mid")
+            if mid:
+                mids[self.symbol_index[symbol]] = mid
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            row = np.log(mids / self._last_mid[:n])
+        self._returns[self._row, :n] = np.nan_to_num(row, nan=0.0, posinf=0.0, neginf=0.0)
+        self._last_mid[:n] = mids
+        self._row = (self._row + 1) % self.window
+        self.samples += 1
+
+    def _exposure(self, positions: Dict[str, Dict[str, Any]]) -> np.ndarray:
+        n = len(self.symbols)
+        exposure = np.zeros(n)
+        for symbol, pos in positions.items():
+            idx = self.symbol_index.get(symbol)
+            quantity = pos.get("quantity", 0)
+            if idx is None or not quantity:
+                continue
+            mid = self._last_mid[idx]
+            price = mid if not math.isnan(mid) else pos.get("avg_price", 0.0)
+            exposure[idx] = quantity * price
+        return exposure
+
+    def compute(self, positions: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """VaR, expected shortfall and scenario PnL for RiskEngine-style positions.
+
+        Losses are over one sampling interval; ``var`` and ``es`` are reported
+        as positive numbers (expected loss), scenario values as signed PnL.
+        """
+        n = len(self.symbols)
+        exposure = self._exposure(positions)
+        rows = min(self.samples, self.window)
+        # The very first sample has no previous mid, so it carries no return
+        history = self._returns[:rows, :n] if self.samples <= self.window else self._returns[:, :n]
+        if self.samples <= self.window and rows:
+            history = history[1:]
+
+        var = es = 0.0
+        if len(history):
+            pnl = np.expm1(history) @ exposure
+            cutoff = np.quantile(pnl, 1.0 - self.confidence)
+            var = float(max(0.0, -cutoff))
+            tail = pnl[pnl <= cutoff]
+            es = float(max(0.0, -tail.mean())) if len(tail) else var
+
+        scenario_pnl = self._shocks() @ exposure if n else np.zeros(len(self.scenarios))
+        self.latest = {
+            "timestamp": get_timestamp(),
+            "confidence": self.confidence,
+            "horizon_seconds": self.sample_interval,
+            "samples": int(len(history)),
+            "var": var,
+            "expected_shortfall": es,
+            "gross_exposure": float(np.abs(exposure).sum()),
+            "net_exposure": float(exposure.sum()),
+            "scenarios": {name: float(v) for name, v in zip(self.scenarios, scenario_pnl)},
+        }
+        return self.latest
@@ -0,0 +1,142 @@
+"""Batch pre-trade risk checks over columnar order arrays."""
+
+from dataclasses import dataclass
+from typing import List, Optional
+import numpy as np
+from common.arrays import group_cumsum, group_order
+
+# Per-order result codes returned by RiskEngine.check_orders
+ACCEPTED = 0
+POSITION_LIMIT = 1
+NOTIONAL_LIMIT = 2
+SYMBOL_POSITION_LIMIT = 3
+SYMBOL_NOTIONAL_LIMIT = 4
+STRATEGY_NOTIONAL_LIMIT = 5
+ACCOUNT_NOTIONAL_LIMIT = 6
+FIRM_NOTIONAL_LIMIT = 7
+INVALID_ORDER = 8
+ORDER_TRACKING_LIMIT = 9
+
+# Same reason strings as the single-order check_order
+REJECT_REASONS = {
+    POSITION_LIMIT: "POSITION_LIMIT",
+    NOTIONAL_LIMIT: "NOTIONAL_LIMIT",
+    SYMBOL_POSITION_LIMIT: "SYMBOL_POSITION_LIMIT",
+    SYMBOL_NOTIONAL_LIMIT: "SYMBOL_NOTIONAL_LIMIT",
+    STRATEGY_NOTIONAL_LIMIT: "STRATEGY_NOTIONAL_LIMIT",
+    ACCOUNT_NOTIONAL_LIMIT: "ACCOUNT_NOTIONAL_LIMIT",
+    FIRM_NOTIONAL_LIMIT: "FIRM_NOTIONAL_LIMIT",
+    INVALID_ORDER: "INVALID_ORDER",
+    ORDER_TRACKING_LIMIT: "ORDER_TRACKING_LIMIT",
+}
+
+BUY = 1
+SELL = -1
+
+
+@dataclass
+class BatchCheckResult:
+    codes: np.ndarray                  # int8, ACCEPTED or a reject code per order
+    order_ids: List[Optional[str]]     # assigned ID for accepted orders, None otherwise
+
+    @property
+    def accepted(self) -> np.ndarray:
+        return self.codes == ACCEPTED
+
+    def reasons(self) -> List[Optional[str]]:
+        return [REJECT_REASONS.get(int(code)) for code in self.codes]
+
+
+def side_codes(sides) -> np.ndarray:
+    """Normalise sides to +1 (BUY) / -1 (SELL); accepts strings or numbers."""
+    sides = np.asarray(sides)
+    if sides.dtype.kind in "USO":
+        return np.where(sides == "BUY", BUY, np.where(sides == "SELL", SELL, 0)).astype(np.int8)
+    return np.sign(sides).astype(np.int8)
+
+
+def evaluate(
+    symbol_ids: np.ndarray,
+    sides: np.ndarray,
+    quantities: np.ndarray,
+    prices: np.ndarray,
+    position: np.ndarray,
+    position_limit: float,
+    notional_headroom: float,
+    leaf_quantity: np.ndarray,
+    leaf_open_buy: np.ndarray,
+    leaf_open_sell: np.ndarray,
+    leaf_position_limit: np.ndarray,
+    leaf_notional_headroom: np.ndarray,
+    path_headroom: np.ndarray,
+) -> np.ndarray:
+    """Compute reject codes with exact in-order semantics.
+
+    Each order sees the effect of every earlier *accepted* order in the
+    batch, as if they had been checked (and, for the global position and
+    notional limits, filled) one by one. All limits are evaluated
+    as array operations over the whole batch; after a rejection the prefix
+    sums are recomputed without it and checking resumes after it, so the
+    loop runs once per rejected order, not once per order. Baskets where
+    most orders are rejected therefore cost O(n) passes.
+
+    Per-symbol inputs (``position``, ``leaf_*``) are indexed by the values in
+    ``symbol_ids``; ``path_headroom`` holds the remaining notional for the
+    strategy, account and firm nodes shared by the whole batch.
+    """
+    n = len(symbol_ids)
+    codes = np.zeros(n, dtype=np.int8)
+    invalid = (sides == 0) | ~(quantities > 0) | ~np.isfinite(prices) | ~(prices > 0)
+    codes[invalid] = INVALID_ORDER
+    accepted = ~invalid
+
+    signed = sides * quantities
+    notional = quantities * prices
+    is_buy = sides > 0
+    order, starts = group_order(symbol_ids)
+
+    pos0 = position[symbol_ids]
+    leaf_buy_room = leaf_position_limit[symbol_ids] - leaf_quantity[symbol_ids] - leaf_open_buy[symbol_ids]
+    leaf_sell_room = leaf_position_limit[symbol_ids] + leaf_quantity[symbol_ids] - leaf_open_sell[symbol_ids]
+    leaf_notional_room = leaf_notional_headroom[symbol_ids]
+
+    start = 0
+    while start < n:
+        acc_signed = np.where(accepted, signed, 0)
+        acc_notional = np.where(accepted, notional, 0.0)
+        acc_buys = np.where(accepted & is_buy, quantities, 0)
+        acc_sells = np.where(accepted & ~is_buy, quantities, 0)
+
+        # Exclusive prefix sums: effect of earlier accepted orders only
+        sym_signed_before = group_cumsum(acc_signed, order, starts) - acc_signed
+        sym_buys_before = group_cumsum(acc_buys, order, starts) - acc_buys
+        sym_sells_before = group_cumsum(acc_sells, order, starts) - acc_sells
+        sym_notional_before = group_cumsum(acc_notional, order, starts) - acc_notional
+        notional_before = np.cumsum(acc_notional) - acc_notional
+
+        pos_before = pos0 + sym_signed_before
+        checks = [
+            (np.where(is_buy, pos_before + quantities > position_limit,
+                      pos_before - quantities < -position_limit), POSITION_LIMIT),
+            (notional_before + notional > notional_headroom, NOTIONAL_LIMIT),
+            (np.where(is_buy, sym_buys_before + quantities > leaf_buy_room,
+                      sym_sells_before + quantities > leaf_sell_room), SYMBOL_POSITION_LIMIT),
+            (sym_notional_before + notional > leaf_notional_room, SYMBOL_NOTIONAL_LIMIT),
+            (notional_before + notional > path_headroom[0], STRATEGY_NOTIONAL_LIMIT),
+            (notional_before + notional > path_headroom[1], ACCOUNT_NOTIONAL_LIMIT),
+            (notional_before + notional > path_headroom[2], FIRM_NOTIONAL_LIMIT),
+        ]
+        failed = np.zeros(n, dtype=bool)
+        for mask, _ in checks:
+            failed |= mask
+        failed &= accepted
+        failed[:start] = False
+
+        first = int(np.argmax(failed)) if failed.any() else -1
+        if first < 0:
+            break
+        accepted[first] = False
+        codes[first] = next(code for mask, code in checks if mask[first])
+        start = first + 1
+
+    return codes
@@ -0,0 +1,219 @@
+"""Hierarchical risk limits - firm / account / strategy / symbol with O(1) checks."""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+# Path through the tree for one order: (account, strategy, symbol)
+LimitPath = Tuple[str, str, str]
+
+LEVELS = ("firm", "account", "strategy", "symbol")
+
+
+def apply_to_position(quantity: int, avg_price: float, side: str,
+                      fill_qty: int, fill_price: float) -> Tuple[int, float, float]:
+    """Apply one fill to a (quantity, avg_price) position.
+
+    Returns (new_quantity, new_avg_price, realized_pnl) using the same
+    accounting as RiskEngine.apply_fill.
+    """
+    realized_pnl = 0.0
+    if side == "BUY":
+        # If reducing a short position
+        if quantity < 0:
+            closed_qty = min(abs(quantity), fill_qty)
+            realized_pnl = (avg_price - fill_price) * closed_qty
+        new_quantity = quantity + fill_qty
+        if new_quantity != 0:
+            new_avg_price = (quantity * avg_price + fill_qty * fill_price) / new_quantity
+        else:
+            new_avg_price = 0.0
+    else:  # SELL
+        # If reducing a long position
+        if quantity > 0:
+            closed_qty = min(quantity, fill_qty)
+            realized_pnl = (fill_price - avg_price) * closed_qty
+        new_quantity = quantity - fill_qty
+        # For a sell, we assume FIFO accounting; average price stays the same unless flat
+        new_avg_price = avg_price if new_quantity != 0 else 0.0
+    return new_quantity, new_avg_price, realized_pnl
+
+
+class LimitNode:
+    """One node of the limit tree with incrementally maintained aggregates.
+
+    ``exposure`` is the gross filled notional (|quantity * avg_price|) of all
+    symbol leaves below the node; ``open_notional`` is the notional of
+    accepted orders that have not filled or been cancelled yet.
+    """
+
+    __slots__ = ("level", "key", "parent", "notional_limit", "position_limit",
+                 "exposure", "open_notional", "quantity", "avg_price",
+                 "open_buy_qty", "open_sell_qty")
+
+    def __init__(self, level: str, key: str, parent: Optional["LimitNode"],
+                 notional_limit: Optional[float] = None, position_limit: Optional[int] = None):
+        self.level = level
+        self.key = key
+        self.parent = parent
+        self.notional_limit = notional_limit
+        self.position_limit = position_limit
+        self.exposure = 0.0
+        self.open_notional = 0.0
+        # Position fields are only used on symbol leaves
+        self.quantity = 0
+        self.avg_price = 0.0
+        self.open_buy_qty = 0
+        self.open_sell_qty = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "level": self.level,
+            "key": self.key,
+            "notional_limit": self.notional_limit,
+            "position_limit": self.position_limit,
+            "exposure": self.exposure,
+            "open_notional": self.open_notional,
+            "quantity": self.quantity,
+        }
+
+
+class LimitTree:
+    """Firm -> account -> strategy -> symbol limits.
+
+    Every check walks one fixed-depth path, and every order acceptance, fill
+    and cancel adjusts the aggregates on that path, so all operations are
+    O(depth) = O(1) regardless of how many symbols or strategies exist.
+    Per-node overrides are set with ``set_limit``; nodes created later pick up
+    the level defaults.
+    """
+
+    def __init__(
+        self,
+        firm_notional: Optional[float] = None,
+        account_notional: Optional[float] = None,
+        strategy_notional: Optional[float] = None,
+        symbol_notional: Optional[float] = None,
+        symbol_position: Optional[int] = None,
+    ):
+        self.defaults: Dict[str, Dict[str, Optional[float]]] = {
+            "account": {"notional_limit": account_notional},
+            "strategy": {"notional_limit": strategy_notional},
+            "symbol": {"notional_limit": symbol_notional, "position_limit": symbol_position},
+        }
+        self.overrides: Dict[Tuple[str, ...], Dict[str, Optional[float]]] = {}
+        self.root = LimitNode("firm", "FIRM", None, notional_limit=firm_notional)
+        self.children: Dict[Tuple[str, ...], LimitNode] = {}
+        # Open orders: order_id -> (leaf, side, quantity, notional)
+        self.open_orders: Dict[str, Tuple[LimitNode, str, int, float]] = {}
+
+    def set_limit(self, key: Tuple[str, ...], notional_limit: Optional[float] = None,
+                  position_limit: Optional[int] = None):
+        """Override limits for one node: (account,), (account, strategy) or a full path."""
+        limits = {"notional_limit": notional_limit, "position_limit": position_limit}
+        self.overrides[tuple(key)] = limits
+        node = self.children.get(tuple(key))
+        if node is not None:
+            node.notional_limit = notional_limit
+            node.position_limit = position_limit
+
+    def _node(self, key: Tuple[str, ...], parent: LimitNode) -> LimitNode:
+        node = self.children.get(key)
+        if node is None:
+            level = LEVELS[len(key)]
+            limits = self.overrides.get(key, self.defaults[level])
+            node = LimitNode(level, key[-1], parent,
+                             notional_limit=limits.get("notional_limit"),
+                             position_limit=limits.get("position_limit"))
+            self.children[key] = node
+        return node
+
+    def leaf(self, path: LimitPath) -> LimitNode:
+        """Symbol leaf for a path, creating intermediate nodes on first use."""
+        node = self.children.get(path)
+        if node is None:
+            account, strategy, _ = path
+            parent = self._node((account,), self.root)
+            parent = self._node((account, strategy), parent)
+            node = self._node(path, parent)
+        return node
+
+    def check(self, path: LimitPath, side: str, quantity: int, notional: float) -> Optional[str]:
+        """Return a rejection reason, or None if the order fits every level."""
+        leaf = self.leaf(path)
+        if leaf.position_limit is not None:
+            # Worst case: every open order on the same side fills
+            if side == "BUY" and leaf.quantity + leaf.open_buy_qty + quantity > leaf.position_limit:
+                return "SYMBOL_POSITION_LIMIT"
+            if side == "SELL" and leaf.quantity - leaf.open_sell_qty - quantity < -leaf.position_limit:
+                return "SYMBOL_POSITION_LIMIT"
+
+        node = leaf
+        while node is not None:
+            limit = node.notional_limit
+            if limit is not None and node.exposure + node.open_notional + notional > limit:
+                return f"{node.level.upper()}_NOTIONAL_LIMIT"
+            node = node.parent
+        return None
+
+    def on_accept(self, order_id: str, path: LimitPath, side: str, quantity: int, notional: float):
+        """Reserve an accepted order's quantity and notional on its path."""
+        leaf = self.leaf(path)
+        if side == "BUY":
+            leaf.open_buy_qty += quantity
+        else:
+            leaf.open_sell_qty += quantity
+        node = leaf
+        while node is not None:
+            node.open_notional += notional
+            node = node.parent
+        self.open_orders[order_id] = (leaf, side, quantity, notional)
+
+    def on_cancel(self, order_id: str):
+        """Release an order's reservation (rejected, cancelled or done)."""
+        entry = self.open_orders.pop(order_id, None)
+        if entry is None:
+            return
+        leaf, side, quantity, notional = entry
+        if side == "BUY":
+            leaf.open_buy_qty -= quantity
+        else:
+            leaf.open_sell_qty -= quantity
+        node = leaf
+        while node is not None:
+            node.open_notional -= notional
+            node = node.parent
+
+    def on_fill(self, order_id: str, path: LimitPath, side: str, quantity: int, price: float):
+        """Move a filled order from open to exposure along its path.
+
+        The exchange sends a single (possibly partial) fill per order, so the
+        whole reservation is released here.
+        """
+        entry = self.open_orders.get(order_id)
+        leaf = entry[0] if entry is not None else self.leaf(path)
+        self.on_cancel(order_id)
+
+        old_exposure = abs(leaf.quantity * leaf.avg_price)
+        leaf.quantity, leaf.avg_price, _ = apply_to_position(
+            leaf.quantity, leaf.avg_price, side, quantity, price
+        )
+        delta = abs(leaf.quantity * leaf.avg_price) - old_exposure
+        node = leaf
+        while node is not None:
+            node.exposure += delta
+            node = node.parent
+
+    def restore_position(self, path: LimitPath, quantity: int, avg_price: float):
+        """Set a leaf's filled position (e.g. from a snapshot) and update exposures above it."""
+        leaf = self.leaf(path)
+        delta = abs(quantity * avg_price) - abs(leaf.quantity * leaf.avg_price)
+        leaf.quantity, leaf.avg_price = quantity, avg_price
+        node = leaf
+        while node is not None:
+            node.exposure += delta
+            node = node.parent
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """All nodes with their limits and aggregates (for dashboards/debugging)."""
+        return [self.root.to_dict()] + [
+            {**node.to_dict(), "path": list(key)} for key, node in self.children.items()
+        ]
@@ -1,108 +1,373 @@
+import time
 import uuid
 import logging
-from typing import Dict, Any
+from collections import OrderedDict
+from contextlib import nullcontext
+from typing import Dict, Any, List, Optional, Sequence
+import numpy as np
 
+from common.config import (
+    DEFAULT_ACCOUNT,
+    FIRM_NOTIONAL_LIMIT,
+    ACCOUNT_NOTIONAL_LIMIT,
+    STRATEGY_NOTIONAL_LIMIT,
+    SYMBOL_NOTIONAL_LIMIT,
+    SYMBOL_POSITION_LIMIT,
+)
+from common.histogram import LatencyHistogram
+from common.journal import FILL_EVENT
+from common.metrics import REGISTRY
 from common.utils import setup_logger
+from market_data.schemas import Fill, Order
+from risk.limits import LimitNode, LimitPath, LimitTree, apply_to_position
+from risk.batch import ACCEPTED, ORDER_TRACKING_LIMIT, BatchCheckResult, evaluate, side_codes
+from risk.shared_limits import SharedFirmRisk
 
 logger = setup_logger(__name__)
 
+RISK_CHECKS = REGISTRY.counter(
+    "risk_checks_total", "Pre-trade risk checks by outcome", ("symbol", "strategy", "status")
+)
+RISK_REJECTS = REGISTRY.counter("risk_rejects_total", "Risk rejections by reason", ("reason",))
+
+
+def _headroom(node: LimitNode) -> float:
+    """Notional a limit node can still take (inf when it has no limit)."""
+    if node.notional_limit is None:
+        return np.inf
+    return node.notional_limit - node.exposure - node.open_notional
+
+
 class RiskEngine:
-    def __init__(self, position_limit: int = 10000, notional_limit: int = 50000000):
+    def __init__(self, position_limit: int = 10000, notional_limit: int = 50000000,
+                 max_tracked_orders: int = 10000, limits: Optional[LimitTree] = None,
+                 firm_risk: Optional[SharedFirmRisk] = None):
         self.position_limit = position_limit
         self.notional_limit = notional_limit
         self.positions: Dict[str, Dict[str, Any]] = {}  # {symbol: {quantity: int, avg_price: float}}
-        self.orders: Dict[str, Dict[str, Any]] = {}     # {order_id: {details}}
-        
-    def check_order(self, order: Dict[str, Any]) -> Dict[str, Any]:
+        # Live (approved, not yet filled/rejected) orders only, oldest first,
+        # with the limit path their reservation was made on
+        self.orders: "OrderedDict[str, LimitPath]" = OrderedDict()  # {order_id: (account, strategy, symbol)}
+        self.max_tracked_orders = max_tracked_orders
+        # Running aggregates over positions, maintained in apply_fill
+        self.gross_notional = 0.0  # sum(|quantity * avg_price|)
+        self.net_notional = 0.0    # sum(quantity * avg_price)
+        # Firm/account/strategy/symbol limits on top of the global checks above
+        self.limits = limits if limits is not None else LimitTree(
+            firm_notional=FIRM_NOTIONAL_LIMIT,
+            account_notional=ACCOUNT_NOTIONAL_LIMIT,
+            strategy_notional=STRATEGY_NOTIONAL_LIMIT,
+            symbol_notional=SYMBOL_NOTIONAL_LIMIT,
+            symbol_position=SYMBOL_POSITION_LIMIT,
+        )
+        # Sharded mode: firm-wide limit enforced across worker processes
+        self.firm_risk = firm_risk
+        self.check_latency = LatencyHistogram()
+        self.batch_check_latency = LatencyHistogram()
+        # Integer symbol IDs for the columnar check_orders API
+        self.symbols: List[str] = []
+        self.symbol_index: Dict[str, int] = {}
+
+    @staticmethod
+    def limit_path(order) -> LimitPath:
+        """(account, strategy, symbol) used to place an Order or Fill in the limit tree."""
+        return (
+            order.account or DEFAULT_ACCOUNT,
+            order.strategy or "",
+            order.symbol,
+        )
+
+    def check_order(self, order: Order) -> Order:
         """
         Performs pre-trade risk checks on a new order.
-        Returns a dictionary with a 'status' and 'reason' for rejection if applicable.
+        Sets the order's 'status' (APPROVED/REJECTED), 'reason' for rejection
+        and, when approved, a fresh 'order_id' in place, and returns it.
+        Check latency is recorded in ``self.check_latency``.
         """
-        symbol = order.get("symbol")
-        quantity = order.get("quantity")
-        order_type = order.get("order_type")
-        price = order.get("price")
-        side = order.get("side")
+        start = time.perf_counter_ns()
+        try:
+            return self._check_order(order)
+        finally:
+            self.check_latency.record(time.perf_counter_ns() - start)
+            RISK_CHECKS.labels(order.symbol, order.strategy, order.status).inc()
+            if order.status == "REJECTED":
+                # Drop per-order detail (e.g. exception text) to keep the label set small
+                RISK_REJECTS.labels((order.reason or "").split(":")[0]).inc()
+
+    @staticmethod
+    def _reject(order: Order, reason: str) -> Order:
+        order.status = "REJECTED"
+        order.reason = reason
+        return order
+
+    def _check_order(self, order: Order) -> Order:
+        symbol = order.symbol
+        quantity = order.quantity
+        order_type = order.order_type
+        price = order.price
+        side = order.side
         order_id = str(uuid.uuid4())
-        
-        # Add order to internal tracking
-        self.orders[order_id] = order
-        
+
         try:
             # Check for required fields
             required_fields = [symbol, quantity, order_type, price, side]
             if any(field is None for field in required_fields):
                 logger.warning(f"Order missing required fields: {order}")
-                return {**order, "status": "REJECTED", "reason": "MISSING_FIELDS"}
+                return self._reject(order, "MISSING_FIELDS")
 
             # Check position limits
             current_position = self.positions.get(symbol, {"quantity": 0})["quantity"]
             if side == "BUY" and current_position + quantity > self.position_limit:
                 logger.warning(f"Order {order_id} rejected due to position limit.")
-                return {**order, "status": "REJECTED", "reason": "POSITION_LIMIT"}
+                return self._reject(order, "POSITION_LIMIT")
             
             if side == "SELL" and current_position - quantity < -self.position_limit:
                 logger.warning(f"Order {order_id} rejected due to position limit.")
-                return {**order, "status": "REJECTED", "reason": "POSITION_LIMIT"}
+                return self._reject(order, "POSITION_LIMIT")
                 
             # Check notional limits (use absolute positions)
             notional_value = quantity * price
-            current_notional = sum(abs(pos["quantity"] * pos["avg_price"]) for pos in self.positions.values())
-            if current_notional + notional_value > self.notional_limit:
+            if self.gross_notional + notional_value > self.notional_limit:
                 logger.warning(f"Order {order_id} rejected due to notional limit.")
-                return {**order, "status": "REJECTED", "reason": "NOTIONAL_LIMIT"}
-            
-            logger.info(f"Order passed risk checks: {order_id}")
-            return {**order, "order_id": order_id, "status": "APPROVED"}
+                return self._reject(order, "NOTIONAL_LIMIT")
+
+            # Hierarchical limits (firm/account/strategy/symbol)
+            path = self.limit_path(order)
+            reason = self.limits.check(path, side, quantity, notional_value)
+            if reason:
+                logger.warning(f"Order {order_id} rejected due to {reason}.")
+                return self._reject(order, reason)
+
+            # Every live order's reservation must stay in the limit tree, so a
+            # full tracking table rejects new orders rather than dropping one
+            if len(self.orders) >= self.max_tracked_orders:
+                logger.warning(f"Order {order_id} rejected: {len(self.orders)} live orders tracked (max).")
+                return self._reject(order, "ORDER_TRACKING_LIMIT")
+
+            # Track the order until it fills or is rejected downstream
+            if self.firm_risk is None:
+                self._track_order(order_id, path, side, quantity, notional_value)
+            elif not self.firm_risk.try_reserve(
+                self.limits.root, notional_value,
+                lambda: self._track_order(order_id, path, side, quantity, notional_value),
+            ):
+                logger.warning(f"Order {order_id} rejected due to shared FIRM_NOTIONAL_LIMIT.")
+                return self._reject(order, "FIRM_NOTIONAL_LIMIT")
+
+            logger.info("Order passed risk checks: %s", order_id)
+            order.order_id = order_id
+            order.status = "APPROVED"
+            return order
             
         except Exception as e:
             logger.error(f"Risk check failed for order {order}: {e}")
-            return {**order, "status": "REJECTED", "reason": f"INVALID_ORDER: {e}"}
+            return self._reject(order, f"INVALID_ORDER: {e}")
+
+    def _track_order(self, order_id: str, path: LimitPath, side: str, quantity: int, notional: float):
+        self.orders[order_id] = path
+        self.limits.on_accept(order_id, path, side, quantity, notional)
 
-    def apply_fill(self, fill: Dict[str, Any]):
+    def _publish_firm(self):
+        if self.firm_risk is not None:
+            self.firm_risk.publish(self.limits.root)
+
+    def symbol_id(self, symbol: str) -> int:
+        """Integer ID for a symbol, assigned on first use."""
+        sid = self.symbol_index.get(symbol)
+        if sid is None:
+            sid = self.symbol_index[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+        return sid
+
+    def check_orders(
+        self,
+        symbol_ids: Sequence[int],
+        sides: Sequence[Any],
+        quantities: Sequence[int],
+        prices: Sequence[float],
+        strategy: str = "",
+        account: Optional[str] = None,
+    ) -> BatchCheckResult:
+        """
+        Pre-trade checks for a basket of orders given as columnar arrays.
+        Symbol IDs come from symbol_id() (anything else raises ValueError);
+        sides are "BUY"/"SELL" or +1/-1.
+        Orders are judged in array order and each one sees the cumulative
+        effect of the earlier accepted orders in the batch, including on the
+        global position/notional limits (which check_order applies to filled
+        positions only). Accepted orders are tracked like single orders and
+        get an order_id in the result.
+        """
+        start = time.perf_counter_ns()
+        symbol_ids = np.asarray(symbol_ids, dtype=np.int64)
+        sides = side_codes(sides)
+        quantities = np.asarray(quantities, dtype=np.int64)
+        prices = np.asarray(prices, dtype=np.float64)
+        if not len(symbol_ids):
+            self.batch_check_latency.record(time.perf_counter_ns() - start)
+            return BatchCheckResult(np.zeros(0, dtype=np.int8), [])
+        # A negative ID would silently index from the end and check the wrong symbol
+        if symbol_ids.min() < 0 or symbol_ids.max() >= len(self.symbols):
+            raise ValueError(
+                f"symbol_ids out of range [0, {len(self.symbols)}): min {symbol_ids.min()}, max {symbol_ids.max()}"
+            )
+
+        account = account or DEFAULT_ACCOUNT
+        size = len(self.symbols)
+        position = np.zeros(size)
+        leaf_quantity = np.zeros(size)
+        leaf_open_buy = np.zeros(size)
+        leaf_open_sell = np.zeros(size)
+        leaf_position_limit = np.full(size, np.inf)
+        leaf_notional_headroom = np.full(size, np.inf)
+
+        # Gather state for the symbols in this batch only
+        leaves: Dict[int, LimitNode] = {}
+        for sid in np.unique(symbol_ids).tolist():
+            symbol = self.symbols[sid]
+            position[sid] = self.positions.get(symbol, {"quantity": 0})["quantity"]
+            leaf = leaves[sid] = self.limits.leaf((account, strategy, symbol))
+            leaf_quantity[sid] = leaf.quantity
+            leaf_open_buy[sid] = leaf.open_buy_qty
+            leaf_open_sell[sid] = leaf.open_sell_qty
+            if leaf.position_limit is not None:
+                leaf_position_limit[sid] = leaf.position_limit
+            leaf_notional_headroom[sid] = _headroom(leaf)
+
+        strategy_node = next(iter(leaves.values())).parent
+        root = self.limits.root
+        firm = self.firm_risk
+        # The shared firm check and the reservations must not interleave with
+        # other workers', so hold the firm lock over both
+        with firm.lock if firm is not None else nullcontext():
+            firm_headroom = _headroom(root)
+            if firm is not None:
+                firm_headroom = min(firm_headroom, firm.headroom(root))
+            path_headroom = np.array([
+                _headroom(strategy_node), _headroom(strategy_node.parent), firm_headroom
+            ])
+
+            codes = evaluate(
+                symbol_ids, sides, quantities, prices,
+                position, self.position_limit, self.notional_limit - self.gross_notional,
+                leaf_quantity, leaf_open_buy, leaf_open_sell,
+                leaf_position_limit, leaf_notional_headroom, path_headroom,
+            )
+
+            order_ids: List[Optional[str]] = [None] * len(codes)
+            accepted = np.flatnonzero(codes == ACCEPTED)
+            # As check_order would: accepted orders past the tracking cap are rejected. Orders
+            # after them were judged against usage that is now not booked, so none is too lax
+            capacity = max(0, self.max_tracked_orders - len(self.orders))
+            if len(accepted) > capacity:
+                codes[accepted[capacity:]] = ORDER_TRACKING_LIMIT
+                accepted = accepted[:capacity]
+                logger.warning("Batch risk check: %d live orders tracked (max), rest rejected", len(self.orders))
+            for i, sid, side_code, quantity, price in zip(
+                accepted.tolist(), symbol_ids[accepted].tolist(), sides[accepted].tolist(),
+                quantities[accepted].tolist(), prices[accepted].tolist(),
+            ):
+                symbol = self.symbols[sid]
+                side = "BUY" if side_code > 0 else "SELL"
+                order_id = order_ids[i] = str(uuid.uuid4())
+                self._track_order(order_id, (account, strategy, symbol), side, quantity, quantity * price)
+            if firm is not None:
+                firm.store(root)
+
+        self.batch_check_latency.record(time.perf_counter_ns() - start)
+        logger.info("Batch risk check: %d/%d orders accepted", len(codes) - int(np.count_nonzero(codes)), len(codes))
+        return BatchCheckResult(codes, order_ids)
+
+    def apply_fill(self, fill: Fill):
         """
         Updates positions based on a received fill and returns realized PnL for the fill.
         """
-        symbol = fill["symbol"]
-        filled_quantity = fill["quantity"]
-        filled_price = fill["price"]
-        side = fill["side"]
+        realized_pnl = self._apply_fill(fill)
+        position = self.positions[fill.symbol]
+        logger.info(
+            "Updated position for %s: quantity=%s, avg_price=$%.2f, realized_pnl=%.2f",
+            fill.symbol, position["quantity"], position["avg_price"], realized_pnl
+        )
+        return realized_pnl
+
+    def _apply_fill(self, fill: Fill) -> float:
+        """apply_fill without logging (also used to replay the journal)."""
+        symbol = fill.symbol
+        filled_quantity = fill.quantity
+        filled_price = fill.price
+        side = fill.side
 
         if symbol not in self.positions:
             self.positions[symbol] = {"quantity": 0, "avg_price": 0.0}
 
         current_pos = self.positions[symbol]["quantity"]
         current_avg_price = self.positions[symbol]["avg_price"]
-        realized_pnl = 0.0
-
-        if side == "BUY":
-            # If reducing a short position
-            if current_pos < 0:
-                closed_qty = min(abs(current_pos), filled_quantity)
-                realized_pnl = (current_avg_price - filled_price) * closed_qty
-            new_quantity = current_pos + filled_quantity
-            if new_quantity != 0:
-                new_avg_price = (current_pos * current_avg_price + filled_quantity * filled_price) / new_quantity
-            else:
-                new_avg_price = 0.0
-        else:  # SELL
-            # If reducing a long position
-            if current_pos > 0:
-                closed_qty = min(current_pos, filled_quantity)
-                realized_pnl = (filled_price - current_avg_price) * closed_qty
-            new_quantity = current_pos - filled_quantity
-            # For a sell, we assume FIFO accounting; average price stays the same unless flat
-            new_avg_price = current_avg_price if new_quantity != 0 else 0.0
+        new_quantity, new_avg_price, realized_pnl = apply_to_position(
+            current_pos, current_avg_price, side, filled_quantity, filled_price
+        )
+
+        old_notional = current_pos * current_avg_price
+        new_notional = new_quantity * new_avg_price
+        self.gross_notional += abs(new_notional) - abs(old_notional)
+        self.net_notional += new_notional - old_notional
 
         self.positions[symbol]["quantity"] = new_quantity
         self.positions[symbol]["avg_price"] = new_avg_price
 
-        logger.info(
-            f"Updated position for {symbol}: quantity={self.positions[symbol]['quantity']}, "
-            f"avg_price=${self.positions[symbol]['avg_price']:.2f}, realized_pnl={realized_pnl:.2f}"
-        )
+        # The exchange sends one fill per order, so the order is now terminal
+        order_id = fill.order_id
+        path = self.orders.pop(order_id, None) or self.limit_path(fill)
+        self.limits.on_fill(order_id, path, side, filled_quantity, filled_price)
+        self._publish_firm()
         return realized_pnl
 
+    def release_order(self, order_id: str):
+        """Stop tracking an order that ended without a fill (rejected/cancelled)."""
+        self.orders.pop(order_id, None)
+        self.limits.on_cancel(order_id)
+        self._publish_firm()
+
+    def get_check_latency(self) -> Dict[str, float]:
+        """check_order latency percentiles in microseconds."""
+        return self.check_latency.summary()
+
+    def recompute_notional(self):
+        """Rebuild the notional aggregates from positions (O(symbols), for audits)."""
+        self.gross_notional = sum(abs(pos["quantity"] * pos["avg_price"]) for pos in self.positions.values())
+        self.net_notional = sum(pos["quantity"] * pos["avg_price"] for pos in self.positions.values())
+
+    def snapshot_state(self) -> Dict[str, Any]:
+        """Filled positions (global and per limit path) for a journal snapshot.
+
+        Open order reservations are not included: orders that were live when
+        the process stopped are cancelled on recovery.
+        """
+        return {
+            "positions": {symbol: dict(pos) for symbol, pos in self.positions.items() if pos["quantity"]},
+            "limit_positions": [
+                [*path, node.quantity, node.avg_price]
+                for path, node in self.limits.children.items()
+                if len(path) == 3 and node.quantity
+            ],
+        }
+
+    def restore_state(self, state: Dict[str, Any]):
+        """Load positions from ``snapshot_state`` output into an empty engine."""
+        self.positions = {symbol: dict(pos) for symbol, pos in state.get("positions", {}).items()}
+        self.recompute_notional()
+        for account, strategy, symbol, quantity, avg_price in state.get("limit_positions", []):
+            self.limits.restore_position((account, strategy, symbol), quantity, avg_price)
+        self._publish_firm()
+
+    def replay(self, events) -> int:
+        """Re-apply journaled fills (seq, type, payload) on top of restored state."""
+        fills = 0
+        for _, event_type, payload in events:
+            if event_type == FILL_EVENT:
+                self._apply_fill(Fill.from_dict(payload))
+                fills += 1
+        return fills
+
     def get_positions(self) -> Dict[str, Dict[str, Any]]:
         """
         Returns the current position data.
@@ -0,0 +1,120 @@
+"""Firm-wide notional aggregates shared between sharded worker processes."""
+
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from typing import Callable, Dict, Optional
+import numpy as np
+
+from common.utils import setup_logger
+from risk.limits import LimitNode
+
+logger = setup_logger(__name__)
+
+# Columns of the shared array, one row per worker
+EXPOSURE, OPEN_NOTIONAL = 0, 1
+
+
+class SharedFirmRisk:
+    """One row per worker holding its firm-level exposure and open notional.
+
+    Each worker owns one row and publishes its LimitTree root into it; a firm
+    check sums every row, so symbols must be partitioned across workers (a
+    symbol's position lives in exactly one row). Check-and-reserve runs under
+    one cross-process lock so concurrent workers cannot jointly overshoot the
+    limit. The creating process (the coordinator) unlinks the block on close.
+
+    Pass ``for_worker(i)`` to worker i as a Process argument; it re-attaches
+    to the same block when unpickled in the child.
+    """
+
+    def __init__(self, n_workers: int, firm_limit: Optional[float], ctx=None):
+        ctx = ctx or mp.get_context()
+        self.n_workers = n_workers
+        self.firm_limit = firm_limit
+        self.lock = ctx.Lock()
+        self.slot: Optional[int] = None
+        self._owner = True
+        self._shm = shared_memory.SharedMemory(create=True, size=n_workers * 2 * 8)
+        self._attach_array()
+        self.values[:] = 0.0
+
+    def _attach_array(self):
+        self.values = np.ndarray((self.n_workers, 2), dtype=np.float64, buffer=self._shm.buf)
+
+    def for_worker(self, slot: int) -> "SharedFirmRisk":
+        """Handle for worker ``slot`` (same block and lock)."""
+        handle = object.__new__(SharedFirmRisk)
+        handle.__dict__.update(self.__dict__)
+        handle.slot = slot
+        handle._owner = False
+        return handle
+
+    def __getstate__(self) -> Dict:
+        return {
+            "name": self._shm.name, "n_workers": self.n_workers, "firm_limit": self.firm_limit,
+            "lock": self.lock, "slot": self.slot,
+        }
+
+    def __setstate__(self, state: Dict):
+        self.n_workers = state["n_workers"]
+        self.firm_limit = state["firm_limit"]
+        self.lock = state["lock"]
+        self.slot = state["slot"]
+        self._owner = False
+        # Workers started by multiprocessing share the coordinator's resource
+        # tracker, so attaching does not add a second owner for the block
+        self._shm = shared_memory.SharedMemory(name=state["name"])
+        self._attach_array()
+
+    def _others(self) -> float:
+        """Exposure + open notional of every worker except this one (lock held)."""
+        return float(self.values.sum()) - float(self.values[self.slot].sum())
+
+    def store(self, root: LimitNode):
+        """Write this worker's row (call with the lock held)."""
+        row = self.values[self.slot]
+        row[EXPOSURE] = root.exposure
+        row[OPEN_NOTIONAL] = root.open_notional
+
+    def headroom(self, root: LimitNode) -> float:
+        """Firm notional still available to this worker (call with the lock held)."""
+        if self.firm_limit is None:
+            return np.inf
+        return self.firm_limit - self._others() - root.exposure - root.open_notional
+
+    def try_reserve(self, root: LimitNode, notional: float, reserve: Callable[[], None]) -> bool:
+        """Run ``reserve`` (which books the order on ``root``) only if the firm limit allows it."""
+        with self.lock:
+            if notional > self.headroom(root):
+                return False
+            reserve()
+            self.store(root)
+        return True
+
+    def publish(self, root: LimitNode):
+        """Publish this worker's firm aggregates after a fill, cancel or restore."""
+        with self.lock:
+            self.store(root)
+
+    def release(self, slot: int):
+        """Zero a worker's row once it has exited (coordinator side), freeing its reservations."""
+        with self.lock:
+            self.values[slot] = 0.0
+
+    def totals(self) -> Dict[str, float]:
+        """Firm-wide aggregates across all workers."""
+        with self.lock:
+            exposure = float(self.values[:, EXPOSURE].sum())
+            open_notional = float(self.values[:, OPEN_NOTIONAL].sum())
+        return {
+            "exposure": exposure,
+            "open_notional": open_notional,
+            "firm_limit": self.firm_limit,
+            "utilization": (exposure + open_notional) / self.firm_limit if self.firm_limit else 0.0,
+        }
+
+    def close(self):
+        self.values = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
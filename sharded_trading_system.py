@@ -0,0 +1,177 @@
+"""Sharded trading system - symbols split across worker processes.
+
+Each worker runs a full TradingSystem (feed handler subscribed to its own
+symbols, order book, strategies, risk, OMS, journal) in shards/shard-<i>.
+The coordinator (this process) owns the shared-memory firm aggregates that
+every worker's RiskEngine checks against, and reports firm utilisation.
+
+    python sharded_trading_system.py --workers 4
+"""
+
+import argparse
+import asyncio
+import multiprocessing as mp
+import os
+import signal
+import time
+import zlib
+from typing import List, Optional, Sequence
+
+from common.config import (
+    FIRM_NOTIONAL_LIMIT,
+    METRICS_ENABLED,
+    METRICS_HOST,
+    METRICS_PORT,
+    SHARD_DIR,
+    SHARD_MONITOR_INTERVAL,
+    SHARD_STOP_TIMEOUT,
+    SHARD_WORKERS,
+    SYMBOLS,
+)
+from common.metrics import REGISTRY, Family, start_http_server
+from common.utils import setup_logger
+from risk.shared_limits import SharedFirmRisk
+
+logger = setup_logger(__name__)
+
+
+def shard_of(symbol: str, n_shards: int) -> int:
+    """Stable shard index for a symbol (the same in every process and run)."""
+    return zlib.crc32(symbol.encode()) % n_shards
+
+
+def shard_symbols(symbols: Sequence[str], n_shards: int) -> List[List[str]]:
+    """Partition symbols into ``n_shards`` lists by shard_of."""
+    shards: List[List[str]] = [[] for _ in range(n_shards)]
+    for symbol in symbols:
+        shards[shard_of(symbol, n_shards)].append(symbol)
+    return shards
+
+
+def run_worker(index: int, symbols: List[str], firm_risk: SharedFirmRisk, root: str):
+    """Worker process entry point: one TradingSystem for one shard."""
+    workdir = os.path.join(root, f"shard-{index}")
+    os.makedirs(workdir, exist_ok=True)
+    # DB, journal and archive paths are relative, so each shard gets its own
+    os.chdir(workdir)
+    from main_trading_system import TradingSystem
+
+    logger.info(f"Shard {index} starting with {len(symbols)} symbols: {', '.join(symbols)}")
+    system = TradingSystem(symbols=symbols, firm_risk=firm_risk, metrics_port=METRICS_PORT + 1 + index)
+    try:
+        asyncio.run(system.run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        firm_risk.close()
+
+
+class ShardCoordinator:
+    def __init__(
+        self,
+        n_workers: int = SHARD_WORKERS,
+        symbols: Sequence[str] = SYMBOLS,
+        firm_limit: Optional[float] = FIRM_NOTIONAL_LIMIT,
+        root: str = SHARD_DIR,
+    ):
+        # Shards that would get no symbols are not started
+        self.shards = [shard for shard in shard_symbols(symbols, n_workers) if shard]
+        self.root = os.path.abspath(root)
+        self.ctx = mp.get_context("spawn")
+        self.firm_risk = SharedFirmRisk(len(self.shards), firm_limit, ctx=self.ctx)
+        self.workers: List[mp.Process] = []
+        self._released = set()  # worker indexes whose shared row has been zeroed
+        self.metrics_server = None
+        REGISTRY.register_collector("shards", self.collect_metrics)
+
+    def collect_metrics(self) -> List[Family]:
+        totals = self.firm_risk.totals()
+        return [
+            Family("firm_exposure", "gauge", "Gross filled notional across shards", (), [((), totals["exposure"])]),
+            Family("firm_open_notional", "gauge", "Open order notional across shards", (),
+                   [((), totals["open_notional"])]),
+            Family("firm_utilization", "gauge", "Fraction of the firm notional limit in use", (),
+                   [((), totals["utilization"])]),
+            Family("shard_workers_alive", "gauge", "Shard processes running", (),
+                   [((), sum(worker.is_alive() for worker in self.workers))]),
+        ]
+
+    def start(self):
+        for index, symbols in enumerate(self.shards):
+            worker = self.ctx.Process(
+                target=run_worker,
+                args=(index, symbols, self.firm_risk.for_worker(index), self.root),
+                name=f"shard-{index}",
+            )
+            worker.start()
+            self.workers.append(worker)
+        logger.info(f"Started {len(self.workers)} shard workers")
+        if METRICS_ENABLED:
+            self.metrics_server = start_http_server(METRICS_PORT, METRICS_HOST)
+
+    def monitor(self, interval: float = SHARD_MONITOR_INTERVAL):
+        """Report firm aggregates until every worker has exited."""
+        while any(worker.is_alive() for worker in self.workers):
+            time.sleep(interval)
+            self._reap()
+            totals = self.firm_risk.totals()
+            alive = sum(worker.is_alive() for worker in self.workers)
+            logger.info(
+                f"Firm exposure ${totals['exposure']:,.0f} + open ${totals['open_notional']:,.0f} "
+                f"({totals['utilization']:.1%} of limit), {alive}/{len(self.workers)} shards alive"
+            )
+
+    def _reap(self):
+        """Zero the shared row of every worker that has exited, so its reservations don't hold firm headroom."""
+        for index, worker in enumerate(self.workers):
+            if index in self._released or worker.is_alive():
+                continue
+            self.firm_risk.release(index)
+            self._released.add(index)
+            if worker.exitcode:
+                logger.warning(f"Shard {index} exited with code {worker.exitcode}; its firm reservations were released")
+
+    def stop(self, interrupted: bool = False, timeout: float = SHARD_STOP_TIMEOUT):
+        """Let workers finish TradingSystem.run's cleanup (OMS flush, snapshots, journal close).
+
+        ``interrupted``: the workers already got SIGINT (Ctrl-C reaches the whole
+        process group); otherwise it is sent here. Workers still running after
+        ``timeout`` seconds are terminated.
+        """
+        if not interrupted:
+            for worker in self.workers:
+                if worker.is_alive():
+                    os.kill(worker.pid, signal.SIGINT)
+        deadline = time.monotonic() + timeout
+        for worker in self.workers:
+            worker.join(max(0.0, deadline - time.monotonic()))
+        for worker in self.workers:
+            if worker.is_alive():
+                logger.warning(f"{worker.name} did not stop within {timeout:.0f}s; terminating")
+                worker.terminate()
+                worker.join()
+        self._reap()
+        if self.metrics_server is not None:
+            self.metrics_server.shutdown()
+        self.firm_risk.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the trading system sharded by symbol.")
+    parser.add_argument("--workers", type=int, default=SHARD_WORKERS)
+    args = parser.parse_args()
+
+    coordinator = ShardCoordinator(args.workers)
+    coordinator.start()
+    interrupted = False
+    try:
+        coordinator.monitor()
+    except KeyboardInterrupt:
+        interrupted = True
+        logger.info("Shutting down shards...")
+    finally:
+        coordinator.stop(interrupted)
+
+
+if __name__ == "__main__":
+    main()
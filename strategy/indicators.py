@@ -0,0 +1,288 @@
+"""Incremental indicators - fixed-memory, O(1) per-tick updates per symbol."""
+
+import math
+from collections import deque
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+# Indicator spec: (kind, book field, parameter)
+#   e.g. ("ema", "spread", 20) or ("zscore", "mid", 100)
+IndicatorSpec = Tuple[str, str, float]
+
+
+class EMA:
+    """Exponential moving average. ``span`` follows the pandas convention."""
+
+    __slots__ = ("alpha", "value", "count")
+
+    def __init__(self, span: float):
+        self.alpha = 2.0 / (span + 1.0)
+        self.value = None
+        self.count = 0
+
+    def update(self, x: float):
+        self.count += 1
+        if self.value is None:
+            self.value = x
+        else:
+            self.value += self.alpha * (x - self.value)
+        return self.value
+
+    @property
+    def ready(self) -> bool:
+        return self.count > 0
+
+
+class RollingMean:
+    """Rolling mean and standard deviation over a ring buffer.
+
+    Running sums are rebuilt from the buffer once per full wrap so float
+    drift stays bounded while updates remain amortised O(1).
+    """
+
+    __slots__ = ("window", "_buf", "_idx", "count", "_sum", "_sum_sq", "last")
+
+    def __init__(self, window: int):
+        window = int(window)
+        if window < 2:
+            raise ValueError("window must be at least 2")
+        self.window = window
+        self._buf: List[float] = [0.0] * window
+        self._idx = 0
+        self.count = 0
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self.last = None
+
+    def update(self, x: float):
+        old = self._buf[self._idx]
+        self._buf[self._idx] = x
+        self._idx += 1
+        if self.count < self.window:
+            self.count += 1
+            old = 0.0
+        self._sum += x - old
+        self._sum_sq += x * x - old * old
+        if self._idx == self.window:
+            self._idx = 0
+            self._sum = math.fsum(self._buf)
+            self._sum_sq = math.fsum(v * v for v in self._buf)
+        self.last = x
+        return self.value
+
+    @property
+    def ready(self) -> bool:
+        return self.count == self.window
+
+    @property
+    def mean(self):
+        return self._sum / self.count if self.count else None
+
+    @property
+    def std(self):
+        if self.count < 2:
+            return None
+        mean = self._sum / self.count
+        var = (self._sum_sq - self.count * mean * mean) / (self.count - 1)
+        return math.sqrt(var) if var > 0 else 0.0
+
+    @property
+    def zscore(self):
+        std = self.std
+        if not std:
+            return None
+        return (self.last - self.mean) / std
+
+    @property
+    def value(self):
+        return self.mean
+
+
+class RollingStd(RollingMean):
+    """Rolling standard deviation (e.g. spread volatility)."""
+
+    __slots__ = ()
+
+    @property
+    def value(self):
+        return self.std
+
+
+class RollingZScore(RollingMean):
+    """Z-score of the latest observation against its rolling window."""
+
+    __slots__ = ()
+
+    @property
+    def value(self):
+        return self.zscore
+
+
+class RollingMax:
+    """Rolling maximum using a monotonic deque (amortised O(1))."""
+
+    __slots__ = ("window", "_deque", "count")
+
+    def __init__(self, window: int):
+        self.window = int(window)
+        self._deque = deque()  # (seq, value), values non-increasing
+        self.count = 0
+
+    def _dominates(self, new: float, old: float) -> bool:
+        return new >= old
+
+    def update(self, x: float):
+        dq = self._deque
+        while dq and self._dominates(x, dq[-1][1]):
+            dq.pop()
+        dq.append((self.count, x))
+        self.count += 1
+        if dq[0][0] <= self.count - 1 - self.window:
+            dq.popleft()
+        return dq[0][1]
+
+    @property
+    def ready(self) -> bool:
+        return self.count >= self.window
+
+    @property
+    def value(self):
+        return self._deque[0][1] if self._deque else None
+
+
+class RollingMin(RollingMax):
+    """Rolling minimum using a monotonic deque (amortised O(1))."""
+
+    __slots__ = ()
+
+    def _dominates(self, new: float, old: float) -> bool:
+        return new <= old
+
+
+class ReturnVolatility:
+    """Rolling standard deviation of log returns (e.g. mid volatility)."""
+
+    __slots__ = ("_prev", "_returns")
+
+    def __init__(self, window: int):
+        self._prev = None
+        self._returns = RollingMean(window)
+
+    def update(self, x: float):
+        if self._prev is not None and self._prev > 0 and x > 0:
+            self._returns.update(math.log(x / self._prev))
+        self._prev = x
+        return self.value
+
+    @property
+    def ready(self) -> bool:
+        return self._returns.ready
+
+    @property
+    def value(self):
+        return self._returns.std
+
+
+INDICATOR_TYPES = {
+    "ema": EMA,
+    "mean": RollingMean,
+    "std": RollingStd,
+    "zscore": RollingZScore,
+    "max": RollingMax,
+    "min": RollingMin,
+    "volatility": ReturnVolatility,
+}
+
+
+class IndicatorEngine:
+    """Per-symbol indicator state shared by all registered strategies.
+
+    Strategies declare ``{name: spec}``; identical specs across strategies
+    share one instance, so each indicator is updated exactly once per tick.
+    A symbol only carries the specs of strategies subscribed to it (their
+    universe, or every symbol when it is None).
+    """
+
+    def __init__(self):
+        self.specs: Dict[IndicatorSpec, None] = {}        # ordered set of unique specs
+        self.owners: Dict[str, Dict[str, IndicatorSpec]] = {}
+        self.universes: Dict[str, Optional[FrozenSet[str]]] = {}  # owner -> symbols (None: all)
+        self.states: Dict[str, Dict[IndicatorSpec, Any]] = {}  # symbol -> spec -> indicator
+        self._needed: Dict[str, Tuple[IndicatorSpec, ...]] = {}  # symbol -> specs its subscribers use
+        self._views: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+    def register(self, owner: str, specs: Dict[str, IndicatorSpec], symbols: Optional[Iterable[str]] = None):
+        """Register the indicators a strategy needs, for ``symbols`` (default: every symbol)."""
+        for name, spec in specs.items():
+            kind, field, _ = spec
+            if kind not in INDICATOR_TYPES:
+                raise ValueError(f"Unknown indicator kind '{kind}' for {owner}.{name}")
+        self.owners[owner] = {name: tuple(spec) for name, spec in specs.items()}
+        self.universes[owner] = frozenset(symbols) if symbols is not None else None
+        self._rebuild()
+
+    def unregister(self, owner: str):
+        """Drop a strategy's indicators (shared ones stay while another strategy uses them)."""
+        self.owners.pop(owner, None)
+        self.universes.pop(owner, None)
+        self._rebuild()
+
+    def _rebuild(self):
+        self.specs = {spec: None for owned in self.owners.values() for spec in owned.values()}
+        self._needed.clear()
+        self._views.clear()
+        # Existing symbols gain instances for new specs and lose unused ones
+        for symbol, state in self.states.items():
+            needed = self.needed(symbol)
+            for spec in [spec for spec in state if spec not in needed]:
+                del state[spec]
+            self._ensure(symbol)
+
+    def needed(self, symbol: str) -> Tuple[IndicatorSpec, ...]:
+        """Specs used by the strategies subscribed to ``symbol`` (cached)."""
+        needed = self._needed.get(symbol)
+        if needed is None:
+            specs: Dict[IndicatorSpec, None] = {}
+            for owner, owned in self.owners.items():
+                universe = self.universes[owner]
+                if universe is None or symbol in universe:
+                    specs.update(dict.fromkeys(owned.values()))
+            needed = self._needed[symbol] = tuple(specs)
+        return needed
+
+    def _ensure(self, symbol: str) -> Dict[IndicatorSpec, Any]:
+        state = self.states.setdefault(symbol, {})
+        for spec in self.needed(symbol):
+            if spec not in state:
+                kind, _, param = spec
+                state[spec] = INDICATOR_TYPES[kind](param)
+        return state
+
+    def update(self, book: Dict[str, Any]):
+        """Feed one book update to every indicator for its symbol."""
+        if not self.specs:
+            return
+        symbol = book["symbol"]
+        state = self.states.get(symbol)
+        if state is None:
+            state = self._ensure(symbol)
+        for (kind, field, param), indicator in state.items():
+            x = book.get(field)
+            if x is not None:
+                indicator.update(x)
+
+    def view(self, owner: str, symbol: str) -> Dict[str, Any]:
+        """Name -> indicator mapping for one strategy and symbol."""
+        key = (owner, symbol)
+        view = self._views.get(key)
+        if view is None:
+            state = self._ensure(symbol)
+            view = {}
+            for name, spec in self.owners.get(owner, {}).items():
+                indicator = state.get(spec)
+                if indicator is None:
+                    # Symbol outside the owner's universe: built (and updated from now on) on request
+                    kind, _, param = spec
+                    indicator = state[spec] = INDICATOR_TYPES[kind](param)
+                view[name] = indicator
+            self._views[key] = view
+        return view
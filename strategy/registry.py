@@ -0,0 +1,125 @@
+"""Strategy registry - runs many strategy instances with per-symbol dispatch."""
+
+import time
+from typing import Any, Dict, Iterable, List, Optional
+from common.utils import setup_logger
+from market_data.schemas import Order
+from strategy.indicators import IndicatorEngine
+
+logger = setup_logger(__name__)
+
+
+class StrategyStats:
+    """Per-strategy timing and signal counters."""
+
+    __slots__ = ("calls", "signals", "errors", "total_ns", "max_ns")
+
+    def __init__(self):
+        self.calls = 0
+        self.signals = 0
+        self.errors = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "signals": self.signals,
+            "errors": self.errors,
+            "avg_us": (self.total_ns / self.calls / 1000) if self.calls else 0.0,
+            "max_us": self.max_ns / 1000,
+        }
+
+
+class StrategyRegistry:
+    """Holds strategy instances and routes each book update to interested ones.
+
+    A strategy exposes ``name``, ``symbols`` (an iterable of symbols, or None
+    for every symbol), ``indicators`` and ``generate_signal``. Ticks go through
+    a symbol -> strategies index, so a strategy only runs for its universe.
+    """
+
+    def __init__(self, indicators: Optional[IndicatorEngine] = None):
+        self.indicators = indicators if indicators is not None else IndicatorEngine()
+        self.strategies: Dict[str, Any] = {}
+        self.stats: Dict[str, StrategyStats] = {}
+        self._by_symbol: Dict[str, List[Any]] = {}
+        self._all_symbols: List[Any] = []
+        self._dispatch: Dict[str, List[Any]] = {}
+
+    def register(self, strategy, symbols: Optional[Iterable[str]] = None):
+        """Add a strategy. ``symbols`` overrides the strategy's own universe."""
+        name = strategy.name
+        if name in self.strategies:
+            raise ValueError(f"Strategy '{name}' is already registered")
+
+        universe = symbols if symbols is not None else getattr(strategy, "symbols", None)
+        self.strategies[name] = strategy
+        self.stats[name] = StrategyStats()
+        self.indicators.register(name, getattr(strategy, "indicators", {}), universe)
+
+        if universe is None:
+            self._all_symbols.append(strategy)
+        else:
+            for symbol in set(universe):
+                self._by_symbol.setdefault(symbol, []).append(strategy)
+        self._dispatch.clear()
+        logger.info(f"Registered strategy {name} ({'all symbols' if universe is None else f'{len(set(universe))} symbols'})")
+
+    def unregister(self, name: str):
+        """Remove a strategy by name."""
+        strategy = self.strategies.pop(name)
+        self.stats.pop(name, None)
+        self.indicators.unregister(name)
+        if strategy in self._all_symbols:
+            self._all_symbols.remove(strategy)
+        for symbol in list(self._by_symbol):
+            subscribers = self._by_symbol[symbol]
+            if strategy in subscribers:
+                subscribers.remove(strategy)
+                if not subscribers:
+                    del self._by_symbol[symbol]
+        self._dispatch.clear()
+
+    def strategies_for(self, symbol: str) -> List[Any]:
+        """Strategies interested in a symbol (cached)."""
+        targets = self._dispatch.get(symbol)
+        if targets is None:
+            targets = self._by_symbol.get(symbol, []) + self._all_symbols
+            self._dispatch[symbol] = targets
+        return targets
+
+    def on_book(self, book: Dict[str, Any], current_positions: Dict[str, int]) -> List[Order]:
+        """Run every interested strategy on a book update and collect their orders."""
+        symbol = book["symbol"]
+        targets = self.strategies_for(symbol)
+        if not targets:
+            return []
+
+        self.indicators.update(book)
+        signals = []
+        for strategy in targets:
+            name = strategy.name
+            stats = self.stats[name]
+            start = time.perf_counter_ns()
+            try:
+                signal = strategy.generate_signal(
+                    book, current_positions, self.indicators.view(name, symbol)
+                )
+            except Exception as e:
+                stats.errors += 1
+                logger.error(f"Error generating signal in {name}: {e}")
+                signal = None
+            elapsed = time.perf_counter_ns() - start
+            stats.calls += 1
+            stats.total_ns += elapsed
+            if elapsed > stats.max_ns:
+                stats.max_ns = elapsed
+            if signal:
+                stats.signals += 1
+                signals.append(signal)
+        return signals
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-strategy counters and timings."""
+        return {name: stats.to_dict() for name, stats in self.stats.items()}
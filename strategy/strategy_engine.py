@@ -40,21 +40,55 @@
 #         return None
 
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, Tuple
 from common.config import SPREAD_THRESHOLD, SPREAD_SELL_THRESHOLD, MAX_POSITION
 from common.utils import setup_logger, get_timestamp
+from tickerplant.spread_quantiles import SpreadQuantileTracker
+from strategy.indicators import IndicatorSpec
+from market_data.schemas import Order
 import uuid
 
 logger = setup_logger(__name__)
 
 class StrategyEngine:
-    def __init__(self):
-        self.name = "SimpleSpreadStrategy"
-
-    def generate_signal(self, book: Dict[str, Any], current_positions: Dict[str, int]) -> Optional[Dict[str, Any]]:
-        """Generate trading signal based on book data and current positions."""
-        logger.info(f"🔍 DEBUG - Raw book: {book}")
-        logger.info(f"🔍 DEBUG - Current positions: {current_positions}")
+    # Indicators this strategy needs, as {name: (kind, book field, parameter)}.
+    # They are maintained by strategy.indicators.IndicatorEngine and passed to
+    # generate_signal; the simple spread strategy only looks at the current book.
+    indicators: Dict[str, IndicatorSpec] = {}
+
+    def __init__(
+        self,
+        spread_quantiles: Optional[SpreadQuantileTracker] = None,
+        name: str = "SimpleSpreadStrategy",
+        symbols: Optional[Iterable[str]] = None,
+    ):
+        self.name = name
+        # Symbol universe for StrategyRegistry dispatch (None = every symbol)
+        self.symbols = list(symbols) if symbols is not None else None
+        # When set, BUY/SELL thresholds come from live per-symbol spread percentiles
+        self.spread_quantiles = spread_quantiles
+
+    def get_thresholds(self, symbol: str) -> Tuple[float, float]:
+        """Return (buy_threshold, sell_threshold) for a symbol."""
+        if self.spread_quantiles is not None:
+            live = self.spread_quantiles.thresholds(symbol)
+            if live is not None:
+                return live
+        return SPREAD_THRESHOLD, SPREAD_SELL_THRESHOLD
+
+    def generate_signal(
+        self,
+        book: Dict[str, Any],
+        current_positions: Dict[str, int],
+        indicators: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Order]:
+        """Generate trading signal based on book data and current positions.
+
+        ``indicators`` maps the names declared in ``self.indicators`` to their
+        live per-symbol instances (read ``.value`` / ``.ready``).
+        """
+        logger.debug("Raw book: %s", book)
+        logger.debug("Current positions: %s", current_positions)
         
         if not book:
             logger.debug("No order book data, skipping signal.")
@@ -65,47 +99,48 @@ class StrategyEngine:
         bid = book.get("bid")
         ask = book.get("ask")
         
-        logger.info(f"🔍 DEBUG - Extracted: symbol={symbol}, bid={bid}, ask={ask}")
+        logger.debug("Extracted: symbol=%s, bid=%s, ask=%s", symbol, bid, ask)
         
         if symbol is None or bid is None or ask is None:
-            logger.debug(f"Book missing required data: symbol={symbol}, bid={bid}, ask={ask}")
+            logger.debug("Book missing required data: symbol=%s, bid=%s, ask=%s", symbol, bid, ask)
             return None
 
         spread = ask - bid
         position = current_positions.get(symbol, 0)
+        buy_threshold, sell_threshold = self.get_thresholds(symbol)
 
-        logger.info(f"🔍 DEBUG - {symbol}: spread={spread:.4f}, position={position}")
-        logger.info(f"🔍 DEBUG - Thresholds: BUY<{SPREAD_THRESHOLD}, SELL>{SPREAD_SELL_THRESHOLD}, MAX_POS={MAX_POSITION}")
+        logger.debug("%s: spread=%.4f, position=%s", symbol, spread, position)
+        logger.debug("Thresholds: BUY<%s, SELL>%s, MAX_POS=%s", buy_threshold, sell_threshold, MAX_POSITION)
 
         # BUY signal: spread tight and position below limit
-        if spread < SPREAD_THRESHOLD and position < MAX_POSITION:
-            order = {
-                "order_id": str(uuid.uuid4()),
-                "symbol": symbol,
-                "side": "BUY",
-                "quantity": min(100, MAX_POSITION - position),
-                "price": ask,
-                "order_type": "LIMIT",
-                "timestamp": get_timestamp(),
-                "strategy": self.name
-            }
-            logger.info(f"🚀 BUY signal generated: {order}")
+        if spread < buy_threshold and position < MAX_POSITION:
+            order = Order(
+                order_id=str(uuid.uuid4()),
+                symbol=symbol,
+                side="BUY",
+                quantity=min(100, MAX_POSITION - position),
+                price=ask,
+                timestamp=get_timestamp(),
+                order_type="LIMIT",
+                strategy=self.name,
+            )
+            logger.info("🚀 BUY signal generated: %s", order)
             return order
 
         # SELL signal: spread wide and position > 0
-        if spread > SPREAD_SELL_THRESHOLD and position > 0:
-            order = {
-                "order_id": str(uuid.uuid4()),
-                "symbol": symbol,
-                "side": "SELL",
-                "quantity": min(100, position),
-                "price": bid,
-                "order_type": "LIMIT",
-                "timestamp": get_timestamp(),
-                "strategy": self.name
-            }
-            logger.info(f"🚀 SELL signal generated: {order}")
+        if spread > sell_threshold and position > 0:
+            order = Order(
+                order_id=str(uuid.uuid4()),
+                symbol=symbol,
+                side="SELL",
+                quantity=min(100, position),
+                price=bid,
+                timestamp=get_timestamp(),
+                order_type="LIMIT",
+                strategy=self.name,
+            )
+            logger.info("🚀 SELL signal generated: %s", order)
             return order
 
-        logger.debug(f"No signal for {symbol}: spread={spread:.4f}, position={position}")
+        logger.debug("No signal for %s: spread=%.4f, position=%s", symbol, spread, position)
         return None
\ No newline at end of file
@@ -0,0 +1,135 @@
+"""check_orders must decide a basket exactly as one check_order call per order would."""
+
+import math
+import random
+import pytest
+from market_data.schemas import Fill, Order
+from risk.batch import REJECT_REASONS
+from risk.limits import LimitTree
+from risk.risk_engine import RiskEngine
+
+SYMBOLS = [f"SYM{i}" for i in range(8)]
+STRATEGY = "basket"
+
+# Limit tree configurations: (firm, account, strategy, symbol notional, symbol position)
+TREE_LIMITS = [
+    (None, None, None, None, 300),
+    (None, None, None, 20_000, None),
+    (None, None, 120_000, None, None),
+    (None, 90_000, None, None, None),
+    (60_000, None, None, None, None),
+    (250_000, 300_000, 180_000, 30_000, 350),
+]
+
+
+def new_engine(tree=(None,) * 5, position_limit=10**6, notional_limit=10**9) -> RiskEngine:
+    firm, account, strategy, symbol_notional, symbol_position = tree
+    engine = RiskEngine(
+        position_limit=position_limit, notional_limit=notional_limit,
+        limits=LimitTree(
+            firm_notional=firm, account_notional=account, strategy_notional=strategy,
+            symbol_notional=symbol_notional, symbol_position=symbol_position,
+        ),
+    )
+    for symbol in SYMBOLS:
+        engine.symbol_id(symbol)
+    return engine
+
+
+def make_basket(seed: int, sides=("BUY", "SELL"), n: int = 60):
+    """Random basket; each symbol trades one way, so earlier orders never net against later ones."""
+    rng = random.Random(seed)
+    side_of = {sid: rng.choice(sides) for sid in range(len(SYMBOLS))}
+    symbol_ids = [rng.randrange(len(SYMBOLS)) for _ in range(n)]
+    return (
+        symbol_ids,
+        [side_of[sid] for sid in symbol_ids],
+        [rng.randint(1, 120) for _ in range(n)],
+        [round(rng.uniform(10, 200), 2) for _ in range(n)],
+    )
+
+
+def sequential_reasons(engine: RiskEngine, basket, fill: bool = False):
+    """check_order one order at a time; ``fill`` fills each approved order straight away."""
+    reasons = []
+    for sid, side, quantity, price in zip(*basket):
+        order = engine.check_order(Order(
+            order_id="", symbol=SYMBOLS[sid], side=side, quantity=quantity,
+            price=price, timestamp=0.0, strategy=STRATEGY,
+        ))
+        reasons.append(order.reason if order.status == "REJECTED" else None)
+        if fill and order.status == "APPROVED":
+            engine.apply_fill(Fill(
+                order_id=order.order_id, symbol=order.symbol, side=side, quantity=quantity,
+                price=price, timestamp=0.0, strategy=STRATEGY,
+            ))
+    return reasons
+
+
+@pytest.mark.parametrize("tree", TREE_LIMITS)
+@pytest.mark.parametrize("seed", range(5))
+def test_limit_tree_matches_sequential_check_order(tree, seed):
+    # Open reservations, as check_order makes them
+    basket = make_basket(seed)
+    result = new_engine(tree).check_orders(*basket, strategy=STRATEGY)
+    assert result.reasons() == sequential_reasons(new_engine(tree), basket)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_position_limit_matches_sequential_fills(seed):
+    # The global limits see earlier accepted orders as filled
+    basket = make_basket(seed)
+    result = new_engine(position_limit=400).check_orders(*basket, strategy=STRATEGY)
+    assert result.reasons() == sequential_reasons(new_engine(position_limit=400), basket, fill=True)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_notional_limit_matches_sequential_fills(seed):
+    # Long only: a short opened from flat keeps avg_price 0, so once filled
+    # it adds nothing to gross_notional while check_orders counts its notional
+    basket = make_basket(seed, sides=("BUY",))
+    result = new_engine(notional_limit=150_000).check_orders(*basket, strategy=STRATEGY)
+    assert result.reasons() == sequential_reasons(new_engine(notional_limit=150_000), basket, fill=True)
+
+
+def test_every_limit_is_exercised():
+    seen = set()
+    for seed in range(5):
+        for tree in TREE_LIMITS:
+            seen.update(new_engine(tree).check_orders(*make_basket(seed), strategy=STRATEGY).reasons())
+        seen.update(new_engine(position_limit=400).check_orders(*make_basket(seed), strategy=STRATEGY).reasons())
+        seen.update(new_engine(notional_limit=150_000).check_orders(
+            *make_basket(seed, sides=("BUY",)), strategy=STRATEGY).reasons())
+    expected = set(REJECT_REASONS.values()) - {"INVALID_ORDER", "ORDER_TRACKING_LIMIT"}
+    assert expected <= seen
+    assert None in seen
+
+
+def test_accepted_orders_are_tracked():
+    engine = new_engine(TREE_LIMITS[-1])
+    basket = make_basket(0)
+    result = engine.check_orders(*basket, strategy=STRATEGY)
+    accepted = [order_id for order_id in result.order_ids if order_id is not None]
+    assert len(accepted) == int(result.accepted.sum()) > 0
+    assert list(engine.orders) == accepted
+
+
+def test_invalid_orders_do_not_consume_limits():
+    engine = new_engine(position_limit=100)
+    result = engine.check_orders(
+        [0, 0, 0, 0, 0], ["BUY", "HOLD", "BUY", "BUY", "BUY"], [60, 10, 0, 40, 10], [10.0, 10.0, 10.0, math.nan, 10.0],
+        strategy=STRATEGY,
+    )
+    assert result.reasons() == [None, "INVALID_ORDER", "INVALID_ORDER", "INVALID_ORDER", None]
+
+
+def test_tracking_cap_rejects_the_rest_of_the_basket():
+    engine = new_engine()
+    engine.max_tracked_orders = 3
+    result = engine.check_orders([0, 1, 2, 3, 4], ["BUY"] * 5, [1] * 5, [10.0] * 5, strategy=STRATEGY)
+    assert result.reasons() == [None, None, None, "ORDER_TRACKING_LIMIT", "ORDER_TRACKING_LIMIT"]
+    assert len(engine.orders) == 3
+    order = engine.check_order(Order(
+        order_id="", symbol=SYMBOLS[5], side="BUY", quantity=1, price=10.0, timestamp=0.0, strategy=STRATEGY,
+    ))
+    assert (order.status, order.reason) == ("REJECTED", "ORDER_TRACKING_LIMIT")
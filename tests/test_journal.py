@@ -0,0 +1,90 @@
+"""EventJournal - replay after a crash leaves a torn or corrupt tail."""
+
+import os
+from common.journal import EventJournal, FILL_EVENT, ORDER_EVENT, RECORD_HEADER, STATUS_EVENT
+
+
+def write_events(directory, n):
+    journal = EventJournal(str(directory))
+    for i in range(n):
+        journal.append(ORDER_EVENT, {"order_id": f"ord-{i}", "quantity": 10})
+    journal.close()
+    (_, path), = journal.segments()
+    return path
+
+
+def test_replay_stops_before_truncated_tail(tmp_path):
+    path = write_events(tmp_path, 5)
+    # A crash in the middle of the last write
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 3)
+
+    journal = EventJournal(str(tmp_path))
+    assert journal.seq == 4
+    assert [seq for seq, _, _ in journal.replay()] == [1, 2, 3, 4]
+
+    # The torn bytes are cut off, so new records follow the last intact one
+    assert journal.append(STATUS_EVENT, {"order_id": "ord-3", "status": "CANCELED", "reason": None}) == 5
+    journal.close()
+    events = list(EventJournal(str(tmp_path)).replay())
+    assert [event_type for _, event_type, _ in events] == [ORDER_EVENT] * 4 + [STATUS_EVENT]
+    assert events[-1][2]["status"] == "CANCELED"
+
+
+def test_replay_stops_at_corrupt_record(tmp_path):
+    path = write_events(tmp_path, 5)
+    # Flip a payload byte of the last record: its checksum no longer matches
+    with open(path, "r+b") as f:
+        f.seek(-2, os.SEEK_END)
+        byte = f.read(1)
+        f.seek(-2, os.SEEK_END)
+        f.write(bytes([byte[0] ^ 0xFF]))
+
+    journal = EventJournal(str(tmp_path))
+    assert [payload["order_id"] for _, _, payload in journal.replay()] == ["ord-0", "ord-1", "ord-2", "ord-3"]
+    assert journal.append(FILL_EVENT, {"order_id": "ord-3", "quantity": 10}) == 5
+    journal.close()
+    assert [seq for seq, _, _ in EventJournal(str(tmp_path)).replay()] == [1, 2, 3, 4, 5]
+
+
+def test_partial_header_is_dropped(tmp_path):
+    path = write_events(tmp_path, 3)
+    with open(path, "ab") as f:
+        f.write(b"\x00" * (RECORD_HEADER.size - 1))
+
+    journal = EventJournal(str(tmp_path))
+    assert [seq for seq, _, _ in journal.replay()] == [1, 2, 3]
+    journal.close()
+
+
+def test_replay_after_snapshot_skips_covered_events(tmp_path):
+    journal = EventJournal(str(tmp_path))
+    for i in range(3):
+        journal.append(ORDER_EVENT, {"order_id": f"ord-{i}"})
+    journal.write_snapshot({"orders": 3})
+    journal.append(ORDER_EVENT, {"order_id": "ord-3"})
+    journal.close()
+
+    journal = EventJournal(str(tmp_path))
+    seq, state = journal.load_snapshot()
+    assert (seq, state) == (3, {"orders": 3})
+    assert [payload["order_id"] for _, _, payload in journal.replay(seq)] == ["ord-3"]
+    journal.close()
+
+
+def test_damaged_snapshot_falls_back_to_previous(tmp_path):
+    journal = EventJournal(str(tmp_path))
+    journal.append(ORDER_EVENT, {"order_id": "ord-0"})
+    journal.write_snapshot({"orders": 1})
+    journal.append(ORDER_EVENT, {"order_id": "ord-1"})
+    newest = journal.write_snapshot({"orders": 2})
+    journal.close()
+    with open(newest, "r+b") as f:
+        f.seek(-1, os.SEEK_END)
+        f.write(b"!")
+
+    journal = EventJournal(str(tmp_path))
+    seq, state = journal.load_snapshot()
+    assert (seq, state) == (1, {"orders": 1})
+    assert [payload["order_id"] for _, _, payload in journal.replay(seq)] == ["ord-1"]
+    journal.close()
@@ -0,0 +1,111 @@
+"""Warm restart - OMS and risk state rebuilt from a snapshot plus the journal tail."""
+
+import sqlite3
+import time
+import pytest
+from common.config import DB_PATH
+from market_data.schemas import Fill, Order
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    # Journal and database paths are relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def start():
+    from main_trading_system import TradingSystem
+    return TradingSystem()
+
+
+def send(system, symbol, side, quantity, price, strategy="SimpleSpreadStrategy"):
+    order = system.risk.check_order(Order(
+        order_id="", symbol=symbol, side=side, quantity=quantity, price=price,
+        timestamp=time.time(), strategy=strategy,
+    ))
+    assert order.status == "APPROVED", order.reason
+    return system.oms.submit_order(order)
+
+
+def fill(system, order, quantity=None):
+    system._apply_execution(order, Fill(
+        order_id=order.order_id, symbol=order.symbol, side=order.side,
+        quantity=order.quantity if quantity is None else quantity,
+        price=order.price, timestamp=time.time(), fill_id=f"{order.order_id}_fill",
+    ))
+
+
+def limit_positions(system):
+    return {path: (node.quantity, node.avg_price) for path, node in system.risk.limits.children.items()
+            if len(path) == 3 and node.quantity}
+
+
+def db_statuses():
+    conn = sqlite3.connect(DB_PATH)
+    rows = dict(conn.execute("SELECT order_id, status FROM orders").fetchall())
+    conn.close()
+    return rows
+
+
+def test_snapshot_plus_tail_restores_oms_and_risk(workdir):
+    system = start()
+    fill(system, send(system, "AAPL", "BUY", 100, 150.0))
+    fill(system, send(system, "MSFT", "SELL", 40, 300.0, strategy="Other"))
+    open_at_snapshot = send(system, "AAPL", "BUY", 50, 152.0)
+    system.journal.write_snapshot(system.snapshot_state())
+
+    # Tail: the order open at the snapshot fills, new fills and a partial,
+    # and one order is still working when the process dies
+    fill(system, open_at_snapshot)
+    fill(system, send(system, "AAPL", "SELL", 30, 155.0))
+    partial = send(system, "GOOG", "BUY", 20, 100.0)
+    fill(system, partial, quantity=5)
+    working = send(system, "MSFT", "BUY", 10, 301.0)
+
+    positions = {symbol: dict(pos) for symbol, pos in system.risk.get_positions().items()}
+    gross, net = system.risk.gross_notional, system.risk.net_notional
+    leaves = limit_positions(system)
+    system.journal.close()
+
+    recovered = start()
+    try:
+        assert recovered.risk.get_positions() == positions
+        assert recovered.risk.gross_notional == pytest.approx(gross)
+        assert recovered.risk.net_notional == pytest.approx(net)
+        assert limit_positions(recovered) == leaves
+        # Reservations of orders that were live at shutdown are not restored
+        assert not recovered.risk.orders
+
+        oms = recovered.oms
+        assert oms.get_order(open_at_snapshot.order_id).status == "FILLED"
+        assert oms.get_order(partial.order_id).status == "CANCELED"
+        assert oms.get_order(partial.order_id).filled_qty == 5
+        restarted = oms.get_order(working.order_id)
+        assert (restarted.status, restarted.reason) == ("CANCELED", "RECOVERY")
+        assert not oms.get_open_orders()
+
+        statuses = db_statuses()
+        assert statuses[open_at_snapshot.order_id] == "FILLED"
+        assert statuses[working.order_id] == "CANCELED"
+    finally:
+        recovered.journal.close()
+
+
+def test_recovery_writes_snapshot_covering_the_tail(workdir):
+    system = start()
+    fill(system, send(system, "AAPL", "BUY", 100, 150.0))
+    system.journal.close()
+
+    recovered = start()
+    seq = recovered.journal.seq
+    recovered.journal.close()
+
+    # A second restart starts from the snapshot the first one wrote: no tail left
+    again = start()
+    try:
+        assert again.journal.load_snapshot()[0] == seq
+        assert list(again.journal.replay(seq)) == []
+        assert again.risk.get_positions() == {"AAPL": {"quantity": 100, "avg_price": 150.0}}
+    finally:
+        again.journal.close()
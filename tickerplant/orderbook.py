@@ -2,29 +2,61 @@
 
 from typing import Dict, Optional
 from market_data.schemas import Tick
+from market_data.tick_batch import TickBatch
+from common.metrics import REGISTRY
 from common.utils import setup_logger
+from tickerplant.spread_quantiles import SpreadQuantileTracker
 
 logger = setup_logger(__name__)
 
+BOOK_UPDATES = REGISTRY.counter("orderbook_updates_total", "Order book updates", ("symbol",))
+
 class OrderBook:
-    def __init__(self):
+    def __init__(self, track_spread_quantiles: bool = True):
         self.books: Dict[str, Dict[str, float]] = {}
+        self.spread_quantiles: Optional[SpreadQuantileTracker] = (
+            SpreadQuantileTracker() if track_spread_quantiles else None
+        )
 
     def update(self, tick: Tick) -> Dict[str, float]:
-        """Update order book with new tick."""
-        book_data = {
-            "symbol": tick.symbol,
-            "bid": tick.bid,
-            "ask": tick.ask,
-            "bid_size": tick.bid_size,
-            "ask_size": tick.ask_size,
-            "spread": round(tick.ask - tick.bid, 4),
-            "mid": round((tick.bid + tick.ask) / 2, 4),
-            "timestamp": tick.timestamp
-        }
-        
-        self.books[tick.symbol] = book_data
-        logger.debug(f"Updated {tick.symbol}: {book_data}")
+        """Update order book with new tick.
+
+        Each symbol's book dict is created once and then updated in place,
+        so callers always see the latest state through the same object.
+        """
+        return self._apply(tick.symbol, tick.bid, tick.ask, tick.bid_size, tick.ask_size, tick.timestamp)
+
+    def update_batch(self, batch: TickBatch) -> Dict[str, Dict[str, float]]:
+        """Apply every row of a TickBatch in order; returns the books that changed."""
+        symbols = batch.symbols
+        touched = {}
+        for sid, bid, ask, bid_size, ask_size, timestamp in zip(
+            batch.column("symbol_id").tolist(), batch.column("bid").tolist(), batch.column("ask").tolist(),
+            batch.column("bid_size").tolist(), batch.column("ask_size").tolist(),
+            batch.column("timestamp").tolist(),
+        ):
+            symbol = symbols[sid]
+            touched[symbol] = self._apply(symbol, bid, ask, bid_size, ask_size, timestamp)
+        return touched
+
+    def _apply(self, symbol: str, bid: float, ask: float, bid_size: int, ask_size: int,
+               timestamp: float) -> Dict[str, float]:
+        BOOK_UPDATES.labels(symbol).inc()
+        book_data = self.books.get(symbol)
+        if book_data is None:
+            book_data = self.books[symbol] = {"symbol": symbol}
+        spread = round(ask - bid, 4)
+        book_data["bid"] = bid
+        book_data["ask"] = ask
+        book_data["bid_size"] = bid_size
+        book_data["ask_size"] = ask_size
+        book_data["spread"] = spread
+        book_data["mid"] = round((bid + ask) / 2, 4)
+        book_data["timestamp"] = timestamp
+
+        if self.spread_quantiles is not None:
+            self.spread_quantiles.update(symbol, spread)
+        logger.debug("Updated %s: %s", symbol, book_data)
         return book_data
 
     def get_book(self, symbol: str) -> Optional[Dict[str, float]]:
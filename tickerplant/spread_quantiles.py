@@ -0,0 +1,148 @@
+"""Streaming spread quantiles - constant-memory KLL sketches per symbol."""
+
+import math
+import random
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from common.config import (
+    SPREAD_BUY_QUANTILE,
+    SPREAD_SELL_QUANTILE,
+    SPREAD_SKETCH_K,
+    SPREAD_SKETCH_MIN_SAMPLES,
+)
+
+# Capacity decay between compactor levels (the usual KLL choice)
+_CAPACITY_DECAY = 2.0 / 3.0
+
+
+class KLLSketch:
+    """Constant-memory streaming quantile sketch (KLL style).
+
+    Items live in a stack of compactors where level h holds items of weight
+    2**h. When the sketch is full the lowest over-capacity level is sorted
+    and every other item is promoted, so memory stays O(k) however long the
+    stream runs.
+    """
+
+    __slots__ = ("k", "n", "_compactors", "_size", "_max_size", "_rng")
+
+    def __init__(self, k: int = 200, seed: Optional[int] = None):
+        if k < 8:
+            raise ValueError("k must be at least 8")
+        self.k = k
+        self.n = 0
+        self._compactors: List[List[float]] = [[]]
+        self._size = 0
+        self._rng = random.Random(seed)
+        self._max_size = self._capacity(0)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._compactors) - level - 1
+        return max(2, int(math.ceil(self.k * _CAPACITY_DECAY ** depth)))
+
+    def update(self, value: float):
+        """Add one observation. Amortised O(1)."""
+        self._compactors[0].append(value)
+        self._size += 1
+        self.n += 1
+        if self._size >= self._max_size:
+            self._compress()
+
+    def _compress(self):
+        level = 0
+        while level < len(self._compactors):
+            items = self._compactors[level]
+            if len(items) >= self._capacity(level):
+                if level + 1 == len(self._compactors):
+                    self._compactors.append([])
+                items.sort()
+                # Odd item out stays behind so weights remain exact
+                keep = [items.pop(0)] if len(items) % 2 else []
+                self._compactors[level + 1].extend(items[self._rng.getrandbits(1)::2])
+                self._compactors[level] = keep
+                self._size = sum(len(c) for c in self._compactors)
+                self._max_size = sum(self._capacity(h) for h in range(len(self._compactors)))
+                if self._size < self._max_size:
+                    break
+            level += 1
+
+    def _weighted_items(self) -> List[Tuple[float, int]]:
+        return sorted(
+            (value, 1 << level)
+            for level, items in enumerate(self._compactors)
+            for value in items
+        )
+
+    def quantiles(self, qs: Sequence[float]) -> Tuple[Optional[float], ...]:
+        """Estimate several quantiles with a single pass over the sketch."""
+        if self.n == 0:
+            return tuple(None for _ in qs)
+
+        items = self._weighted_items()
+        total = sum(weight for _, weight in items)
+        order = sorted(range(len(qs)), key=lambda i: qs[i])
+        results: List[Optional[float]] = [None] * len(qs)
+
+        cumulative = 0
+        idx = 0
+        for i in order:
+            target = qs[i] * total
+            while idx < len(items) - 1 and cumulative + items[idx][1] < target:
+                cumulative += items[idx][1]
+                idx += 1
+            results[i] = items[idx][0]
+        return tuple(results)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a single quantile (0 <= q <= 1)."""
+        return self.quantiles((q,))[0]
+
+    def __len__(self) -> int:
+        """Number of items retained (not the stream length)."""
+        return self._size
+
+
+class SpreadQuantileTracker:
+    """Per-symbol spread sketches with cached BUY/SELL thresholds.
+
+    Querying a sketch sorts its retained items, which is too expensive to do
+    on every tick, so thresholds are refreshed every ``refresh_every`` updates
+    and served from a cache in between.
+    """
+
+    def __init__(
+        self,
+        quantiles: Iterable[float] = (SPREAD_BUY_QUANTILE, SPREAD_SELL_QUANTILE),
+        k: int = SPREAD_SKETCH_K,
+        min_samples: int = SPREAD_SKETCH_MIN_SAMPLES,
+        refresh_every: int = 200,
+    ):
+        self.quantiles = tuple(quantiles)
+        self.k = k
+        self.min_samples = min_samples
+        self.refresh_every = refresh_every
+        self.sketches: Dict[str, KLLSketch] = {}
+        self._thresholds: Dict[str, Tuple[float, ...]] = {}
+
+    def update(self, symbol: str, spread: float):
+        """Feed one spread observation for a symbol."""
+        sketch = self.sketches.get(symbol)
+        if sketch is None:
+            sketch = self.sketches[symbol] = KLLSketch(self.k)
+        sketch.update(spread)
+        n = sketch.n
+        if n >= self.min_samples and (n == self.min_samples or n % self.refresh_every == 0):
+            self._thresholds[symbol] = sketch.quantiles(self.quantiles)
+
+    def thresholds(self, symbol: str) -> Optional[Tuple[float, ...]]:
+        """Cached live quantiles for a symbol, or None while still warming up."""
+        return self._thresholds.get(symbol)
+
+    def quantile(self, symbol: str, q: float) -> Optional[float]:
+        """Ad-hoc quantile query for a symbol (not cached)."""
+        sketch = self.sketches.get(symbol)
+        return sketch.quantile(q) if sketch is not None else None
+
+    def count(self, symbol: str) -> int:
+        """Number of spreads observed for a symbol."""
+        sketch = self.sketches.get(symbol)
+        return sketch.n if sketch is not None else 0